@@ -0,0 +1,365 @@
+import bisect
+import cProfile
+import json
+import logging
+import math
+import os
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+logger = logging.getLogger(__name__)
+
+# Scrape phases are timed into in-process histograms. Commands print a summary
+# after every run and save a snapshot to `settings.INSTRUMENTATION_DIR`, which
+# the `/metrics/` view merges into Prometheus text format. Snapshots are named
+# after the command, host and process id, so concurrent processes keep their
+# own, and worker processes return theirs to the parent to be merged.
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+BYTES_BUCKETS = (*(1024 * 4**i for i in range(8)), math.inf)
+
+type Labels = tuple[tuple[str, str], ...]
+
+
+class Metric(ABC):
+    """Base class of labelled metrics safe to update from several threads."""
+
+    type = ''
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.lock = threading.Lock()
+        self.values: dict[Labels, Any] = {}
+
+    @staticmethod
+    def get_labels(labels: dict[str, object]) -> Labels:
+        """Return hashable, sorted `labels`."""
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def reset(self) -> None:
+        """Remove every recorded value."""
+        with self.lock:
+            self.values.clear()
+
+    def snapshot(self) -> list[list[Any]]:
+        """Return recorded values as JSON serializable `[labels, value]` pairs."""
+        with self.lock:
+            return [[dict(labels), value] for labels, value in self.values.items()]
+
+    @abstractmethod
+    def merge(self, labels: Labels, value: Any) -> None:
+        """Add `value` of snapshot to values with `labels`."""
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Return Prometheus text format lines of samples."""
+
+
+def format_labels(labels: Labels, **extra: object) -> str:
+    """Return Prometheus label set."""
+    pairs = [*labels, *((key, str(value)) for key, value in extra.items())]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in pairs) + '}'
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        """Increase count with `labels` by `amount`."""
+        self.merge(self.get_labels(labels), amount)
+
+    def merge(self, labels: Labels, value: float) -> None:
+        """Add `value` to count with `labels`."""
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + value
+
+    def render(self) -> list[str]:
+        """Return one sample per label set."""
+        with self.lock:
+            return [f'{self.name}{format_labels(labels)} {value}' for labels, value in sorted(self.values.items())]
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets, with their sum and count."""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...] = SECONDS_BUCKETS) -> None:
+        super().__init__(name, documentation)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Record `value` with `labels`."""
+        counts = [0] * len(self.buckets)
+        counts[bisect.bisect_left(self.buckets, value)] = 1
+        self.merge(self.get_labels(labels), {'buckets': counts, 'sum': value, 'count': 1})
+
+    def merge(self, labels: Labels, value: dict[str, Any]) -> None:
+        """Add bucket counts, sum and count of `value` to histogram with `labels`."""
+        with self.lock:
+            current = self.values.setdefault(labels, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            current['buckets'] = [a + b for a, b in zip(current['buckets'], value['buckets'], strict=True)]
+            current['sum'] += value['sum']
+            current['count'] += value['count']
+
+    def quantile(self, labels: Labels, q: float) -> float:
+        """Estimate quantile `q` of histogram with `labels` by interpolating within its bucket."""
+        with self.lock:
+            value = self.values.get(labels)
+            if not value or not value['count']:
+                return 0.0
+            rank = q * value['count']
+            seen = 0
+            for i, count in enumerate(value['buckets']):
+                if count and seen + count >= rank:
+                    lower = self.buckets[i - 1] if i else 0.0
+                    upper = self.buckets[i] if math.isfinite(self.buckets[i]) else lower
+                    return lower + (upper - lower) * (rank - seen) / count
+                seen += count
+            return 0.0
+
+    def render(self) -> list[str]:
+        """Return cumulative bucket, sum and count samples per label set."""
+        lines = []
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, value['buckets'], strict=True):
+                    cumulative += count
+                    le = '+Inf' if math.isinf(bound) else repr(bound)
+                    lines.append(f'{self.name}_bucket{format_labels(labels, le=le)} {cumulative}')
+                lines.append(f'{self.name}_sum{format_labels(labels)} {value["sum"]}')
+                lines.append(f'{self.name}_count{format_labels(labels)} {value["count"]}')
+        return lines
+
+
+class Registry:
+    """Collection of metrics that can be reset, saved, merged and rendered."""
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+
+    def register[M: Metric](self, metric: M) -> M:
+        """Add `metric` and return it."""
+        self.metrics[metric.name] = metric
+        return metric
+
+    def reset(self) -> None:
+        """Reset every metric."""
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def snapshot(self) -> dict[str, list[list[Any]]]:
+        """Return values of every metric."""
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def merge(self, snapshot: dict[str, list[list[Any]]], **extra: object) -> None:
+        """Add values of `snapshot` to metrics, with `extra` labels added to every sample."""
+        for name, values in snapshot.items():
+            if (metric := self.metrics.get(name)) is None:
+                continue
+            for labels, value in values:
+                metric.merge(Metric.get_labels(labels | extra), value)
+
+    def render(self) -> str:
+        """Return every metric in Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+PHASE_SECONDS = REGISTRY.register(
+    Histogram('haystack_phase_seconds', 'Seconds spent in each scrape phase.'),
+)
+RESPONSE_BYTES = REGISTRY.register(
+    Histogram('haystack_response_bytes', 'Size of fetched response bodies.', buckets=BYTES_BUCKETS),
+)
+RESPONSES = REGISTRY.register(
+    Counter('haystack_responses_total', 'Fetched responses by status code.'),
+)
+RETRIES = REGISTRY.register(
+    Counter('haystack_retries_total', 'Failed fetch attempts by status code, `none` when no response.'),
+)
+CACHE_LOOKUPS = REGISTRY.register(
+    Counter('haystack_response_cache_total', 'Response cache lookups by result.'),
+)
+LOOKUP_RESULTS = REGISTRY.register(
+    Counter('haystack_lookup_cache_total', 'Company and location id lookups by table and result.'),
+)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Record duration of block, or of every call when used as a decorator, as `phase`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_SECONDS.observe(time.perf_counter() - start, phase=phase)
+
+
+def record_response(status_code: int | None, body: bytes | None) -> None:
+    """Record status code and body size of a fetched response."""
+    RESPONSES.inc(status=status_code or 'none')
+    if body is not None:
+        RESPONSE_BYTES.observe(len(body))
+
+
+def record_retry(status_code: int | None) -> None:
+    """Record failed fetch attempt that will be retried."""
+    RETRIES.inc(status=status_code or 'none')
+
+
+def record_cache(result: str) -> None:
+    """Record response cache lookup `result`, `hit`, `stale`, `miss` or `revalidated`."""
+    CACHE_LOOKUPS.inc(result=result)
+
+
+def record_lookups(table: str, hits: int, misses: int) -> None:
+    """Record `hits` and `misses` of id lookup cache of `table`."""
+    if hits:
+        LOOKUP_RESULTS.inc(hits, table=table, result='hit')
+    if misses:
+        LOOKUP_RESULTS.inc(misses, table=table, result='miss')
+
+
+def get_summary() -> list[str]:
+    """Return one line per timed phase with count, total, mean and 95th percentile, slowest first."""
+    phases = sorted(PHASE_SECONDS.snapshot(), key=lambda item: item[1]['sum'], reverse=True)
+    lines = [f'{"phase":16} {"count":>8} {"total s":>10} {"mean ms":>10} {"p95 ms":>10}']
+    for labels, value in phases:
+        p95 = PHASE_SECONDS.quantile(Metric.get_labels(labels), 0.95)
+        mean = value['sum'] / value['count'] * 1000
+        lines.append(f'{labels["phase"]:16} {value["count"]:8} {value["sum"]:10.2f} {mean:10.1f} {p95 * 1000:10.1f}')
+    responses = {labels['status']: int(count) for labels, count in RESPONSES.snapshot()}
+    retries = sum(int(count) for _, count in RETRIES.snapshot())
+    lines.append(f'responses {responses}, retries {retries}')
+    if cache := {labels['result']: int(count) for labels, count in CACHE_LOOKUPS.snapshot()}:
+        lines.append(f'response cache {cache}')
+    if lookups := {f'{labels["table"]} {labels["result"]}': int(count) for labels, count in LOOKUP_RESULTS.snapshot()}:
+        lines.append(f'lookup cache {lookups}')
+    return lines
+
+
+def is_running(pid: int) -> bool:
+    """Return whether process `pid` of this host is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def save_snapshot(name: str) -> Path:
+    """Save snapshot of `REGISTRY` as `<name>-<host>-<pid>.json` in `settings.INSTRUMENTATION_DIR` and return its path.
+
+    Snapshots of command `name` left by exited processes of this host are removed.
+    """
+    directory = Path(settings.INSTRUMENTATION_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    prefix = f'{name}-{socket.gethostname()}'
+    path = directory / f'{prefix}-{os.getpid()}.json'
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(REGISTRY.snapshot()))
+    tmp_path.replace(path)
+    for old_path in directory.glob(f'{prefix}-*.json'):
+        old_prefix, _, pid = old_path.stem.rpartition('-')
+        if old_path != path and old_prefix == prefix and pid.isdigit() and not is_running(int(pid)):
+            old_path.unlink(missing_ok=True)
+    return path
+
+
+def load_snapshots() -> Registry:
+    """Return registry merging every saved snapshot, labelled with the command and instance that saved it."""
+    registry = Registry()
+    for metric in REGISTRY.metrics.values():
+        registry.register(
+            Histogram(metric.name, metric.documentation, metric.buckets)
+            if isinstance(metric, Histogram)
+            else type(metric)(metric.name, metric.documentation)
+        )
+    for path in sorted(Path(settings.INSTRUMENTATION_DIR).glob('*.json')):
+        try:
+            command, _, instance = path.stem.partition('-')
+            registry.merge(json.loads(path.read_text()), command=command, instance=instance)
+        except (OSError, ValueError):
+            logger.warning('Unable to load instrumentation snapshot %s', path)
+    return registry
+
+
+@contextmanager
+def profile(path: Path | None) -> Iterator[None]:
+    """Profile block into `path` with pyinstrument if it ends in `.html` and it is installed, else cProfile."""
+    if path is None:
+        yield
+        return
+    if path.suffix == '.html':
+        try:
+            from pyinstrument import Profiler  # noqa: PLC0415
+        except ImportError:
+            logger.warning('pyinstrument is not installed, using cProfile')
+            path = path.with_suffix('.prof')
+        else:
+            with Profiler() as profiler:
+                yield
+            path.write_text(profiler.output_html())
+            return
+    with cProfile.Profile() as profiler:
+        yield
+    profiler.dump_stats(path)
+
+
+class InstrumentedCommand(BaseCommand):
+    """Command that prints scrape phase timings after running and saves a metrics snapshot.
+
+    Adds a `--profile PATH` argument to profile the run.
+    """
+
+    def create_parser(self, prog_name: str, subcommand: str, **kwargs: Any) -> CommandParser:
+        """Add profile argument."""
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        parser.add_argument(
+            '--profile', type=Path, help='Write a cProfile `.prof`, or with pyinstrument an `.html`, profile to PATH.'
+        )
+        return parser
+
+    def execute(self, *args: Any, **options: Any) -> str | None:
+        """Execute command with fresh metrics, then print summary and save snapshot."""
+        REGISTRY.reset()
+        try:
+            with profile(options.get('profile')):
+                return super().execute(*args, **options)
+        finally:
+            self.write_summary()
+
+    @property
+    def command_name(self) -> str:
+        """Return name the command is invoked with."""
+        return self.__module__.rsplit('.', 1)[-1]
+
+    def write_summary(self) -> None:
+        """Print timings and save snapshot named after the command."""
+        for line in get_summary():
+            self.stdout.write(line)
+        save_snapshot(self.command_name)
@@ -0,0 +1,83 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.core.exceptions import BadRequest, ValidationError
+from django.db.models import Field, Model, Q, QuerySet
+
+
+@dataclass
+class KeysetPage[M: Model]:
+    """One page of results and the cursor of the next page."""
+
+    object_list: list[M]
+    next_cursor: str | None = field(default=None)
+
+    @property
+    def has_next(self) -> bool:
+        """Return if there is a next page."""
+        return self.next_cursor is not None
+
+
+class KeysetPaginator[M: Model]:
+    """Paginate a queryset on `(key, id)` with an opaque cursor instead of an offset.
+
+    Each page is fetched with a `WHERE (key, id) < (last key, last id)` style
+    predicate, so deep pages cost the same as the first one when an index on
+    `(key, id)` exists. `key` may be nullable, nulls sort first when
+    descending and last when ascending, as in PostgreSQL.
+    """
+
+    def __init__(self, queryset: QuerySet[M], key: str, descending: bool = True, per_page: int = 50) -> None:
+        key_field = queryset.model._meta.get_field(key)  # noqa: SLF001
+        if not isinstance(key_field, Field):
+            msg = f'Cannot paginate on relation `{key}`.'
+            raise TypeError(msg)
+        self.queryset = queryset
+        self.key = key
+        self.key_field = key_field
+        self.descending = descending
+        self.per_page = per_page
+
+    @property
+    def ordering(self) -> tuple[str, str]:
+        """Return `order_by` arguments."""
+        prefix = '-' if self.descending else ''
+        return f'{prefix}{self.key}', f'{prefix}id'
+
+    def encode_cursor(self, obj: M) -> str:
+        """Return cursor pointing after `obj`."""
+        value = getattr(obj, self.key)
+        data = [value.isoformat() if hasattr(value, 'isoformat') else value, obj.pk]
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[Any, int]:
+        """Return key and id of `cursor`. Raise `BadRequest` if it is malformed."""
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (None if value is None else self.key_field.to_python(value)), int(pk)
+        except (ValueError, TypeError, ValidationError) as e:
+            msg = 'Invalid cursor'
+            raise BadRequest(msg) from e
+
+    def after(self, value: Any, pk: int) -> Q:
+        """Return filter for rows after `(value, pk)` in page order."""
+        lookup = 'lt' if self.descending else 'gt'
+        if value is None:
+            same_key = Q(**{f'{self.key}__isnull': True, f'id__{lookup}': pk})
+            # nulls come first when descending, so every non-null key follows
+            return same_key | Q(**{f'{self.key}__isnull': False}) if self.descending else same_key
+        after = Q(**{f'{self.key}__{lookup}': value}) | Q(**{self.key: value, f'id__{lookup}': pk})
+        return after if self.descending else after | Q(**{f'{self.key}__isnull': True})
+
+    def get_page(self, cursor: str | None = None) -> KeysetPage[M]:
+        """Return page following `cursor`, or the first page if `cursor` is empty."""
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self.after(*self.decode_cursor(cursor)))
+        object_list = list(queryset[: self.per_page + 1])
+        if len(object_list) <= self.per_page:
+            return KeysetPage(object_list)
+        object_list = object_list[: self.per_page]
+        return KeysetPage(object_list, self.encode_cursor(object_list[-1]))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'haystack.jobs'
+
+    def ready(self) -> None:
+        """Connect signal receivers that invalidate company and location lookups."""
+        from haystack.jobs import lookups  # noqa: F401, PLC0415
@@ -0,0 +1,74 @@
+import hashlib
+import re
+import unicodedata
+
+from bs4 import BeautifulSoup
+
+SIMHASH_BITS = 64
+
+# near duplicates within `SIMHASH_BANDS - 1` bits share at least one band exactly
+SIMHASH_BANDS = 4
+
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+
+SHINGLE_SIZE = 3
+
+# common title abbreviations and their expansion
+ABBREVIATIONS = {
+    'sr': 'senior',
+    'jr': 'junior',
+    'eng': 'engineer',
+    'engr': 'engineer',
+    'dev': 'developer',
+    'mgr': 'manager',
+    'swe': 'software engineer',
+    'ii': '2',
+    'iii': '3',
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Return lowercase alphanumeric tokens of `text` with accents removed."""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def normalize_title(title: str) -> str:
+    """Return title with punctuation removed and abbreviations expanded."""
+    return ' '.join(ABBREVIATIONS.get(token, token) for token in tokenize(title))
+
+
+def fingerprint(company_url: str, title: str, location: str | None) -> str:
+    """Return key shared by postings of the same role under different urls."""
+    key = '|'.join((company_url.rstrip('/').lower(), normalize_title(title), ' '.join(tokenize(location or ''))))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def simhash(html: str) -> int | None:
+    """Return signed 64 bit SimHash of word shingles of `html` text, or `None` if it has no text."""
+    tokens = tokenize(BeautifulSoup(html, 'html.parser').get_text(' '))
+    if not tokens:
+        return None
+    shingles = {' '.join(tokens[i : i + SHINGLE_SIZE]) for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))}
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest())
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    value = sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+    # stored in a signed BigIntegerField
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def bands(value: int) -> list[int]:
+    """Return bands of SimHash `value`, tagged with their position so bands at different positions never match."""
+    unsigned = value % (1 << SIMHASH_BITS)
+    mask = (1 << BAND_BITS) - 1
+    return [(i << BAND_BITS) | (unsigned >> (i * BAND_BITS) & mask) for i in range(SIMHASH_BANDS)]
+
+
+def distance(a: int, b: int) -> int:
+    """Return number of differing bits between SimHashes `a` and `b`."""
+    return ((a ^ b) % (1 << SIMHASH_BITS)).bit_count()
@@ -0,0 +1,117 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Collection
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from haystack.core.instrumentation import record_lookups
+
+if TYPE_CHECKING:
+    from haystack.jobs.models import Company, Location
+
+# Company url and location name to primary key, consulted by
+# `JobManager.add_jobs` before querying the database. Entries are added once
+# the transaction that found or created them commits, and are removed when a
+# company or location is deleted or its url or name changes through the ORM.
+# Queryset `update()` sends no signals, and deletes in another process only
+# reach this process through the shared backend, so `add_jobs` also forgets
+# the batch's entries and retries once if a cached id no longer exists.
+
+
+class LookupCache:
+    """Thread-safe bounded LRU mapping of a unique field to primary key.
+
+    With `backend`, an alias of `CACHES`, misses are looked up in and stored
+    to that cache so several worker processes share what one resolved.
+    """
+
+    def __init__(self, table: str, field: str, size: int, backend: str = '') -> None:
+        self.table = table
+        self.field = field
+        self.size = size
+        self.backend = backend
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return number of entries held in process."""
+        return len(self.entries)
+
+    def make_key(self, key: str) -> str:
+        """Return shared cache key of `key`, hashed because urls may be too long or contain spaces."""
+        return f'lookup:{self.table}:{hashlib.sha256(key.encode()).hexdigest()[:32]}'
+
+    def get_many(self, keys: Collection[str]) -> dict[str, int]:
+        """Return ids of cached `keys` and mark them recently used."""
+        found = {}
+        with self.lock:
+            for key in keys:
+                if (pk := self.entries.get(key)) is not None:
+                    self.entries.move_to_end(key)
+                    found[key] = pk
+        if self.backend and len(found) < len(keys):
+            shared_keys = {self.make_key(key): key for key in keys if key not in found}
+            shared = {shared_keys[key]: pk for key, pk in caches[self.backend].get_many(shared_keys).items()}
+            self.store(shared)
+            found.update(shared)
+        record_lookups(self.table, len(found), len(keys) - len(found))
+        return found
+
+    def set_many(self, ids: dict[str, int]) -> None:
+        """Cache `ids`, in the shared backend too."""
+        self.store(ids)
+        if self.backend and ids:
+            caches[self.backend].set_many({self.make_key(key): pk for key, pk in ids.items()})
+
+    def store(self, ids: dict[str, int]) -> None:
+        """Add `ids` to the in-process entries, evicting least recently used ones over `size`."""
+        with self.lock:
+            for key, pk in ids.items():
+                self.entries[key] = pk
+                self.entries.move_to_end(key)
+            while len(self.entries) > max(self.size, 0):
+                self.entries.popitem(last=False)
+
+    def discard(self, keys: Collection[str]) -> None:
+        """Forget `keys`, in the shared backend too."""
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+        if self.backend and keys:
+            caches[self.backend].delete_many([self.make_key(key) for key in keys])
+
+    def clear(self) -> None:
+        """Forget every in-process entry."""
+        with self.lock:
+            self.entries.clear()
+
+
+COMPANY_IDS = LookupCache('company', 'url', settings.LOOKUP_CACHE_SIZE, settings.LOOKUP_CACHE_BACKEND)
+LOCATION_IDS = LookupCache('location', 'name', settings.LOOKUP_CACHE_SIZE, settings.LOOKUP_CACHE_BACKEND)
+
+LOOKUPS = {'Company': COMPANY_IDS, 'Location': LOCATION_IDS}
+
+
+@receiver(pre_save, sender='jobs.Company')
+@receiver(pre_save, sender='jobs.Location')
+def discard_renamed(sender: type['Company | Location'], instance: 'Company | Location', **_kwargs: Any) -> None:
+    """Forget lookup of a saved company or location whose url or name changes."""
+    if instance.pk is None:
+        return
+    cache = LOOKUPS[sender.__name__]
+    old = sender.objects.filter(pk=instance.pk).values_list(cache.field, flat=True).first()
+    if old is not None and old != getattr(instance, cache.field):
+        cache.discard([old])
+
+
+@receiver(post_delete, sender='jobs.Company')
+@receiver(post_delete, sender='jobs.Location')
+def discard_deleted(sender: type['Company | Location'], instance: 'Company | Location', **_kwargs: Any) -> None:
+    """Forget lookup of a deleted company or location."""
+    cache = LOOKUPS[sender.__name__]
+    cache.discard([getattr(instance, cache.field)])
@@ -0,0 +1,85 @@
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+
+from haystack.jobs.models import Company, Job
+
+# common words appear in most descriptions, each job mentions one rare skill
+WORDS = [
+    'python', 'django', 'postgres', 'backend', 'frontend', 'react', 'typescript', 'kubernetes', 'docker', 'aws',
+    'data', 'platform', 'machine', 'learning', 'engineer', 'developer', 'senior', 'staff', 'lead', 'manager',
+    'remote', 'hybrid', 'startup', 'enterprise', 'security', 'payments', 'search', 'infrastructure', 'api', 'testing',
+]  # fmt: skip
+SKILLS = [
+    'elixir', 'haskell', 'clojure', 'erlang', 'fortran', 'cobol', 'ocaml', 'julia', 'kotlin', 'swift', 'dart', 'zig',
+    'nim', 'crystal', 'lua', 'perl', 'racket', 'scheme', 'prolog', 'smalltalk', 'solidity', 'verilog', 'vhdl', 'ada',
+    'pascal', 'delphi', 'groovy', 'matlab', 'sas', 'stata', 'cuda', 'opencl', 'vulkan', 'webgl', 'webassembly', 'deno',
+    'flink', 'beam', 'druid', 'pinot', 'clickhouse', 'cassandra', 'scylla', 'neo4j', 'couchdb', 'riak', 'etcd',
+    'consul', 'nomad', 'vault',
+]  # fmt: skip
+
+
+class Command(BaseCommand):
+    help = 'Seed jobs and compare full-text search against icontains.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add dataset size, query and repeat arguments."""
+        parser.add_argument('--jobs', type=int, default=500000)
+        parser.add_argument('--companies', type=int, default=5000)
+        parser.add_argument('--query', default='elixir')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def seed(self, jobs: int, companies: int) -> None:
+        """Create jobs with random titles and descriptions."""
+        rng = random.Random(0)  # noqa: S311
+        company_objs = Company.objects.bulk_create(
+            Company(name=f'benchsearch {rng.choice(WORDS)} {i}', url=f'https://example.com/benchsearch/{i}')
+            for i in range(companies)
+        )
+        for start in range(0, jobs, 5000):
+            Job.objects.bulk_create(
+                Job(
+                    company=rng.choice(company_objs),
+                    title=' '.join(rng.choices(WORDS, k=4)),
+                    url=f'https://example.com/benchsearch/jobs/{i}',
+                    description=' '.join([*rng.choices(WORDS, k=200), rng.choice(SKILLS)]),
+                    populated=True,
+                )
+                for i in range(start, min(start + 5000, jobs))
+            )
+            self.stdout.write(f'Seeded {min(start + 5000, jobs)} jobs', ending='\r')
+        self.stdout.write('')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE jobs_job')
+
+    def time(self, name: str, query: Callable[[], object], repeat: int) -> None:
+        """Print best time of `repeat` runs of `query`."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = query()
+            timings.append(time.perf_counter() - start)
+        self.stdout.write(f'{name:40} {min(timings) * 1000:10.1f} ms  ({result})')
+
+    def handle(self, **options: Any) -> None:
+        """Seed dataset in a transaction, time both searches and roll back."""
+        if connection.vendor != 'postgresql':
+            msg = 'benchsearch requires PostgreSQL.'
+            raise CommandError(msg)
+
+        query, repeat = options['query'], options['repeat']
+        with transaction.atomic():
+            self.seed(options['jobs'], options['companies'])
+            icontains = Job.objects.filter(title__icontains=query) | Job.objects.filter(description__icontains=query)
+            self.time('icontains count', icontains.count, repeat)
+            self.time('icontains top 50', lambda: len(icontains.order_by('-id')[:50]), repeat)
+            self.time('full-text count', Job.objects.search(query).count, repeat)
+            self.time('full-text ranked top 50', lambda: len(Job.objects.search(query)[:50]), repeat)
+            if options['verbosity'] > 1:
+                self.stdout.write(Job.objects.search(query)[:50].explain(analyze=True))
+            # discard seeded rows
+            transaction.set_rollback(True)
@@ -0,0 +1,148 @@
+import hashlib
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from haystack.jobs import dedup
+from haystack.jobs.models import Company, Job
+from haystack.search.models import Search, SearchSource, Source
+
+
+def get_simhash(n: int) -> int:
+    """Return pseudo random signed 64 bit SimHash for `n`."""
+    return int.from_bytes(hashlib.blake2b(str(n).encode(), digest_size=8).digest(), signed=True)
+
+
+class Command(BaseCommand):
+    help = 'Seed a dataset and check that the pipeline queries use their indexes.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add dataset size arguments."""
+        parser.add_argument('--jobs', type=int, default=50000)
+        parser.add_argument('--sources', type=int, default=10)
+        parser.add_argument('--searches', type=int, default=500)
+
+    def seed(self, jobs: int, sources: int, searches: int) -> Source:
+        """Create searches and jobs where few jobs are waiting to be populated. Return one `Source`."""
+        source_objs = Source.objects.bulk_create(
+            Source(name=f'checkindexes {i}', parser=f'checkindexes{i}') for i in range(sources)
+        )
+        search_objs = Search.objects.bulk_create(Search(keywords=f'checkindexes {i}') for i in range(searches))
+        search_sources = SearchSource.objects.bulk_create(
+            SearchSource(search=search, source=source, is_active=i % 4 != 0)
+            for i, (search, source) in enumerate((s, src) for s in search_objs for src in source_objs)
+        )
+        company = Company.objects.create(name='checkindexes', url='https://example.com/checkindexes')
+
+        statuses = [Job.APPLIED, Job.EXPIRED, Job.DISMISSED, Job.REJECTED]
+        today = timezone.now().date()
+        Job.objects.bulk_create(
+            (
+                Job(
+                    company=company,
+                    title=f'checkindexes {i}',
+                    url=f'https://example.com/checkindexes/{i}',
+                    search_source=search_sources[i % len(search_sources)],
+                    date_found=today - timedelta(days=i % 365),
+                    # about 1% of jobs are new and unpopulated and 2% are saved, the checked status filter
+                    populated=i % 100 != 0,
+                    status=Job.NEW if i % 100 == 0 else Job.SAVED if i % 50 == 1 else statuses[i % len(statuses)],
+                    # pairs of postings share a fingerprint
+                    fingerprint=dedup.fingerprint(company.url, f'checkindexes {i // 2}', None),
+                    simhash_bands=dedup.bands(get_simhash(i)),
+                )
+                for i in range(jobs)
+            ),
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            for model in (Source, Search, SearchSource, Job):
+                cursor.execute(f'ANALYZE {model._meta.db_table}')  # noqa: SLF001
+            # autovacuum merges pending GIN entries of a long-lived table into the index, which EXPLAIN costs
+            cursor.execute("SELECT gin_clean_pending_list('job_simhash_bands_idx')")
+        return source_objs[0]
+
+    def get_checks(self, source: Source) -> list[tuple[str, QuerySet, str]]:
+        """Return description, queryset and expected index of every checked query."""
+        job = Job.objects.filter(title='checkindexes 1').get()
+        uuids = Job.objects.filter(title__startswith='checkindexes').values_list('uuid', flat=True)[:10]
+        return [
+            (
+                'populate --source',
+                Job.objects.filter(
+                    status=Job.NEW, populated=False, duplicate_of__isnull=True, search_source__source=source
+                ),
+                'job_unpopulated_idx',
+            ),
+            (
+                'populate',
+                Job.objects.filter(
+                    status=Job.NEW, populated=False, duplicate_of__isnull=True, search_source__isnull=False
+                ),
+                'job_unpopulated_idx',
+            ),
+            (
+                'jobs list',
+                Job.objects.filter(status=Job.SAVED).order_by('-date_found', '-id')[:50],
+                'job_status_date_found_idx',
+            ),
+            (
+                'jobs list, every status',
+                Job.objects.order_by('-date_found', '-id')[:50],
+                'job_date_found_idx',
+            ),
+            (
+                'search --source',
+                SearchSource.objects.filter(source=source, is_active=True),
+                'searchsource_source_active_idx',
+            ),
+            (
+                'add_jobs created count',
+                Job.objects.filter(uuid__in=list(uuids)),
+                'job_uuid_idx',
+            ),
+            (
+                'link_duplicates oldest job of fingerprint',
+                Job.objects.filter(fingerprint=job.fingerprint).order_by('id')[:1],
+                'job_fingerprint_id_idx',
+            ),
+            (
+                'jobs search',
+                Job.objects.search('1'),
+                'job_search_vector_idx',
+            ),
+            (
+                'near duplicates',
+                Job.objects.filter(simhash_bands__overlap=job.simhash_bands),
+                'job_simhash_bands_idx',
+            ),
+        ]
+
+    def handle(self, **options: Any) -> None:
+        """Seed dataset in a transaction, EXPLAIN every query and roll back."""
+        if connection.vendor != 'postgresql':
+            msg = 'checkindexes requires PostgreSQL.'
+            raise CommandError(msg)
+
+        failures = []
+        with transaction.atomic():
+            source = self.seed(options['jobs'], options['sources'], options['searches'])
+            for description, queryset, index in self.get_checks(source):
+                plan = queryset.explain()
+                if index in plan:
+                    self.stdout.write(self.style.SUCCESS(f'{description}: uses {index}'))
+                else:
+                    failures.append(description)
+                    self.stdout.write(self.style.ERROR(f'{description}: does not use {index}'))
+                if index not in plan or options['verbosity'] > 1:
+                    self.stdout.write(plan)
+            # discard seeded rows
+            transaction.set_rollback(True)
+
+        if failures:
+            msg = f'{len(failures)} queries do not use their index'
+            raise CommandError(msg)
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from itertools import batched, combinations
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from haystack.jobs import dedup
+from haystack.jobs.models import Job
+
+
+class UnionFind:
+    """Disjoint sets of job ids whose root is the smallest id."""
+
+    def __init__(self) -> None:
+        self.parent: dict[int, int] = {}
+
+    def find(self, pk: int) -> int:
+        """Return root of set containing `pk`."""
+        root = self.parent.setdefault(pk, pk)
+        while root != self.parent[root]:
+            root = self.parent[root]
+        while pk != root:
+            self.parent[pk], pk = root, self.parent[pk]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        """Merge sets containing `a` and `b`."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class Command(BaseCommand):
+    help = 'Fingerprint existing jobs and cluster duplicates.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add batch size and distance arguments."""
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--distance',
+            type=int,
+            default=settings.DEDUP_SIMHASH_DISTANCE,
+            help='Maximum differing SimHash bits of near duplicate descriptions.',
+        )
+
+    def backfill(self, batch_size: int) -> None:
+        """Compute missing fingerprints and SimHashes."""
+        jobs = Job.objects.filter(fingerprint='').select_related('company', 'location')
+        jobs = jobs.only('title', 'company__url', 'location__name')
+        for batch in batched(jobs.iterator(chunk_size=batch_size), batch_size, strict=False):
+            for job in batch:
+                job.fingerprint = dedup.fingerprint(job.company.url, job.title, getattr(job.location, 'name', None))
+            Job.objects.bulk_update(batch, ['fingerprint'])
+            self.stdout.write(f'Fingerprinted {len(batch)} jobs')
+
+        jobs = Job.objects.filter(simhash__isnull=True).exclude(description='').only('description')
+        for batch in batched(jobs.iterator(chunk_size=batch_size), batch_size, strict=False):
+            for job in batch:
+                job.update_simhash()
+            Job.objects.bulk_update(batch, ['simhash', 'simhash_bands'])
+            self.stdout.write(f'Hashed {len(batch)} descriptions')
+
+    def cluster(self, max_distance: int) -> UnionFind:
+        """Return clusters of jobs sharing a fingerprint or with SimHashes within `max_distance` bits."""
+        clusters = UnionFind()
+        by_fingerprint: dict[str, int] = {}
+        by_band: dict[int, list[tuple[int, int]]] = defaultdict(list)
+        rows = Job.objects.order_by('id').values_list('id', 'fingerprint', 'simhash', 'simhash_bands')
+        for pk, fingerprint, simhash, bands in rows.iterator(chunk_size=10000):
+            clusters.find(pk)
+            if fingerprint:
+                clusters.union(by_fingerprint.setdefault(fingerprint, pk), pk)
+            for band in bands:
+                by_band[band].append((pk, simhash))
+
+        for candidates in by_band.values():
+            for (a, hash_a), (b, hash_b) in combinations(candidates, 2):
+                if dedup.distance(hash_a, hash_b) <= max_distance:
+                    clusters.union(a, b)
+        return clusters
+
+    def handle(self, **options: Any) -> None:
+        """Backfill hashes, cluster every job and point duplicates at the oldest job of their cluster."""
+        self.backfill(options['batch_size'])
+        clusters = self.cluster(options['distance'])
+
+        current = dict(Job.objects.values_list('id', 'duplicate_of'))
+        changed = []
+        for pk, duplicate_of_id in current.items():
+            root = clusters.find(pk)
+            canonical_id = root if root != pk else None
+            if canonical_id != duplicate_of_id:
+                changed.append(Job(id=pk, duplicate_of_id=canonical_id))
+
+        with transaction.atomic():
+            for batch in batched(changed, options['batch_size'], strict=False):
+                Job.objects.bulk_update(batch, ['duplicate_of'])
+
+        duplicates = sum(1 for pk in current if clusters.find(pk) != pk)
+        self.stdout.write(f'Found {duplicates} duplicates of {len(current) - duplicates} jobs, updated {len(changed)}')
@@ -0,0 +1,38 @@
+from itertools import batched
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from haystack.jobs.models import Job, JobHTML
+
+
+class Command(BaseCommand):
+    help = 'Move Job.raw_html into compressed JobHTML rows.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add batch size argument."""
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, **options: Any) -> None:
+        """Compress and move html of every job in batches, emptying `raw_html`."""
+        job_ids = Job.objects.exclude(raw_html='').order_by('id').values_list('id', flat=True).iterator()
+        count = size = compressed_size = 0
+        for batch in batched(job_ids, options['batch_size'], strict=False):
+            with transaction.atomic():
+                rows = Job.objects.filter(id__in=batch).values_list('id', 'raw_html')
+                job_html = [JobHTML(job_id=job_id, data=JobHTML.compress(html)) for job_id, html in rows]
+                JobHTML.objects.bulk_create(
+                    job_html, update_conflicts=True, unique_fields=['job'], update_fields=['data', 'updated_at']
+                )
+                Job.objects.filter(id__in=batch).update(raw_html='')
+
+            count += len(job_html)
+            size += sum(len(html) for _, html in rows)
+            compressed_size += sum(len(obj.data) for obj in job_html)
+            self.stdout.write(f'Migrated {count} jobs')
+
+        ratio = compressed_size / size if size else 0
+        self.stdout.write(
+            f'Migrated {count} jobs, {size // 1024} KB compressed to {compressed_size // 1024} KB ({ratio:.0%})'
+        )
@@ -1,19 +1,38 @@
 from typing import TYPE_CHECKING, Any
 
-from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.conf import settings
+from django.core.management.base import CommandError, CommandParser
+from django.db.models import QuerySet
 
+from haystack.core.instrumentation import InstrumentedCommand
 from haystack.jobs.models import Job
+from haystack.jobs.workers import Throughput, populate_parallel
+from haystack.search.crawler import crawl_populate
 from haystack.search.models import Source
 from haystack.search.parsers import get_parser
+from haystack.tasks.models import Kind, Task
+from haystack.tasks.worker import Worker
 
 if TYPE_CHECKING:
     from haystack.search.parsers.base import BaseParser
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     def add_arguments(self, parser: CommandParser) -> None:
-        """Add optional source argument."""
+        """Add optional source, async, workers and queue arguments."""
         parser.add_argument('--source')
+        parser.add_argument('--async', action='store_true', dest='use_async', help='Use the asyncio crawler.')
+        parser.add_argument('--concurrency', type=int, default=settings.CRAWL_CONCURRENCY)
+        parser.add_argument('--workers', type=int, default=settings.POPULATE_WORKERS, help='Number of processes.')
+        parser.add_argument('--chunk-size', type=int, default=25, help='Number of jobs per worker task.')
+        parser.add_argument(
+            '--queue',
+            nargs='?',
+            const='both',
+            choices=['enqueue', 'work', 'both'],
+            help='Queue jobs as tasks, execute queued tasks, or both.',
+        )
+        parser.add_argument('--forever', action='store_true', help='With --queue, wait for new tasks when idle.')
 
     def handle(self, **options: Any) -> None:
         """Populate jobs."""
@@ -24,13 +43,50 @@ class Command(BaseCommand):
             except Source.DoesNotExist as e:
                 msg = f'Source {source_name} does not exist.'
                 raise CommandError(msg) from e
-            jobs = Job.objects.filter(status=Job.NEW, populated=False, search_source__source=source)
+            jobs = Job.objects.filter(
+                status=Job.NEW, populated=False, duplicate_of__isnull=True, search_source__source=source
+            )
         else:
-            jobs = Job.objects.filter(status=Job.NEW, populated=False, search_source__isnull=False)
+            jobs = Job.objects.filter(
+                status=Job.NEW, populated=False, duplicate_of__isnull=True, search_source__isnull=False
+            )
 
+        self.stdout.write(f'Populating {jobs.count()} jobs')
+        jobs = jobs.select_related('search_source__source').defer('raw_html', 'description', 'search_vector')
+
+        if options['queue'] is not None:
+            throughput = self.run_queue(jobs, options)
+        elif options['use_async']:
+            throughput = Throughput()
+            throughput.add(
+                crawl_populate(
+                    jobs, options['chunk_size'], concurrency=options['concurrency'], write=self.stdout.write
+                )
+            )
+        elif options['workers'] > 1:
+            job_ids = jobs.values_list('id', flat=True).iterator(chunk_size=options['chunk_size'])
+            throughput = populate_parallel(job_ids, options['workers'], options['chunk_size'], self.stdout.write)
+        else:
+            throughput = self.populate(jobs)
+
+        self.stdout.write(f'Populated {throughput}')
+
+    def run_queue(self, jobs: QuerySet[Job], options: dict[str, Any]) -> Throughput:
+        """Queue jobs and execute queued populate tasks."""
+        throughput = Throughput()
+        if options['queue'] in ('enqueue', 'both'):
+            count = Task.objects.enqueue_populate(jobs.values_list('id', flat=True).iterator(chunk_size=1000))
+            self.stdout.write(f'Queued {count} jobs')
+        if options['queue'] in ('work', 'both'):
+            worker = Worker([Kind.POPULATE], self.stdout.write, batch_size=options['chunk_size'])
+            throughput.add(worker.run(forever=options['forever']))
+        return throughput
+
+    def populate(self, jobs: QuerySet[Job]) -> Throughput:
+        """Populate jobs sequentially in this process."""
+        throughput = Throughput()
         parser_map: dict[str, BaseParser] = {}
-        self.stdout.write(f'Populating {len(jobs)} jobs')
-        for job in jobs:
+        for job in jobs.iterator():
             search_source = job.search_source
             if search_source is None:
                 # this should never be reached due to queryset but check anyways
@@ -38,4 +94,8 @@ class Command(BaseCommand):
             parser_name = search_source.source.parser
             if parser_name not in parser_map:
                 parser_map[parser_name] = get_parser(parser_name)
-            parser_map[parser_name].populate_job(job)  # type: ignore[attr-defined]
+            if parser_map[parser_name].populate_job(job):  # type: ignore[attr-defined]
+                throughput.add(1)
+        for parser in parser_map.values():
+            parser.quit()
+        return throughput
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:22
+
+import django.db.models.deletion
+import haystack.core.fields
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_alter_job_flexibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobHTML',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', haystack.core.fields.AutoCreatedField(auto_now_add=True)),
+                ('updated_at', haystack.core.fields.AutoUpdatedField(auto_now=True)),
+                ('uuid', haystack.core.fields.UUIDField(default=uuid.uuid4, editable=False, verbose_name='UUID')),
+                ('data', models.BinaryField()),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='job_html', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'job html',
+                'verbose_name_plural': 'job html',
+            },
+        ),
+    ]
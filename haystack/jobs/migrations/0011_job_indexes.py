@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_jobhtml'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('populated', False), ('status', 'new')), fields=['search_source', 'id'], name='job_unpopulated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', '-date_found', '-id'], name='job_status_date_found_idx'),
+        ),
+    ]
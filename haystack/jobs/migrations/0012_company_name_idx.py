@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['name', 'id'], name='company_name_idx'),
+        ),
+    ]
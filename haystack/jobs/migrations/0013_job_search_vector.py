@@ -0,0 +1,64 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:27
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Company names live in another table, so the vector is computed by triggers
+# instead of a generated column. Renaming a company touches its jobs.
+CREATE_TRIGGERS = """
+CREATE FUNCTION jobs_job_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce((SELECT name FROM jobs_company WHERE id = NEW.company_id), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_job_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, company_id ON jobs_job
+    FOR EACH ROW EXECUTE FUNCTION jobs_job_search_vector_update();
+
+CREATE FUNCTION jobs_company_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    UPDATE jobs_job SET company_id = company_id WHERE company_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_company_search_vector_trigger
+    AFTER UPDATE OF name ON jobs_company
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION jobs_company_search_vector_update();
+
+UPDATE jobs_job SET company_id = company_id;
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER jobs_company_search_vector_trigger ON jobs_company;
+DROP FUNCTION jobs_company_search_vector_update();
+DROP TRIGGER jobs_job_search_vector_trigger ON jobs_job;
+DROP FUNCTION jobs_job_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_company_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
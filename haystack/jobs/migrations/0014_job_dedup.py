@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:29
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_unpopulated_idx',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='jobs.job'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='simhash_bands',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('duplicate_of__isnull', True), ('populated', False), ('status', 'new')), fields=['search_source', 'id'], name='job_unpopulated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['fingerprint'], name='job_fingerprint_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['simhash_bands'], name='job_simhash_bands_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_job_dedup'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_fingerprint_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['fingerprint', 'id'], name='job_fingerprint_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['uuid'], name='job_uuid_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_job_ingest_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-date_found', '-id'], name='job_date_found_idx'),
+        ),
+    ]
@@ -1,11 +1,22 @@
+import gzip
 import logging
 from datetime import datetime
-from typing import TYPE_CHECKING, Any
-
-from django.db import models
+from functools import partial
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import dateparse, timezone
 
+from haystack.core.instrumentation import timed
 from haystack.core.models import UUIDModel
+from haystack.jobs import dedup
+from haystack.jobs.lookups import COMPANY_IDS, LOCATION_IDS
+from haystack.jobs.signals import jobs_added
 
 if TYPE_CHECKING:
     from haystack.search.models import SearchSource
@@ -23,6 +34,10 @@ class Company(UUIDModel):
     class Meta:
         verbose_name = 'company'
         verbose_name_plural = 'companies'
+        indexes: ClassVar[list[models.Index]] = [
+            # company list ordered by name
+            models.Index(fields=['name', 'id'], name='company_name_idx'),
+        ]
 
     def __str__(self) -> str:
         """Return Company name."""
@@ -45,7 +60,23 @@ class Location(UUIDModel):
         return self.name
 
 
-class JobManager(models.Manager):
+class JobQuerySet(models.QuerySet):
+    """Custom queryset for Job."""
+
+    def search(self, query: str) -> 'JobQuerySet':
+        """Return jobs matching web search style `query`, best match first.
+
+        Matches title, company name and description through `search_vector`.
+        """
+        search_query = SearchQuery(query, search_type='websearch', config='english')
+        return (
+            self.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(models.F('search_vector'), search_query))
+            .order_by('-rank', '-id')
+        )
+
+
+class JobManager(models.Manager.from_queryset(JobQuerySet)):  # type: ignore[misc]
     """Custom model manager for Job."""
 
     def parse_datetime(self, datetime_str: str) -> datetime | None:
@@ -60,29 +91,137 @@ class JobManager(models.Manager):
 
     def add_job(self, job: dict, search_source: 'SearchSource') -> bool:
         """Add parsed job to database."""
-        company, _ = Company.objects.get_or_create(url=job['company_url'], defaults={'name': job['company']})
-
-        location = None
-        if job['location'] is not None:
-            location, _ = Location.objects.get_or_create(name=job['location'])
-
-        _, created = self.get_or_create(
-            url=job['url'],
-            defaults={
-                'company': company,
-                'title': job['title'],
-                'location': location,
-                'date_posted': self.parse_datetime(job['date_posted']),
-                'search_source': search_source,
-                'date_found': self.parse_datetime(job['date_found']),
-                'flexibility': search_source.search.flexibility,
-            },
+        return self.add_jobs([job], search_source) == 1
+
+    def resolve_companies(self, jobs: list[dict]) -> dict[str, int]:
+        """Return mapping of company url to `Company` id, creating missing companies."""
+        names: dict[str, str] = {}
+        for job in jobs:
+            names.setdefault(job['company_url'], job['company'])
+        if not names:
+            return {}
+
+        ids = COMPANY_IDS.get_many(names)
+        if uncached := [url for url in names if url not in ids]:
+            found = dict(Company.objects.filter(url__in=uncached).values_list('url', 'id'))
+            missing = [Company(url=url, name=names[url]) for url in uncached if url not in found]
+            if missing:
+                Company.objects.bulk_create(missing, ignore_conflicts=True)
+                found.update(Company.objects.filter(url__in=[c.url for c in missing]).values_list('url', 'id'))
+            transaction.on_commit(partial(COMPANY_IDS.set_many, found))
+            ids.update(found)
+        return ids
+
+    def resolve_locations(self, jobs: list[dict]) -> dict[str, int]:
+        """Return mapping of location name to `Location` id, creating missing locations."""
+        names = {job['location'] for job in jobs if job['location'] is not None}
+        if not names:
+            return {}
+
+        ids = LOCATION_IDS.get_many(names)
+        if uncached := [name for name in names if name not in ids]:
+            found = dict(Location.objects.filter(name__in=uncached).values_list('name', 'id'))
+            missing = [Location(name=name) for name in uncached if name not in found]
+            if missing:
+                Location.objects.bulk_create(missing, ignore_conflicts=True)
+                found.update(Location.objects.filter(name__in=[loc.name for loc in missing]).values_list('name', 'id'))
+            transaction.on_commit(partial(LOCATION_IDS.set_many, found))
+            ids.update(found)
+        return ids
+
+    def warm_lookups(self) -> int:
+        """Cache ids of the companies and locations of the most recent jobs and return number cached."""
+        recent = self.order_by('-id')[: settings.LOOKUP_CACHE_SIZE]
+        companies = dict(Company.objects.filter(id__in=recent.values('company_id')).values_list('url', 'id'))
+        locations = dict(Location.objects.filter(id__in=recent.values('location_id')).values_list('name', 'id'))
+        COMPANY_IDS.set_many(companies)
+        LOCATION_IDS.set_many(locations)
+        return len(companies) + len(locations)
+
+    def link_duplicates(self, jobs: list['Job']) -> int:
+        """Point each of `jobs` at the oldest job with its fingerprint, if that is another job. Return number linked.
+
+        Runs as one `UPDATE` that looks up the oldest job of each fingerprint
+        through `job_fingerprint_id_idx`, so the cost does not grow with the table.
+        """
+        first = self.filter(fingerprint=models.OuterRef('fingerprint')).order_by('id')
+        canonical = first.annotate(canonical=Coalesce('duplicate_of', 'id')).values('canonical')[:1]
+        return (
+            self.filter(uuid__in=[job.uuid for job in jobs], duplicate_of__isnull=True)
+            .exclude(fingerprint='')
+            .exclude(id=models.Subquery(first.values('id')[:1]))
+            .update(duplicate_of=models.Subquery(canonical))
         )
-        return created
 
+    @timed('db_write')
     def add_jobs(self, jobs: list[dict], search_source: 'SearchSource') -> int:
-        """Add parsed jobs to database."""
-        return sum(1 for job in jobs if self.add_job(job, search_source))
+        """Add parsed jobs to database in bulk and return number of jobs created.
+
+        Companies and locations are deduplicated within the batch, looked up in
+        `lookups.COMPANY_IDS` and `lookups.LOCATION_IDS`, and the rest resolved
+        with one `IN` query per table. Jobs are inserted with
+        `ignore_conflicts=True`, so the created count is taken by looking up the
+        client generated `uuid` of each inserted row.
+
+        New jobs with the same `dedup.fingerprint` as an existing job are
+        linked to it through `duplicate_of` and are skipped by `populate`.
+        """
+        unique_jobs: dict[str, dict] = {}
+        for job in jobs:
+            unique_jobs.setdefault(job['url'], job)
+        if not unique_jobs:
+            return 0
+
+        existing = set(self.filter(url__in=unique_jobs).values_list('url', flat=True))
+        new_jobs = [job for url, job in unique_jobs.items() if url not in existing]
+        if not new_jobs:
+            return 0
+
+        try:
+            count = self.insert_jobs(new_jobs, search_source)
+        except IntegrityError:
+            # a cached company or location was deleted meanwhile
+            logger.warning('Retrying %d jobs without cached company and location ids', len(new_jobs))
+            COMPANY_IDS.discard({job['company_url'] for job in new_jobs})
+            LOCATION_IDS.discard({job['location'] for job in new_jobs if job['location'] is not None})
+            count = self.insert_jobs(new_jobs, search_source)
+
+        if count:
+            jobs_added.send(sender=self.model, search_source=search_source, count=count)
+        return count
+
+    def insert_jobs(self, jobs: list[dict], search_source: 'SearchSource') -> int:
+        """Insert jobs not in database in one transaction and return number created.
+
+        Foreign keys are deferred to the outermost commit. Inside an outer
+        transaction they are checked before the savepoint is released, so a
+        stale cached id fails here, where `add_jobs` can retry the batch.
+        """
+        nested = connection.in_atomic_block
+        with transaction.atomic():
+            company_ids = self.resolve_companies(jobs)
+            location_ids = self.resolve_locations(jobs)
+            flexibility = search_source.search.flexibility
+            objs = [
+                self.model(
+                    url=job['url'],
+                    company_id=company_ids[job['company_url']],
+                    title=job['title'],
+                    location_id=location_ids.get(job['location']) if job['location'] is not None else None,
+                    date_posted=self.parse_datetime(job['date_posted']),
+                    search_source=search_source,
+                    date_found=self.parse_datetime(job['date_found']),
+                    flexibility=flexibility,
+                    fingerprint=dedup.fingerprint(job['company_url'], job['title'], job['location']),
+                )
+                for job in jobs
+            ]
+            self.bulk_create(objs, ignore_conflicts=True)
+            if nested and (COMPANY_IDS or LOCATION_IDS):
+                connection.check_constraints()
+            count = self.filter(uuid__in=[obj.uuid for obj in objs]).count()
+            self.link_duplicates(objs)
+        return count
 
 
 class Job(UUIDModel):
@@ -141,19 +280,81 @@ class Job(UUIDModel):
     # this case we ignore since this CharField is acting as an enum field
     flexibility = models.CharField(max_length=6, choices=FLEXIBILITY_CHOICES, default=None, null=True, blank=True)  # noqa: DJ001
 
+    # legacy uncompressed html, superseded by `JobHTML` and emptied by `migraterawhtml`
     raw_html = models.TextField(default='')
     description = models.TextField(default='')
     easy_apply = models.BooleanField(default=False)
 
+    # weighted title, company name and description, maintained by a database trigger
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # duplicate detection, see `haystack.jobs.dedup`
+    fingerprint = models.CharField(max_length=32, default='', blank=True, editable=False)
+    simhash = models.BigIntegerField(null=True, blank=True, editable=False)
+    simhash_bands = ArrayField(models.IntegerField(), default=list, blank=True, editable=False)
+    duplicate_of = models.ForeignKey(
+        'self', related_name='duplicates', on_delete=models.SET_NULL, null=True, blank=True
+    )
+
     status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=NEW)
     date_applied = models.DateTimeField(null=True, blank=True)
 
     objects = JobManager()
 
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            # jobs waiting for `populate`, a small fraction of the table
+            models.Index(
+                fields=['search_source', 'id'],
+                name='job_unpopulated_idx',
+                condition=models.Q(populated=False, status='new', duplicate_of__isnull=True),
+            ),
+            # jobs list filtered by status, newest first
+            models.Index(fields=['status', '-date_found', '-id'], name='job_status_date_found_idx'),
+            # unfiltered jobs list, newest first
+            models.Index(fields=['-date_found', '-id'], name='job_date_found_idx'),
+            GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+            # oldest job of each fingerprint, see `link_duplicates`
+            models.Index(fields=['fingerprint', 'id'], name='job_fingerprint_id_idx'),
+            GinIndex(fields=['simhash_bands'], name='job_simhash_bands_idx'),
+            # rows inserted by `add_jobs`, looked up by their client generated uuid
+            models.Index(fields=['uuid'], name='job_uuid_idx'),
+        ]
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Cache Job status to track event history."""
         super().__init__(*args, **kwargs)
         self.cached_status = self.status
+        self.pending_html: str | None = None
+        self.html_changed = False
+
+    def update_simhash(self) -> None:
+        """Set `simhash` and `simhash_bands` from `description`. Does not save."""
+        self.simhash = dedup.simhash(self.description)
+        self.simhash_bands = dedup.bands(self.simhash) if self.simhash is not None else []
+
+    @property
+    def html(self) -> str:
+        """Return raw html of job page, loading and decompressing `JobHTML` on first access."""
+        if self.pending_html is None:
+            try:
+                self.pending_html = self.job_html.text
+            except JobHTML.DoesNotExist:
+                return self.raw_html
+        return self.pending_html
+
+    @html.setter
+    def html(self, value: str) -> None:
+        """Set raw html of job page, written to `JobHTML` on save."""
+        self.pending_html = value
+        self.html_changed = True
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Save Job and compressed html if it was set."""
+        super().save(*args, **kwargs)
+        if self.html_changed and self.pending_html is not None:
+            JobHTML.objects.update_or_create(job=self, defaults={'data': JobHTML.compress(self.pending_html)})
+            self.html_changed = False
 
     def update_status(self, new_status: str) -> None:
         """Update Job status and create Event.
@@ -184,6 +385,31 @@ class Job(UUIDModel):
         return self.title
 
 
+class JobHTML(UUIDModel):
+    """Gzip compressed raw html of a job page, stored apart from the `Job` row."""
+
+    job = models.OneToOneField(Job, related_name='job_html', on_delete=models.CASCADE)
+    data = models.BinaryField()
+
+    class Meta:
+        verbose_name = 'job html'
+        verbose_name_plural = 'job html'
+
+    @staticmethod
+    def compress(html: str) -> bytes:
+        """Return gzip compressed `html`."""
+        return gzip.compress(html.encode(), mtime=0)
+
+    @property
+    def text(self) -> str:
+        """Return decompressed html."""
+        return gzip.decompress(bytes(self.data)).decode()
+
+    def __str__(self) -> str:
+        """Return Job title."""
+        return str(self.job)
+
+
 class Event(UUIDModel):
     """Represents Job history event."""
 
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by `JobManager.add_jobs` with `search_source` and `count`, since
+# `bulk_create` does not send `post_save`
+jobs_added = Signal()
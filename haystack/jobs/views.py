@@ -1,15 +1,145 @@
+import uuid
+
 from django.contrib.auth.decorators import login_required
-from django.http import HttpRequest, HttpResponse
+from django.core.exceptions import BadRequest
+from django.db.models import Count
+from django.http import HttpRequest, HttpResponse, JsonResponse, QueryDict
 from django.shortcuts import render
 
+from haystack.core.pagination import KeysetPage, KeysetPaginator
+from haystack.jobs.models import Company, Job, JobQuerySet
+
+JOB_FIELDS = (
+    'uuid',
+    'title',
+    'url',
+    'status',
+    'flexibility',
+    'easy_apply',
+    'date_posted',
+    'date_found',
+    'company__uuid',
+    'company__name',
+    'company__url',
+    'location__uuid',
+    'location__name',
+)
+
+PER_PAGE = 50
+
+
+def parse_uuid(value: str) -> uuid.UUID:
+    """Return `value` as UUID. Raise `BadRequest` if it is malformed."""
+    try:
+        return uuid.UUID(value)
+    except ValueError as e:
+        msg = f'Invalid UUID {value}'
+        raise BadRequest(msg) from e
+
+
+def filter_jobs(params: QueryDict) -> JobQuerySet:
+    """Return jobs matching status, flexibility, easy_apply, company and location filters."""
+    jobs = Job.objects.select_related('company', 'location').only(*JOB_FIELDS)
+    if status := params.get('status'):
+        if status not in dict(Job.STATUS_CHOICES):
+            msg = f'Invalid status {status}'
+            raise BadRequest(msg)
+        jobs = jobs.filter(status=status)
+    if flexibility := params.get('flexibility'):
+        if flexibility not in dict(Job.FLEXIBILITY_CHOICES):
+            msg = f'Invalid flexibility {flexibility}'
+            raise BadRequest(msg)
+        jobs = jobs.filter(flexibility=flexibility)
+    if easy_apply := params.get('easy_apply'):
+        jobs = jobs.filter(easy_apply=easy_apply == 'true')
+    if company := params.get('company'):
+        jobs = jobs.filter(company__uuid=parse_uuid(company))
+    if location := params.get('location'):
+        jobs = jobs.filter(location__uuid=parse_uuid(location))
+    return jobs
+
+
+def get_job_page(request: HttpRequest) -> KeysetPage[Job]:
+    """Return page of filtered jobs, newest first."""
+    paginator = KeysetPaginator(filter_jobs(request.GET), 'date_found', per_page=PER_PAGE)
+    return paginator.get_page(request.GET.get('cursor'))
+
+
+def get_company_page(request: HttpRequest) -> KeysetPage[Company]:
+    """Return page of companies by name with number of jobs of each."""
+    companies = Company.objects.only('uuid', 'name', 'url')
+    if query := request.GET.get('q'):
+        companies = companies.filter(name__icontains=query)
+    page = KeysetPaginator(companies, 'name', descending=False, per_page=PER_PAGE).get_page(request.GET.get('cursor'))
+
+    # count jobs of this page only instead of aggregating the whole table
+    job_counts = dict(
+        Job.objects.filter(company__in=page.object_list).values_list('company').annotate(count=Count('id')).order_by()
+    )
+    for company in page.object_list:
+        company.job_count = job_counts.get(company.pk, 0)  # type: ignore[attr-defined]
+    return page
+
+
+def serialize_job(job: Job) -> dict:
+    """Return JSON serializable job."""
+    return {
+        'uuid': job.uuid,
+        'title': job.title,
+        'url': job.url,
+        'status': job.status,
+        'flexibility': job.flexibility,
+        'easy_apply': job.easy_apply,
+        'date_posted': job.date_posted,
+        'date_found': job.date_found,
+        'company': {'uuid': job.company.uuid, 'name': job.company.name, 'url': job.company.url},
+        'location': {'uuid': job.location.uuid, 'name': job.location.name} if job.location else None,
+    }
+
 
 @login_required
 def jobs(request: HttpRequest) -> HttpResponse:
-    """Display list of Jobs."""
-    return render(request, 'jobs/jobs.html')
+    """Display list of Jobs. HTMX requests receive only the rows of the requested page."""
+    template = 'jobs/partials/job_rows.html' if request.htmx else 'jobs/jobs.html'  # type: ignore[attr-defined]
+    context = {
+        'page': get_job_page(request),
+        'statuses': Job.STATUS_CHOICES,
+        'flexibilities': Job.FLEXIBILITY_CHOICES,
+    }
+    return render(request, template, context)
+
+
+@login_required
+def jobs_api(request: HttpRequest) -> JsonResponse:
+    """Return page of Jobs as JSON."""
+    page = get_job_page(request)
+    return JsonResponse({'results': [serialize_job(job) for job in page.object_list], 'next': page.next_cursor})
+
+
+@login_required
+def jobs_search_api(request: HttpRequest) -> JsonResponse:
+    """Return best matching Jobs for full-text query `q` as JSON."""
+    query = request.GET.get('q', '').strip()
+    if not query:
+        msg = 'Missing query'
+        raise BadRequest(msg)
+    jobs = filter_jobs(request.GET).search(query)[:PER_PAGE]
+    return JsonResponse({'results': [serialize_job(job) | {'rank': job.rank} for job in jobs]})  # type: ignore[attr-defined]
 
 
 @login_required
 def companies(request: HttpRequest) -> HttpResponse:
-    """Display list of Companies."""
-    return render(request, 'jobs/companies.html')
+    """Display list of Companies. HTMX requests receive only the rows of the requested page."""
+    template = 'jobs/partials/company_rows.html' if request.htmx else 'jobs/companies.html'  # type: ignore[attr-defined]
+    return render(request, template, {'page': get_company_page(request)})
+
+
+@login_required
+def companies_api(request: HttpRequest) -> JsonResponse:
+    """Return page of Companies as JSON."""
+    page = get_company_page(request)
+    results = [
+        {'uuid': company.uuid, 'name': company.name, 'url': company.url, 'job_count': company.job_count}  # type: ignore[attr-defined]
+        for company in page.object_list
+    ]
+    return JsonResponse({'results': results, 'next': page.next_cursor})
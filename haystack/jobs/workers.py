@@ -0,0 +1,135 @@
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import batched
+from multiprocessing.util import Finalize
+from typing import TYPE_CHECKING, Any
+
+import django
+from django.apps import apps
+
+from haystack.core.instrumentation import REGISTRY
+from haystack.search.driverpool import close_driver_pools
+
+if TYPE_CHECKING:
+    from haystack.search.parsers.base import BaseParser
+
+# Worker processes are started with `spawn` so they never share database
+# sockets or browser sessions with the parent. This module is imported before
+# Django is set up in the worker, so models are imported inside functions.
+
+logger = logging.getLogger(__name__)
+
+# parsers owned by the current worker process
+_parsers: dict[str, 'BaseParser'] = {}
+
+
+def _quit_parsers() -> None:
+    """Quit every parser and pooled browser owned by the current worker process.
+
+    `atexit` handlers do not run in pool workers, so pools are closed here.
+    """
+    for parser in _parsers.values():
+        parser.quit()
+    _parsers.clear()
+    close_driver_pools()
+
+
+def init_worker() -> None:
+    """Set up Django in worker process."""
+    if not apps.ready:
+        django.setup()
+    Finalize(None, _quit_parsers, exitpriority=10)
+
+
+def populate_chunk(job_ids: list[int]) -> tuple[int, dict[str, list[list[Any]]]]:
+    """Populate jobs by id with parsers owned by the current process.
+
+    Return number of jobs populated and snapshot of metrics recorded meanwhile,
+    for the parent process to merge.
+    """
+    from haystack.jobs.models import Job  # noqa: PLC0415
+    from haystack.search.parsers import get_parser  # noqa: PLC0415
+
+    REGISTRY.reset()
+    count = 0
+    jobs = (
+        Job.objects.filter(id__in=job_ids)
+        .select_related('search_source__source')
+        .defer('raw_html', 'description', 'search_vector')
+    )
+    for job in jobs:
+        if job.search_source is None:
+            continue
+        parser_name = job.search_source.source.parser
+        if parser_name not in _parsers:
+            _parsers[parser_name] = get_parser(parser_name)
+        try:
+            populated = _parsers[parser_name].populate_job(job)  # type: ignore[attr-defined]
+        except Exception:
+            logger.exception('Error populating %s', job.url)
+            continue
+        count += populated
+    return count, REGISTRY.snapshot()
+
+
+class Throughput:
+    """Track number of completed items per second."""
+
+    def __init__(self) -> None:
+        self.start = time.monotonic()
+        self.count = 0
+
+    def add(self, count: int) -> None:
+        """Record completed items."""
+        self.count += count
+
+    @property
+    def elapsed(self) -> float:
+        """Return seconds since start."""
+        return time.monotonic() - self.start
+
+    @property
+    def rate(self) -> float:
+        """Return completed items per second."""
+        return self.count / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        """Return count, elapsed time and rate."""
+        return f'{self.count} jobs in {self.elapsed:.1f}s ({self.rate:.2f} jobs/s)'
+
+
+def populate_parallel(
+    job_ids: Iterable[int],
+    workers: int,
+    chunk_size: int = 25,
+    write: Callable[[str], object] = logger.info,
+) -> Throughput:
+    """Shard `job_ids` into chunks and populate them on a pool of worker processes.
+
+    `job_ids` is consumed lazily and at most two chunks per worker are in
+    flight, so the full id list is never materialized. Metrics recorded by
+    workers are merged into `REGISTRY` of this process.
+    """
+    throughput = Throughput()
+    chunks: Iterator[tuple[int, ...]] = batched(job_ids, chunk_size, strict=False)
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker) as executor:
+        pending: set[Future[tuple[int, dict[str, list[list[Any]]]]]] = set()
+        while True:
+            for chunk in chunks:
+                pending.add(executor.submit(populate_chunk, list(chunk)))
+                if len(pending) >= workers * 2:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                count, snapshot = future.result()
+                throughput.add(count)
+                REGISTRY.merge(snapshot)
+            write(f'Populated {throughput}')
+    return throughput
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MetricsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'haystack.metrics'
+
+    def ready(self) -> None:
+        """Connect signal receivers that maintain `DailyCount` rollups."""
+        from haystack.metrics import signals  # noqa: F401, PLC0415
@@ -0,0 +1,42 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from haystack.jobs.models import Event, Job
+from haystack.metrics.models import DailyCount
+
+
+class Command(BaseCommand):
+    help = 'Rebuild DailyCount rollups from Job and Event history.'
+
+    def handle(self, **_options: Any) -> None:
+        """Replace every rollup row with counts computed from jobs and status events."""
+        found = (
+            Job.objects.filter(date_found__isnull=False)
+            .values_list('date_found', 'search_source')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        status_changes = (
+            Event.objects.filter(event_type=Event.STATUS)
+            .annotate(day=TruncDate('created_at'))
+            .values_list('day', 'job__search_source', 'new_status')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        rows = [
+            DailyCount(date=day, search_source_id=search_source_id, metric=DailyCount.FOUND, count=count)
+            for day, search_source_id, count in found
+        ]
+        rows.extend(
+            DailyCount(date=day, search_source_id=search_source_id, metric=metric, count=count)
+            for day, search_source_id, metric, count in status_changes
+        )
+
+        with transaction.atomic():
+            DailyCount.objects.all().delete()
+            DailyCount.objects.bulk_create(rows, batch_size=1000)
+        self.stdout.write(f'Created {len(rows)} daily counts')
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:24
+
+import django.db.models.deletion
+import haystack.core.fields
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('search', '0005_searchsource_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', haystack.core.fields.AutoCreatedField(auto_now_add=True)),
+                ('updated_at', haystack.core.fields.AutoUpdatedField(auto_now=True)),
+                ('uuid', haystack.core.fields.UUIDField(default=uuid.uuid4, editable=False, verbose_name='UUID')),
+                ('date', models.DateField()),
+                ('metric', models.CharField(choices=[('found', 'Found'), ('new', 'New'), ('expired', 'Expired'), ('dismissed', 'Dismissed'), ('saved', 'Saved'), ('applied', 'Applied'), ('rejected', 'Rejected'), ('interviewing', 'Interviewing'), ('offer', 'Offer'), ('accepted', 'Accepted'), ('withdrawn', 'Withdrawn')], max_length=12)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('search_source', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_counts', to='search.searchsource')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['metric', 'date'], name='dailycount_metric_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'search_source', 'metric'), name='dailycount_unique', nulls_distinct=False)],
+            },
+        ),
+    ]
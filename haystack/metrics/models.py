@@ -0,0 +1,59 @@
+from datetime import date
+from typing import ClassVar
+
+from django.db import models
+from django.db.models import F, Q, Sum
+
+from haystack.core.models import UUIDModel
+from haystack.jobs.models import Job
+from haystack.search.models import SearchSource
+
+
+class DailyCountManager(models.Manager):
+    """Custom model manager for DailyCount."""
+
+    def increment(self, day: date, search_source_id: int | None, metric: str, count: int = 1) -> None:
+        """Add `count` to rollup row, creating it if needed."""
+        obj, _ = self.get_or_create(date=day, search_source_id=search_source_id, metric=metric)
+        self.filter(pk=obj.pk).update(count=F('count') + count)
+
+    def totals(self, metric: str, **ranges: tuple[date, date]) -> dict[str, int]:
+        """Return sum of `metric` over every inclusive date range, plus all time as `total`, in one query."""
+        sums = {name: Sum('count', filter=Q(date__range=dates)) for name, dates in ranges.items()}
+        result = self.filter(metric=metric).aggregate(total=Sum('count'), **sums)
+        return {name: value or 0 for name, value in result.items()}
+
+
+class DailyCount(UUIDModel):
+    """Number of jobs found, or moved to a status, per day and `SearchSource`.
+
+    `metric` is `FOUND` or the new `Job` status of a status change.
+    """
+
+    FOUND = 'found'
+
+    METRIC_CHOICES = ((FOUND, FOUND.capitalize()), *Job.STATUS_CHOICES)
+
+    date = models.DateField()
+    # counts of a deleted `SearchSource` are merged into the null rows, see `signals.merge_daily_counts`
+    search_source = models.ForeignKey(
+        SearchSource, related_name='daily_counts', on_delete=models.CASCADE, null=True, blank=True
+    )
+    metric = models.CharField(max_length=12, choices=METRIC_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    objects = DailyCountManager()
+
+    class Meta:
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=['date', 'search_source', 'metric'], name='dailycount_unique', nulls_distinct=False
+            ),
+        ]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=['metric', 'date'], name='dailycount_metric_date_idx'),
+        ]
+
+    def __str__(self) -> str:
+        """Return date, metric and count."""
+        return f'{self.date} | {self.metric}: {self.count}'
@@ -0,0 +1,32 @@
+from typing import Any
+
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from haystack.jobs.models import Event, Job
+from haystack.jobs.signals import jobs_added
+from haystack.metrics.models import DailyCount
+from haystack.search.models import SearchSource
+
+
+@receiver(jobs_added, sender=Job)
+def count_jobs_added(search_source: SearchSource, count: int, **_kwargs: Any) -> None:
+    """Add ingested jobs to today's found count."""
+    DailyCount.objects.increment(timezone.localdate(), search_source.id, DailyCount.FOUND, count)
+
+
+@receiver(post_save, sender=Event)
+def count_status_change(instance: Event, created: bool, **_kwargs: Any) -> None:
+    """Add status change to the count of its new status."""
+    if not created or instance.event_type != Event.STATUS:
+        return
+    day = timezone.localdate(instance.created_at)
+    DailyCount.objects.increment(day, instance.job.search_source_id, instance.new_status)
+
+
+@receiver(pre_delete, sender=SearchSource)
+def merge_daily_counts(instance: SearchSource, **_kwargs: Any) -> None:
+    """Move counts of deleted `SearchSource` to rows without one so totals are kept."""
+    for day, metric, count in instance.daily_counts.values_list('date', 'metric', 'count'):
+        DailyCount.objects.increment(day, None, metric, count)
@@ -1,40 +1,51 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
+from django.utils import timezone
+
+from haystack.core.instrumentation import load_snapshots
+from haystack.jobs.models import Job
+from haystack.metrics.models import DailyCount
+
+PERIODS = (('Today', 1), ('Last 7 Days', 7), ('Last 30 Days', 30))
 
 
 @login_required
 def dashboard(request: HttpRequest) -> HttpResponse:
-    """Display metrics."""
-    metrics = [
-        {
-            'title': 'Today',
-            'count': 20,
-            'goal': 32,
-            'delta': -2,
-            'progress': 63,
-        },
-        {
-            'title': 'Last 7 Days',
-            'count': 125,
-            'goal': 224,
-            'delta': 7,
-            'progress': 56,
-        },
-        {
-            'title': 'Last 30 Days',
-            'count': 633,
-            'goal': 960,
-            'delta': 15,
-            'progress': 66,
-        },
-        {
-            'title': 'Total',
-            'count': 2914,
-            'goal': 0,
-            'delta': 0,
-            'progress': 0,
-        },
-    ]
+    """Display number of applications per period from `DailyCount` rollups."""
+    today = timezone.localdate()
+    ranges = {}
+    for _, days in PERIODS:
+        start = today - timedelta(days=days - 1)
+        ranges[f'current_{days}'] = (start, today)
+        ranges[f'previous_{days}'] = (start - timedelta(days=days), start - timedelta(days=1))
+    totals = DailyCount.objects.totals(Job.APPLIED, **ranges)
+
+    metrics = []
+    for title, days in PERIODS:
+        count = totals[f'current_{days}']
+        previous = totals[f'previous_{days}']
+        goal = settings.METRICS_DAILY_GOAL * days
+        metrics.append(
+            {
+                'title': title,
+                'count': count,
+                'goal': goal,
+                'delta': round((count - previous) / previous * 100) if previous else 0,
+                'progress': min(round(count / goal * 100), 100) if goal else 0,
+            }
+        )
+    metrics.append({'title': 'Total', 'count': totals['total'], 'goal': 0, 'delta': 0, 'progress': 0})
 
     return render(request, 'metrics/dashboard.html', {'metrics': metrics})
+
+
+def prometheus(_request: HttpRequest) -> HttpResponse:
+    """Return scrape timings saved by the last run of every command in Prometheus text format.
+
+    Not login protected so Prometheus can scrape it.
+    """
+    return HttpResponse(load_snapshots().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,376 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable, Coroutine, Iterable
+from dataclasses import dataclass
+from itertools import batched
+from typing import Any
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, sync_to_async
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.db.models import QuerySet
+from seleniumwire.request import Response
+
+from haystack.core.instrumentation import record_response, record_retry, timed
+from haystack.jobs.models import Job
+from haystack.search.extractors import make_soup
+from haystack.search.fetchers import ERROR_STATUS_CODES, BaseFetcher, FetchError, HTTPFetcher
+from haystack.search.models import SearchSource, Status
+from haystack.search.parsers import get_parser
+from haystack.search.parsers.base import BaseParser
+from haystack.search.retry import Action, RetryPolicy, get_breaker
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate to a single host."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class Page:
+    """Result of fetching a url."""
+
+    url: str
+    status_code: int | None
+    response: Response | None
+    text: str = ''
+
+    @property
+    def ok(self) -> bool:
+        """Return if page was fetched successfully."""
+        return self.response is not None and self.status_code not in ERROR_STATUS_CODES
+
+    @timed('soupify')
+    def soupify(self) -> BeautifulSoup:
+        """Parse page text into BeautifulSoup object."""
+        return make_soup(self.text)
+
+
+class Crawler:
+    """Crawl search pages and job pages concurrently on an asyncio event loop.
+
+    At most `concurrency` requests are in flight at once and each host is
+    limited to `rate` requests per second by a `TokenBucket`. A request waits
+    for its host's token before taking a concurrency slot, so a throttled host
+    does not hold slots other hosts could use. Failed requests are retried
+    according to a `RetryPolicy` using `asyncio.sleep`, so a retrying url does
+    not hold a concurrency slot or stall other work.
+
+    Blocking HTTP calls run in worker threads through `HTTPFetcher.request`.
+    Job pages need JS rendering, as in `LinkedInParser.populate_job`, so they
+    are loaded by up to `concurrency` Firefox fetchers, each borrowing a
+    browser from the shared `DriverPool`. Database writes run through
+    `sync_to_async` and are therefore serialized on a single thread.
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        rate: float | None = None,
+        burst: float | None = None,
+        policy: RetryPolicy | None = None,
+        write: Callable[[str], object] = logger.info,
+    ) -> None:
+        self.concurrency = concurrency or settings.CRAWL_CONCURRENCY
+        self.rate = rate or settings.CRAWL_RATE
+        self.burst = burst or settings.CRAWL_BURST
+        self.policy = policy or RetryPolicy()
+        self.write = write
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.buckets: dict[str, TokenBucket] = {}
+        self.parsers: dict[str, BaseParser] = {}
+        self.fetchers: dict[str, HTTPFetcher] = {}
+        # idle browser fetchers by parser name, used by one thread at a time
+        self.browsers: dict[str, list[BaseFetcher]] = {}
+        self.browsers_lock = threading.Lock()
+
+    def get_parser(self, name: str) -> BaseParser:
+        """Return parser by name, creating it if needed."""
+        if name not in self.parsers:
+            self.parsers[name] = get_parser(name)
+        return self.parsers[name]
+
+    def get_fetcher(self, parser: BaseParser) -> HTTPFetcher:
+        """Return HTTP fetcher sized for `self.concurrency` using hooks of `parser`."""
+        if parser.name not in self.fetchers:
+            self.fetchers[parser.name] = HTTPFetcher(
+                settings.SEARCH_PROXY, parser.intercept_request, parser.process_response, maxsize=self.concurrency
+            )
+            self.fetchers[parser.name].cache = parser.get_cache()
+        return self.fetchers[parser.name]
+
+    def browse(self, parser: BaseParser, url: str) -> tuple[Response | None, str]:
+        """Load `url` in an idle browser of `parser` and return its response and page source."""
+        with self.browsers_lock:
+            idle = self.browsers.setdefault(parser.name, [])
+            browser = idle.pop() if idle else parser.create_fetcher('firefox')
+        try:
+            browser.get(url)
+        except browser.exceptions:
+            if not browser.is_healthy():
+                browser.reset()
+            raise
+        else:
+            return browser.last_response, browser.page_source
+        finally:
+            with self.browsers_lock:
+                self.browsers[parser.name].append(browser)
+
+    def get_bucket(self, url: str) -> TokenBucket:
+        """Return token bucket for host of `url`."""
+        host = (urlsplit(url).hostname or '').removeprefix('www.')
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    async def fetch(self, parser: BaseParser, url: str, browser: bool = False) -> Page:
+        """Fetch `url` with retries, rendered by a browser if `browser`, and return `Page`."""
+        fetcher = self.get_fetcher(parser)
+        exceptions = parser.fetcher_classes['firefox'].exceptions if browser else fetcher.exceptions
+        breaker = get_breaker(url)
+        page = Page(url, None, None)
+        delay = self.policy.base
+        for attempt in range(self.policy.retries):
+            if not breaker.allow():
+                logger.warning('Circuit open, skipping %s', url)
+                return Page(url, None, None)
+            try:
+                await self.get_bucket(url).acquire()
+                async with self.semaphore:
+                    logger.info('GET %s', url)
+                    response, text = None, ''
+                    try:
+                        if browser:
+                            # the browser fetcher times and records its own responses
+                            response, text = await asyncio.to_thread(self.browse, parser, url)
+                        else:
+                            with timed('fetch'):
+                                response = await asyncio.to_thread(fetcher.request, url)
+                            text = fetcher.decode(response)
+                    except exceptions:
+                        logger.warning('Attempt %d failed for %s', attempt + 1, url)
+            except BaseException:
+                # cancelled or failed unexpectedly
+                breaker.release()
+                raise
+            page = Page(url, getattr(response, 'status_code', None), response, text)
+            if not browser:
+                record_response(page.status_code, getattr(response, 'body', None))
+            if page.ok:
+                breaker.record_success()
+                return page
+
+            if self.policy.classify(page.status_code) == Action.GIVE_UP:
+                breaker.record_success()
+                return page
+            breaker.record_failure()
+
+            if attempt + 1 < self.policy.retries:
+                record_retry(page.status_code)
+                delay = self.policy.get_delay(response, delay)
+                logger.info('Retrying %s in %.1f seconds', url, delay)
+                with timed('backoff'):
+                    await asyncio.sleep(delay)
+        logger.warning('Max retries for %s exceeded', url)
+        return page
+
+    async def get_page_count(self, parser: BaseParser, search_source: SearchSource) -> int:
+        """Return number of pages to search. Raise `FetchError` if the search page cannot be fetched."""
+        url = parser.get_linkedin_url('/jobs/', search_source.search)  # type: ignore[attr-defined]
+        page = await self.fetch(parser, url)
+        if not page.ok:
+            msg = f'Unable to retrieve job count from {url}'
+            raise FetchError(msg)
+        count = parser.parse_job_count(page.soupify())  # type: ignore[attr-defined]
+        return (count // parser.JOBS_PER_PAGE) + 1  # type: ignore[attr-defined]
+
+    async def fetch_jobs(
+        self, parser: BaseParser, search_source: SearchSource, page_number: int, newest_first: bool = False
+    ) -> list[dict]:
+        """Fetch and parse one page of `search_source`. Raise `FetchError` if the page cannot be fetched."""
+        url = parser.get_search_url(search_source, page_number, newest_first)  # type: ignore[attr-defined]
+        page = await self.fetch(parser, url)
+        if not page.ok:
+            msg = f'Unable to fetch page {page_number} from {url}'
+            raise FetchError(msg)
+        return parser.parse_jobs(page.text)  # type: ignore[attr-defined]
+
+    async def store_jobs(self, jobs: list[dict], search_source: SearchSource, page_number: int) -> int:
+        """Store jobs from one page of `search_source` and return number of jobs added."""
+        count = await sync_to_async(Job.objects.add_jobs)(jobs, search_source)
+        await sync_to_async(search_source.update_newest_date_posted)(jobs)
+        self.write(f'Added {count} jobs from page {page_number} of {search_source}')
+        return count
+
+    async def search_pages(
+        self, parser: BaseParser, search_source: SearchSource, max_pages: int, incremental: bool = False
+    ) -> list[int]:
+        """Fetch and store pages of `search_source` and return number of jobs added per page.
+
+        Pages are fetched in windows of `concurrency` pages, or one at a time
+        when `incremental`, until a window contains a short page. With
+        `incremental` set crawling also stops at a page of mostly known jobs.
+        """
+        since = search_source.newest_date_posted
+        window = 1 if incremental else self.concurrency
+        counts = []
+        for start in range(1, max_pages + 1, window):
+            page_numbers = range(start, min(start + window, max_pages + 1))
+            # a failed page cancels the rest of its window
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self.fetch_jobs(parser, search_source, number, incremental))
+                    for number in page_numbers
+                ]
+            pages = [task.result() for task in tasks]
+            is_last = False
+            for page_number, jobs in zip(page_numbers, pages, strict=True):
+                if incremental and await sync_to_async(search_source.is_known_page)(jobs, since):
+                    logger.info('Stopping %s after known page %d', search_source, page_number)
+                    is_last = True
+                is_last = is_last or len(jobs) < parser.JOBS_PER_PAGE  # type: ignore[attr-defined]
+                counts.append(await self.store_jobs(jobs, search_source, page_number))
+            if is_last:
+                break
+        return counts
+
+    async def search(self, search_source: SearchSource, incremental: bool = False) -> int:
+        """Crawl every page of `search_source` and return number of jobs added.
+
+        With `incremental` set, pages are fetched in order and crawling stops
+        at the first page that is mostly made of known jobs. The job count is
+        only fetched if `settings.SEARCH_FETCH_JOB_COUNT`.
+        """
+        self.write(f'Executing {search_source}')
+        await sync_to_async(search_source.set_status)(Status.RUNNING)
+        try:
+            parser = self.get_parser(search_source.source.parser)
+            max_pages = parser.MAX_PAGES  # type: ignore[attr-defined]
+            if settings.SEARCH_FETCH_JOB_COUNT:
+                max_pages = min(await self.get_page_count(parser, search_source), max_pages)
+            counts = await self.search_pages(parser, search_source, max_pages, incremental)
+            self.write(f'Searched {len(counts)} pages for {search_source}')
+        except Exception:
+            logger.exception('Error executing %s', search_source)
+            await sync_to_async(search_source.set_status)(Status.ERROR)
+            return 0
+        await sync_to_async(search_source.set_status)(Status.SUCCESS)
+        return sum(counts)
+
+    @staticmethod
+    def parse_job_page(parser: BaseParser, job: Job, page: Page) -> None:
+        """Parse job `page` into `job`. Does not save."""
+        parser.parse_job_page(job, page.soupify())  # type: ignore[attr-defined]
+
+    async def populate(self, job: Job) -> bool:
+        """Fetch job page and populate `job`. Return if job was populated."""
+        if job.search_source is None:
+            return False
+        try:
+            parser = self.get_parser(job.search_source.source.parser)
+            page = await self.fetch(parser, job.url, browser=True)
+            if not page.ok:
+                logger.warning('Response for %s is None', job.url)
+                if page.status_code == 404:
+                    logger.warning('Job not found, marking as expired')
+                    await sync_to_async(job.update_status)(Job.EXPIRED)
+                return False
+            # parsing is CPU bound, keep it off the event loop
+            await asyncio.to_thread(self.parse_job_page, parser, job, page)
+            await sync_to_async(job.save)()
+        except Exception:
+            logger.exception('Error populating %s', job.url)
+            return False
+        return True
+
+    async def run(self, coroutines: Iterable[Coroutine[Any, Any, Any]]) -> list:
+        """Run `coroutines` concurrently, cancelling the rest if one fails, and release parser resources."""
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(coroutine) for coroutine in coroutines]
+            return [task.result() for task in tasks]
+        finally:
+            for fetcher in self.fetchers.values():
+                fetcher.quit()
+            for browsers in self.browsers.values():
+                for browser in browsers:
+                    browser.quit()
+            for parser in self.parsers.values():
+                parser.quit()
+
+    async def run_search(self, search_sources: Iterable[SearchSource], incremental: bool = False) -> int:
+        """Crawl `search_sources` concurrently and return total number of jobs added."""
+        return sum(await self.run(self.search(search_source, incremental) for search_source in search_sources))
+
+    async def run_populate(self, jobs: Iterable[Job]) -> int:
+        """Populate `jobs` concurrently and return number of jobs populated.
+
+        `jobs` is read in batches of `concurrency` on the database thread into a
+        queue holding at most two batches, which `concurrency` consumers take
+        jobs from, so the backlog is never loaded into memory at once.
+        """
+        queue: asyncio.Queue[Job | None] = asyncio.Queue(maxsize=self.concurrency * 2)
+        batches = batched(jobs, self.concurrency, strict=False)
+
+        def next_batch() -> tuple[Job, ...]:
+            return next(batches, ())
+
+        async def produce() -> int:
+            while batch := await sync_to_async(next_batch)():
+                for job in batch:
+                    await queue.put(job)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+            return 0
+
+        async def consume() -> int:
+            count = 0
+            while (job := await queue.get()) is not None:
+                count += await self.populate(job)
+            return count
+
+        return sum(await self.run([produce(), *(consume() for _ in range(self.concurrency))]))
+
+
+def crawl_search(search_sources: Iterable[SearchSource], incremental: bool = False, **kwargs: object) -> int:
+    """Crawl `search_sources` with `Crawler` from synchronous code.
+
+    `search_sources` must be loaded with `select_related('search__location', 'source')`.
+    """
+    crawler = Crawler(**kwargs)  # type: ignore[arg-type]
+    return async_to_sync(crawler.run_search)(list(search_sources), incremental)
+
+
+def crawl_populate(jobs: Iterable[Job], chunk_size: int = 100, **kwargs: object) -> int:
+    """Populate `jobs` with `Crawler` from synchronous code.
+
+    `jobs` must be loaded with `select_related('search_source__source')`. A
+    queryset is streamed in chunks of `chunk_size` rows.
+    """
+    if isinstance(jobs, QuerySet):
+        jobs = jobs.iterator(chunk_size=chunk_size)
+    crawler = Crawler(**kwargs)  # type: ignore[arg-type]
+    return async_to_sync(crawler.run_populate)(jobs)
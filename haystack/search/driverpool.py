@@ -0,0 +1,200 @@
+import atexit
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+from selenium.common.exceptions import WebDriverException
+from seleniumwire import webdriver
+
+logger = logging.getLogger(__name__)
+
+
+def get_rss(pid: int) -> int | None:
+    """Return resident memory in bytes of process `pid` and its descendants.
+
+    Return `None` if `/proc` is unavailable.
+    """
+    total = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            proc = Path('/proc') / str(current)
+            for line in (proc / 'status').read_text().splitlines():
+                if line.startswith('VmRSS:'):
+                    total += int(line.split()[1]) * 1024
+                    break
+            for task in (proc / 'task').iterdir():
+                pending.extend(int(child) for child in (task / 'children').read_text().split())
+    except (OSError, ValueError):
+        return None if current == pid else total
+    return total
+
+
+@dataclass
+class PooledDriver:
+    """Webdriver handed out by `DriverPool` with usage statistics."""
+
+    driver: webdriver.Firefox
+    navigations: int = 0
+    baseline_rss: int | None = field(default=None)
+
+    @property
+    def pid(self) -> int | None:
+        """Return browser process id."""
+        return self.driver.capabilities.get('moz:processID')
+
+    def rss(self) -> int | None:
+        """Return resident memory of browser process tree."""
+        pid = self.pid
+        return get_rss(pid) if pid is not None else None
+
+    def is_healthy(self) -> bool:
+        """Return if webdriver session still responds to commands."""
+        if not getattr(self.driver, 'session_id', None):
+            return False
+        try:
+            _ = self.driver.current_url
+        except WebDriverException:
+            return False
+        return True
+
+    def quit(self) -> None:
+        """End webdriver session."""
+        try:
+            if getattr(self.driver, 'session_id', None):
+                self.driver.quit()
+        except WebDriverException as e:
+            logger.warning('Issue quiting webdriver session: %s', e)
+
+
+class DriverPool:
+    """Pool of pre-launched Firefox webdrivers created by the same factory.
+
+    Up to `size` idle browsers are kept warm. `acquire` returns an idle
+    healthy browser or launches a new one. `release` returns it to the pool
+    unless it is unhealthy, has served `max_navigations` pages, or its
+    memory has grown by more than `max_memory` bytes, in which case it is
+    quit and replaced in the background.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], webdriver.Firefox],
+        size: int,
+        max_navigations: int,
+        max_memory: int,
+    ) -> None:
+        self.factory = factory
+        self.size = size
+        self.max_navigations = max_navigations
+        self.max_memory = max_memory
+        self.idle: list[PooledDriver] = []
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def launch(self) -> PooledDriver:
+        """Launch new browser."""
+        logger.info('Launching Firefox')
+        pooled = PooledDriver(self.factory())
+        pooled.baseline_rss = pooled.rss()
+        return pooled
+
+    def warm(self) -> None:
+        """Launch browsers in the background until `size` are idle."""
+
+        def _warm() -> None:
+            while True:
+                with self.lock:
+                    if self.closed or len(self.idle) >= self.size:
+                        return
+                try:
+                    pooled = self.launch()
+                except WebDriverException:
+                    logger.exception('Unable to launch Firefox')
+                    return
+                with self.lock:
+                    if self.closed or len(self.idle) >= self.size:
+                        pooled.quit()
+                        return
+                    self.idle.append(pooled)
+
+        threading.Thread(target=_warm, name='driverpool-warm', daemon=True).start()
+
+    def acquire(self) -> PooledDriver:
+        """Return healthy browser from pool, launching one if none are idle."""
+        while True:
+            with self.lock:
+                pooled = self.idle.pop() if self.idle else None
+            if pooled is None:
+                return self.launch()
+            if pooled.is_healthy():
+                return pooled
+            pooled.quit()
+
+    def should_recycle(self, pooled: PooledDriver) -> bool:
+        """Return if browser has served too many pages or grown too large."""
+        if pooled.navigations >= self.max_navigations:
+            logger.info('Recycling Firefox after %d navigations', pooled.navigations)
+            return True
+        rss = pooled.rss()
+        if rss is not None and pooled.baseline_rss is not None and rss - pooled.baseline_rss > self.max_memory:
+            logger.info('Recycling Firefox after memory grew to %d MB', rss // 2**20)
+            return True
+        return False
+
+    def release(self, pooled: PooledDriver, discard: bool = False) -> None:
+        """Return browser to pool, or quit it if it should not be reused."""
+        if discard or self.closed or not pooled.is_healthy() or self.should_recycle(pooled):
+            pooled.quit()
+            self.warm()
+            return
+
+        del pooled.driver.requests
+        del pooled.driver.scopes
+        if hasattr(pooled.driver, 'request_interceptor'):
+            del pooled.driver.request_interceptor
+        with self.lock:
+            if len(self.idle) < self.size:
+                self.idle.append(pooled)
+                return
+        pooled.quit()
+
+    def close(self) -> None:
+        """Quit every idle browser and stop warming."""
+        with self.lock:
+            self.closed = True
+            idle, self.idle = self.idle, []
+        for pooled in idle:
+            pooled.quit()
+
+
+_pools: dict[str, DriverPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(key: str, factory: Callable[[], webdriver.Firefox]) -> DriverPool:
+    """Return warm `DriverPool` for `key`, creating it with `factory` if needed."""
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = DriverPool(
+                factory,
+                size=settings.WEBDRIVER_POOL_SIZE,
+                max_navigations=settings.WEBDRIVER_MAX_NAVIGATIONS,
+                max_memory=settings.WEBDRIVER_MAX_MEMORY_MB * 2**20,
+            )
+            _pools[key].warm()
+        return _pools[key]
+
+
+@atexit.register
+def close_driver_pools() -> None:
+    """Quit every pooled browser."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
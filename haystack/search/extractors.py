@@ -0,0 +1,141 @@
+import importlib.util
+import logging
+from collections.abc import Callable
+from functools import cache
+from typing import Any, ClassVar
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+from django.conf import settings
+from django.utils import timezone
+
+from haystack.search.utils import NullableTag, remove_query
+
+logger = logging.getLogger(__name__)
+
+
+@cache
+def has_lxml() -> bool:
+    """Return if lxml is installed."""
+    return importlib.util.find_spec('lxml') is not None
+
+
+@cache
+def warn_missing_lxml() -> None:
+    """Log once that lxml is configured but not installed."""
+    logger.warning('HTML_PARSER is lxml but lxml is not installed, falling back to html.parser')
+
+
+def get_html_parser() -> str:
+    """Return `settings.HTML_PARSER`, falling back to `html.parser` if lxml is not installed."""
+    if settings.HTML_PARSER == 'lxml' and not has_lxml():
+        warn_missing_lxml()
+        return 'html.parser'
+    return settings.HTML_PARSER
+
+
+def make_soup(markup: str, parse_only: SoupStrainer | None = None, features: str | None = None) -> BeautifulSoup:
+    """Parse `markup` with the configured parser."""
+    return BeautifulSoup(markup, features or get_html_parser(), parse_only=parse_only)
+
+
+def is_job_card(value: str | list[str] | None) -> bool:
+    """Return if class attribute contains `job-search-card`.
+
+    Strainers see the unsplit attribute value, so `{'class': 'job-search-card'}`
+    would only match cards with exactly that one class.
+    """
+    if value is None:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return 'job-search-card' in classes
+
+
+class BaseExtractor:
+    """Base class for extracting job dicts from a search page.
+
+    Only the job card subtrees are parsed, using `card_strainer`.
+    """
+
+    card_strainer: ClassVar[SoupStrainer] = SoupStrainer('div', {'class': is_job_card})
+
+    def __init__(self, features: str | None = None) -> None:
+        self.features = features
+
+    def extract_card(self, card: Tag) -> dict | None:
+        """Return job dict for card or `None` if required fields are missing."""
+        raise NotImplementedError
+
+    def extract(self, html: str) -> list[dict]:
+        """Return job dict for every valid card in `html`."""
+        soup = make_soup(html, parse_only=self.card_strainer, features=self.features)
+        jobs: list[dict] = []
+        for card in soup.find_all('div', {'class': 'job-search-card'}):
+            job = self.extract_card(card)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+
+class SoupExtractor(BaseExtractor):
+    """Extract cards with chained `NullableTag.find` lookups of `parse_job`."""
+
+    def __init__(self, parse_job: Callable[[NullableTag], dict | None], features: str | None = None) -> None:
+        super().__init__(features)
+        self.parse_job = parse_job
+
+    def extract_card(self, card: Tag) -> dict | None:
+        """Return job dict from `parse_job`."""
+        return self.parse_job(NullableTag(card))
+
+
+class CardExtractor(BaseExtractor):
+    """Extract every field of a card in a single pass over its tags.
+
+    Produces the same dicts as `LinkedInParser.parse_job`.
+    """
+
+    required: ClassVar[tuple[str, ...]] = ('company', 'company_url', 'title', 'url', 'date_posted')
+
+    def extract_card(self, card: Tag) -> dict | None:
+        """Return job dict or `None` if required fields are missing."""
+        job: dict[str, Any] = {'location': None}
+        listdate_new = None
+        for tag in card.find_all(name=True):
+            classes = tag.get('class') or ()
+            match tag.name:
+                case 'h4' if 'base-search-card__subtitle' in classes and 'company' not in job:
+                    link = tag.find('a')
+                    job['company'] = link.get_text(strip=True) if link is not None else None
+                    job['company_url'] = remove_query(link.get('href')) if link is not None else None  # type: ignore[arg-type]
+                case 'h3' if 'base-search-card__title' in classes and 'title' not in job:
+                    job['title'] = tag.get_text(strip=True)
+                case 'a' if 'base-card__full-link' in classes and 'url' not in job:
+                    job['url'] = remove_query(tag.get('href'))  # type: ignore[arg-type]
+                case 'span' if 'job-search-card__location' in classes and job['location'] is None:
+                    job['location'] = tag.get_text(strip=True)
+                case 'time' if 'job-search-card__listdate' in classes and 'date_posted' not in job:
+                    job['date_posted'] = tag.get('datetime')
+                case 'time' if 'job-search-card__listdate--new' in classes and listdate_new is None:
+                    listdate_new = tag.get('datetime')
+
+        if 'date_posted' not in job and listdate_new is not None:
+            job['date_posted'] = listdate_new
+
+        missing = [key for key in self.required if job.get(key) is None]
+        if missing:
+            logger.error('Error parsing job card, missing %s', ', '.join(missing))
+            return None
+
+        job['date_found'] = str(timezone.now())
+        return job
+
+
+def get_extractor(name: str, parse_job: Callable[[NullableTag], dict | None]) -> BaseExtractor:
+    """Get `BaseExtractor` subclass by name."""
+    if name == 'soup':
+        return SoupExtractor(parse_job)
+    if name == 'card':
+        return CardExtractor()
+    msg = f'Unknown extractor: {name}'
+    raise ValueError(msg)
@@ -0,0 +1,276 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, ClassVar
+from urllib.parse import urljoin
+
+import urllib3
+from bs4 import BeautifulSoup
+from seleniumwire.request import Request, Response
+
+from haystack.core.instrumentation import record_response, record_retry, timed
+from haystack.search.extractors import make_soup
+from haystack.search.retry import Action, RetryPolicy, get_breaker
+
+if TYPE_CHECKING:
+    from haystack.search.responsecache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+ERROR_STATUS_CODES: list[int] = [403, 404, 429, 500, 501, 502, 503, 504]
+
+REDIRECT_STATUS_CODES: list[int] = [301, 302, 303, 307, 308]
+
+
+class FetchError(Exception):
+    """Page could not be fetched, after retries or because the circuit is open."""
+
+
+class BaseFetcher(ABC):
+    """Base class for fetching pages for parsers.
+
+    `request_interceptor` receives every outgoing `Request` and may abort it.
+    `response_processor` receives every `Request` made during a navigation
+    and returns the `Response` that represents the page. Pages are looked up
+    in `cache` first when it is set.
+    """
+
+    exceptions: ClassVar[tuple[type[Exception], ...]] = ()
+
+    retry_policy: ClassVar[RetryPolicy] = RetryPolicy()
+
+    def __init__(
+        self,
+        request_interceptor: Callable | None = None,
+        response_processor: Callable | None = None,
+    ) -> None:
+        self.request_interceptor = request_interceptor
+        self.response_processor = response_processor
+        self.last_response: Response | None = None
+        self.last_status_code: int | None = None
+        self.cache: ResponseCache | None = None
+
+    @property
+    @abstractmethod
+    def page_source(self) -> str:
+        """Return source of current page."""
+
+    @abstractmethod
+    def get(self, url: str) -> Response | None:
+        """Navigate to `url` and return response."""
+
+    def clear(self) -> None:
+        """Forget last response and page, so a skipped or failed request leaves nothing to parse."""
+        self.last_response = self.last_status_code = None
+
+    def reset(self) -> None:  # noqa: B027
+        """Reset fetcher after it becomes unhealthy."""
+
+    def is_healthy(self) -> bool:
+        """Return if fetcher can be reused after a failed attempt."""
+        return True
+
+    def check_response(self, response: Response | None) -> Response | None:
+        """Record response and return `None` for missing or error responses."""
+        self.last_response = response
+        self.last_status_code = response.status_code if response is not None else None
+        record_response(self.last_status_code, response.body if response is not None else None)
+        if response is None or response.status_code in ERROR_STATUS_CODES:
+            return None
+        return response
+
+    def get_with_retry(self, url: str, policy: RetryPolicy | None = None) -> Response | None:
+        """Retrieve url, retrying failures according to `policy`.
+
+        Requests are skipped while the circuit breaker for the host is open.
+        The fetcher is only reset when `is_healthy` reports it is broken.
+        """
+        policy = policy or self.retry_policy
+        breaker = get_breaker(url)
+        delay = policy.base
+        for attempt in range(policy.retries):
+            if not breaker.allow():
+                logger.warning('Circuit open, skipping %s', url)
+                self.clear()
+                return None
+            try:
+                if (response := self.get(url)) is not None:
+                    breaker.record_success()
+                    return response
+            except self.exceptions:
+                logger.warning('Attempt %d failed for %s', attempt + 1, url)
+                self.clear()
+                if not self.is_healthy():
+                    self.reset()
+            except BaseException:
+                breaker.release()
+                raise
+
+            if policy.classify(self.last_status_code) == Action.GIVE_UP:
+                logger.info('Giving up on %s after status %s', url, self.last_status_code)
+                breaker.record_success()
+                return None
+            breaker.record_failure()
+
+            if attempt + 1 < policy.retries:
+                record_retry(self.last_status_code)
+                delay = policy.get_delay(self.last_response, delay)
+                logger.info('Sleeping for %.1f seconds', delay)
+                with timed('backoff'):
+                    time.sleep(delay)
+        logger.warning('Max retries for %s exceeded', url)
+        return None
+
+    @staticmethod
+    def decode(response: Response | None) -> str:
+        """Return response body as text."""
+        if response is None:
+            return ''
+        charset = 'utf-8'
+        content_type = response.headers.get('Content-Type', '')
+        for param in content_type.split(';')[1:]:
+            key, _, value = param.strip().partition('=')
+            if key.lower() == 'charset' and value:
+                charset = value.strip('"')
+        try:
+            return response.body.decode(charset, errors='replace')
+        except LookupError:
+            return response.body.decode('utf-8', errors='replace')
+
+    @timed('soupify')
+    def soupify(self) -> BeautifulSoup:
+        """Parse current page source into BeautifulSoup object."""
+        return make_soup(self.page_source)
+
+    def quit(self) -> None:  # noqa: B027
+        """Release fetcher resources."""
+
+
+class HTTPFetcher(BaseFetcher):
+    """Fetch pages with a pooled keep-alive HTTP client.
+
+    Use for endpoints that return server rendered HTML and do not require a
+    browser. Every request, including each redirect hop, is passed through
+    `request_interceptor` as a selenium-wire `Request`, so parser blocklists
+    behave the same as with `Firefox`.
+    """
+
+    MAX_REDIRECTS = 10
+
+    exceptions: ClassVar[tuple[type[Exception], ...]] = (urllib3.exceptions.HTTPError,)
+
+    headers: ClassVar[dict[str, str]] = {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+    }
+
+    def __init__(
+        self,
+        proxy: str | None = None,
+        request_interceptor: Callable | None = None,
+        response_processor: Callable | None = None,
+        timeout: float = 30.0,
+        maxsize: int = 4,
+    ) -> None:
+        super().__init__(request_interceptor, response_processor)
+        self.proxy = proxy
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.pool = self.create_pool()
+        self._page_source = ''
+
+    def create_pool(self) -> urllib3.PoolManager:
+        """Create connection pool, routed through `self.proxy` if set."""
+        kwargs: dict[str, Any] = {
+            'maxsize': self.maxsize,
+            'headers': self.headers,
+            'timeout': urllib3.Timeout(total=self.timeout),
+            'retries': False,
+        }
+        if self.proxy is None:
+            return urllib3.PoolManager(**kwargs)
+
+        proxy = urllib3.util.parse_url(self.proxy)
+        proxy_headers = urllib3.make_headers(proxy_basic_auth=proxy.auth) if proxy.auth else None
+        return urllib3.ProxyManager(proxy._replace(auth=None).url, proxy_headers=proxy_headers, **kwargs)
+
+    def fetch(self, url: str, headers: dict[str, str] | None = None) -> list[Request]:
+        """Request `url`, following redirects, and return every request made.
+
+        Extra `headers` are only sent with the first request.
+        """
+        requests: list[Request] = []
+        for _ in range(self.MAX_REDIRECTS + 1):
+            request_headers = self.headers | (headers or {})
+            headers = None
+            request = Request(method='GET', url=url, headers=request_headers.items())
+            requests.append(request)
+            if self.request_interceptor is not None:
+                self.request_interceptor(request)
+            if request.response is not None:
+                # request was aborted by interceptor
+                break
+
+            r = self.pool.request('GET', url, headers=request_headers, redirect=False)
+            request.response = Response(
+                status_code=r.status, reason=r.reason or '', headers=r.headers.items(), body=r.data
+            )
+            location = r.get_redirect_location()
+            if not location:
+                break
+            url = urljoin(url, location)
+        return requests
+
+    def request(self, url: str) -> Response | None:
+        """Request `url` and return response chosen by `response_processor`.
+
+        Fresh cached responses are returned without a request, stale ones are
+        revalidated with a conditional request. Does not modify fetcher state,
+        so it is safe to call from several threads.
+        """
+        cache = self.cache
+        entry = cache.get(url) if cache is not None else None
+        if cache is not None and entry is not None and cache.is_fresh(entry):
+            return entry.response
+
+        requests = self.fetch(url, entry.validators if entry is not None else None)
+        response = requests[-1].response if self.response_processor is None else self.response_processor(requests)
+        if cache is None or response is None:
+            return response
+        if entry is not None and response.status_code == 304:
+            cache.refresh(entry)
+            return entry.response
+        cache.set(url, response)
+        return response
+
+    @timed('fetch')
+    def get(self, url: str) -> Response | None:
+        """Request `url` and return response."""
+        logger.info('GET %s', url)
+        response = self.request(url)
+        self._page_source = self.decode(response)
+        return self.check_response(response)
+
+    @property
+    def page_source(self) -> str:
+        """Return body of last response."""
+        return self._page_source
+
+    def clear(self) -> None:
+        """Forget last response and its body."""
+        super().clear()
+        self._page_source = ''
+
+    def reset(self) -> None:
+        """Drop pooled connections so the next attempt opens a new proxy session."""
+        self.pool.clear()
+
+    def is_healthy(self) -> bool:
+        """Return `False` so pooled connections are dropped after a connection error."""
+        return False
+
+    def quit(self) -> None:
+        """Close pooled connections."""
+        self.pool.clear()
@@ -0,0 +1,52 @@
+import time
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from haystack.search.extractors import CardExtractor, SoupExtractor, has_lxml
+from haystack.search.parsers.linkedin import LinkedInParser
+
+
+class Command(BaseCommand):
+    help = 'Time job card extraction backends on saved search pages.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add paths and repeat arguments."""
+        parser.add_argument('paths', nargs='*', type=Path, help='html files, defaults to the download folder')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def get_paths(self, paths: list[Path]) -> list[Path]:
+        """Return html files to benchmark."""
+        if not paths:
+            paths = sorted((settings.BASE_DIR.parent / 'download').glob('*.html'))
+        if not paths:
+            msg = 'No html files found'
+            raise CommandError(msg)
+        return paths
+
+    def handle(self, **options: Any) -> None:
+        """Extract jobs from every file with every backend and print timings."""
+        pages = [path.read_text() for path in self.get_paths(options['paths'])]
+        features = ['html.parser', 'lxml'] if has_lxml() else ['html.parser']
+        parse_job = LinkedInParser().parse_job
+        repeat = max(1, options['repeat'])
+
+        results: dict[str, list[list[dict]]] = {}
+        for feature in features:
+            for extractor in [SoupExtractor(parse_job, features=feature), CardExtractor(features=feature)]:
+                name = f'{type(extractor).__name__}[{feature}]'
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    jobs = [extractor.extract(html) for html in pages]
+                elapsed = time.perf_counter() - start
+                results[name] = [[{k: v for k, v in job.items() if k != 'date_found'} for job in p] for p in jobs]
+                per_page = elapsed / (repeat * len(pages)) * 1000
+                self.stdout.write(f'{name:32} {per_page:8.2f} ms/page')
+
+        baseline, *others = results.items()
+        for name, jobs in others:
+            if jobs != baseline[1]:
+                self.stderr.write(f'{name} output differs from {baseline[0]}')
+        self.stdout.write(f'{sum(len(p) for p in baseline[1])} jobs from {len(pages)} pages')
@@ -25,5 +25,5 @@ class Command(BaseCommand):
         """Get url with given parser and save to file."""
         parser = get_parser(options['parser'])
         if parser.firefox.get_with_retry(options['url']) is not None:
-            self.save_html(parser.firefox.driver.page_source)
+            self.save_html(parser.firefox.page_source)
         parser.quit()
@@ -0,0 +1,123 @@
+import resource
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import CommandError, CommandParser
+from django.test.utils import override_settings
+
+from haystack.core.instrumentation import RETRIES, InstrumentedCommand
+from haystack.jobs.models import Company, Job
+from haystack.search.crawler import crawl_populate, crawl_search
+from haystack.search.mockserver import MockConfig, MockLinkedInServer
+from haystack.search.models import Search, SearchSource, Source
+from haystack.search.pool import SearchPool
+
+
+class Command(InstrumentedCommand):
+    help = 'Run searches and populate against a local mock LinkedIn server and report throughput.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add load and mock server arguments."""
+        parser.add_argument('--searches', type=int, default=4, help='Number of searches to create and execute.')
+        parser.add_argument('--workers', type=int, default=settings.SEARCH_WORKERS)
+        parser.add_argument('--async', action='store_true', dest='use_async', help='Search with the asyncio crawler.')
+        parser.add_argument('--concurrency', type=int, default=settings.CRAWL_CONCURRENCY)
+        parser.add_argument(
+            '--rate', type=float, default=settings.CRAWL_RATE, help='Requests per second of the asyncio crawler.'
+        )
+        parser.add_argument(
+            '--populate', type=int, default=100, help='Number of found jobs to populate with the asyncio crawler.'
+        )
+        parser.add_argument(
+            '--response-cache', default='', help='Cache job pages in this directory, disabled by default.'
+        )
+        parser.add_argument('--keep', action='store_true', help='Keep created searches and jobs.')
+        MockConfig.add_arguments(parser)
+
+    def handle(self, **options: Any) -> None:
+        """Start mock server, point LinkedIn urls and proxy at it and run the pipeline."""
+        if options['searches'] < 1 or options['workers'] < 1:
+            msg = '--searches and --workers must be at least 1.'
+            raise CommandError(msg)
+        config = MockConfig.from_options(options)
+        server = MockLinkedInServer(('127.0.0.1', 0), config)
+        server.start()
+        self.stdout.write(f'Mock LinkedIn server on {server.url}')
+        try:
+            with override_settings(
+                LINKEDIN_BASE_URL=config.base_url,
+                SEARCH_PROXY=server.url,
+                RESPONSE_CACHE_DIR=options['response_cache'],
+            ):
+                search_sources = self.create_search_sources(options['searches'])
+                Job.objects.warm_lookups()
+                try:
+                    self.run_pipeline(server, search_sources, options)
+                finally:
+                    if not options['keep']:
+                        self.delete(search_sources, config)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def create_search_sources(self, count: int) -> list[SearchSource]:
+        """Create `count` remote LinkedIn searches with distinct result sets."""
+        source, _ = Source.objects.get_or_create(parser='linkedin', defaults={'name': 'LinkedIn'})
+        searches = Search.objects.bulk_create(
+            Search(keywords=f'loadtest {i}', is_onsite=False, is_remote=True) for i in range(count)
+        )
+        return SearchSource.objects.bulk_create(SearchSource(search=search, source=source) for search in searches)
+
+    def run_pipeline(self, server: MockLinkedInServer, search_sources: list[SearchSource], options: dict) -> None:
+        """Execute searches, then populate found jobs, reporting each phase."""
+        queryset = SearchSource.objects.filter(id__in=[s.id for s in search_sources]).select_related(
+            'search__location', 'source'
+        )
+        crawler_options = {'concurrency': options['concurrency'], 'rate': options['rate'], 'burst': options['rate']}
+        if options['use_async']:
+            count = self.run_phase(
+                server,
+                'page',
+                lambda: crawl_search(queryset, write=self.stdout.write, **crawler_options),
+            )
+        else:
+            pool = SearchPool(options['workers'], self.stdout.write)
+            count = self.run_phase(server, 'page', lambda: pool.run(queryset))
+        self.stdout.write(f'Added {count} jobs')
+
+        if options['populate'] > 0:
+            jobs = (
+                Job.objects.filter(
+                    search_source__in=queryset, status=Job.NEW, populated=False, duplicate_of__isnull=True
+                )
+                .select_related('search_source__source')
+                .defer('raw_html', 'description', 'search_vector')
+            )[: options['populate']]
+            count = self.run_phase(server, 'job', lambda: crawl_populate(jobs, **crawler_options))
+            self.stdout.write(f'Populated {count} jobs')
+
+    def run_phase(self, server: MockLinkedInServer, endpoint: str, func: Callable[[], int]) -> int:
+        """Run `func` and report responses per second served for `endpoint`, retries and peak memory."""
+        before = sum(server.get_counts(endpoint).values())
+        retries = sum(count for _, count in RETRIES.snapshot())
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        counts = server.get_counts(endpoint)
+        served = sum(counts.values()) - before
+        retried = sum(count for _, count in RETRIES.snapshot()) - retries
+        # kilobytes on Linux
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(
+            f'{endpoint}: {served} responses in {elapsed:.1f}s, {served / elapsed:.1f}/s, '
+            f'{int(retried)} retries, peak RSS {peak_mb:.0f} MB, by status {counts}'
+        )
+        return result
+
+    def delete(self, search_sources: list[SearchSource], config: MockConfig) -> None:
+        """Delete searches, jobs and companies created by the load test."""
+        Job.objects.filter(search_source__in=search_sources).delete()
+        Search.objects.filter(id__in=[s.search_id for s in search_sources]).delete()
+        Company.objects.filter(url__startswith=f'{config.base_url}/').delete()
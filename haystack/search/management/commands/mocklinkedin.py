@@ -0,0 +1,31 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from haystack.search.mockserver import MockConfig, MockLinkedInServer
+
+
+class Command(BaseCommand):
+    help = 'Serve a local stand-in for the LinkedIn guest search and job pages.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add address and mock server arguments."""
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        MockConfig.add_arguments(parser)
+
+    def handle(self, **options: Any) -> None:
+        """Serve until interrupted."""
+        config = MockConfig.from_options(options)
+        server = MockLinkedInServer((options['host'], options['port']), config)
+        self.stdout.write(
+            f'Serving on {server.url}, set SEARCH_PROXY={server.url} LINKEDIN_BASE_URL={config.base_url}'
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        for endpoint in ('search', 'page', 'job'):
+            self.stdout.write(f'{endpoint}: {server.get_counts(endpoint)}')
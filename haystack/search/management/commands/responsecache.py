@@ -0,0 +1,39 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from haystack.search.fetchers import BaseFetcher
+from haystack.search.parsers import get_parser
+
+
+class Command(BaseCommand):
+    help = 'Show size of the response cache, print a cached page, evict or clear entries.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add parser, show, evict and clear arguments."""
+        parser.add_argument('--parser', default='linkedin')
+        parser.add_argument('--show', metavar='URL', help='Print cached page of URL.')
+        parser.add_argument('--evict', action='store_true', help='Evict least recently used pages now.')
+        parser.add_argument('--clear', action='store_true', help='Remove every cached page.')
+
+    def handle(self, **options: Any) -> None:
+        """Run cache action and print cache size."""
+        cache = get_parser(options['parser']).get_cache()
+        if cache is None:
+            msg = f'Response cache is disabled for {options["parser"]}.'
+            raise CommandError(msg)
+
+        if options['show'] is not None:
+            if (entry := cache.get(options['show'])) is None:
+                msg = f'{options["show"]} is not cached.'
+                raise CommandError(msg)
+            self.stdout.write(BaseFetcher.decode(entry.response))
+            return
+
+        if options['clear']:
+            self.stdout.write(f'Removed {cache.clear()} pages')
+        elif options['evict']:
+            self.stdout.write(f'Evicted {cache.evict()} pages')
+        entries = cache.get_entries()
+        size = sum(stat.st_size for _, stat in entries) / 2**20
+        self.stdout.write(f'{len(entries)} cached pages, {size:.1f} of {cache.max_size / 2**20:.0f} MB')
@@ -0,0 +1,52 @@
+import signal
+from types import FrameType
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import CommandError, CommandParser
+
+from haystack.core.instrumentation import InstrumentedCommand, save_snapshot
+from haystack.jobs.models import Job
+from haystack.search.scheduler import Scheduler
+
+
+class Command(InstrumentedCommand):
+    help = 'Execute active searches as they come due, safe to run in several processes.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add workers, incremental, refresh and once arguments."""
+        parser.add_argument('--workers', type=int, default=settings.SEARCH_WORKERS)
+        parser.add_argument(
+            '--incremental', action='store_true', help='Stop paginating once a page is mostly already stored.'
+        )
+        parser.add_argument(
+            '--refresh',
+            type=float,
+            default=settings.SCHEDULER_REFRESH,
+            help='Seconds between reloads of the schedule from the database.',
+        )
+        parser.add_argument('--once', action='store_true', help='Execute due searches once and exit.')
+
+    def handle(self, **options: Any) -> None:
+        """Run scheduler until interrupted."""
+        if options['workers'] < 1:
+            msg = '--workers must be at least 1.'
+            raise CommandError(msg)
+        Job.objects.warm_lookups()
+        scheduler = Scheduler(
+            options['workers'],
+            self.stdout.write,
+            incremental=options['incremental'],
+            refresh=options['refresh'],
+            # keep `/metrics/` current while the scheduler runs
+            on_tick=lambda: save_snapshot(self.command_name),
+        )
+
+        def stop(signum: int, _frame: FrameType | None) -> None:
+            self.stdout.write(f'Received {signal.Signals(signum).name}, stopping after current searches')
+            scheduler.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        total_count = scheduler.run(once=options['once'])
+        self.stdout.write(f'Added {total_count} total jobs')
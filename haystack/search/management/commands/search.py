@@ -1,19 +1,36 @@
-from typing import TYPE_CHECKING, Any
+from typing import Any
 
-from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.conf import settings
+from django.core.management.base import CommandError, CommandParser
+from django.db.models import QuerySet
 
+from haystack.core.instrumentation import InstrumentedCommand
 from haystack.jobs.models import Job
-from haystack.search.models import SearchSource, Source, Status
-from haystack.search.parsers import get_parser
+from haystack.search.crawler import crawl_search
+from haystack.search.models import SearchSource, Source
+from haystack.search.pool import SearchPool
+from haystack.tasks.models import Kind, Task
+from haystack.tasks.worker import Worker
 
-if TYPE_CHECKING:
-    from haystack.search.parsers.base import BaseParser
 
-
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     def add_arguments(self, parser: CommandParser) -> None:
-        """Add optional source argument."""
+        """Add optional source, workers, async, incremental and queue arguments."""
         parser.add_argument('--source')
+        parser.add_argument('--workers', type=int, default=settings.SEARCH_WORKERS)
+        parser.add_argument('--async', action='store_true', dest='use_async', help='Use the asyncio crawler.')
+        parser.add_argument('--concurrency', type=int, default=settings.CRAWL_CONCURRENCY)
+        parser.add_argument(
+            '--incremental', action='store_true', help='Stop paginating once a page is mostly already stored.'
+        )
+        parser.add_argument(
+            '--queue',
+            nargs='?',
+            const='both',
+            choices=['enqueue', 'work', 'both'],
+            help='Queue search pages as tasks, execute queued tasks, or both.',
+        )
+        parser.add_argument('--forever', action='store_true', help='With --queue, wait for new tasks when idle.')
 
     def handle(self, **options: Any) -> None:
         """Execute job search."""
@@ -24,28 +41,34 @@ class Command(BaseCommand):
             except Source.DoesNotExist as e:
                 msg = f'Source {source_name} does not exist.'
                 raise CommandError(msg) from e
-            search_sources = SearchSource.objects.filter(source=source)
+            search_sources = SearchSource.objects.active().filter(source=source)
         else:
-            search_sources = SearchSource.objects.all()
-
-        total_count = 0
-        parser_map: dict[str, BaseParser] = {}
-        for search_source in search_sources:
-            parser_name = search_source.source.parser
-            if parser_name not in parser_map:
-                parser_map[parser_name] = get_parser(parser_name)
-
-            self.stdout.write(f'Executing {search_source}')
-            search_source.set_status(Status.RUNNING)
-            parser = parser_map[parser_name]
-            page_count = parser.get_page_count(search_source)  # type: ignore[attr-defined]
-            self.stdout.write(f'Found {page_count} pages')
-            for page in range(1, page_count + 1):
-                self.stdout.write(f'Parsing page {page}')
-                jobs = parser.parse(search_source, page)  # type: ignore[attr-defined]
-                count = Job.objects.add_jobs(jobs, search_source)
-                self.stdout.write(f'Added {count} jobs')
-                total_count += count
-            search_source.set_status(Status.SUCCESS)
+            search_sources = SearchSource.objects.active()
 
+        search_sources = search_sources.select_related('search__location', 'source')
+        Job.objects.warm_lookups()
+        if options['queue'] is not None:
+            total_count = self.run_queue(search_sources, options)
+        elif options['use_async']:
+            total_count = crawl_search(
+                search_sources,
+                incremental=options['incremental'],
+                concurrency=options['concurrency'],
+                write=self.stdout.write,
+            )
+        else:
+            if options['workers'] < 1:
+                msg = '--workers must be at least 1.'
+                raise CommandError(msg)
+            pool = SearchPool(options['workers'], self.stdout.write, incremental=options['incremental'])
+            total_count = pool.run(search_sources)
         self.stdout.write(f'Added {total_count} total jobs')
+
+    def run_queue(self, search_sources: QuerySet[SearchSource], options: dict[str, Any]) -> int:
+        """Queue first page of every search source and execute queued search tasks. Return number of jobs added."""
+        if options['queue'] in ('enqueue', 'both'):
+            count = Task.objects.enqueue_searches(search_sources, incremental=options['incremental'])
+            self.stdout.write(f'Queued {count} searches')
+        if options['queue'] in ('work', 'both'):
+            return Worker([Kind.SEARCH_PAGE], self.stdout.write).run(forever=options['forever'])
+        return 0
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_alter_searchsource_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchsource',
+            name='newest_date_posted',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0004_searchsource_newest_date_posted'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchsource',
+            index=models.Index(fields=['source', 'is_active'], name='searchsource_source_active_idx'),
+        ),
+    ]
@@ -0,0 +1,212 @@
+import logging
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from django.core.management.base import CommandParser
+
+from haystack.search.synthetic import generate_job_page, generate_results_page, generate_search_page
+
+logger = logging.getLogger(__name__)
+
+# Local stand-in for the LinkedIn guest endpoints, used by the `loadtest` and
+# `mocklinkedin` commands. Requests are accepted both directly and as an HTTP
+# proxy, so pointing `SEARCH_PROXY` at the server and `LINKEDIN_BASE_URL` at
+# `http://www.linkedin.com` exercises the same proxy and host checks as a
+# real search without leaving the machine.
+
+SEARCH_PATH = '/jobs/search'
+SEE_MORE_PATH = '/jobs-guest/jobs/api/seeMoreJobPostings/search'
+JOB_PATH = '/jobs/view/'
+AUTHWALL_PATH = '/authwall'
+
+ERROR_STATUS_CODES = (500, 502, 503)
+
+
+@dataclass
+class MockConfig:
+    """Results and faults served by `MockLinkedInServer`. Fault rates are fractions of requests."""
+
+    base_url: str = 'http://www.linkedin.com'
+    results: int = 1000
+    latency: float = 0.0
+    jitter: float = 0.0
+    rate_limit: float = 0.0
+    error_rate: float = 0.0
+    authwall: float = 0.0
+    expired: float = 0.0
+    retry_after: int = 1
+    seed: int = 0
+
+    @classmethod
+    def add_arguments(cls, parser: CommandParser) -> None:
+        """Add command arguments for every field."""
+        parser.add_argument('--base-url', default=cls.base_url, help='Origin of rendered links.')
+        parser.add_argument('--results', type=int, default=cls.results, help='Results of every search.')
+        parser.add_argument('--latency', type=float, default=cls.latency, help='Seconds before every response.')
+        parser.add_argument('--jitter', type=float, default=cls.jitter, help='Up to this many extra seconds.')
+        parser.add_argument('--rate-limit', type=float, default=cls.rate_limit, help='Fraction of 429 responses.')
+        parser.add_argument('--error-rate', type=float, default=cls.error_rate, help='Fraction of 5xx responses.')
+        parser.add_argument('--authwall', type=float, default=cls.authwall, help='Fraction of authwall redirects.')
+        parser.add_argument('--expired', type=float, default=cls.expired, help='Fraction of job pages that 404.')
+        parser.add_argument('--retry-after', type=int, default=cls.retry_after, help='Retry-After of 429s.')
+        parser.add_argument('--seed', type=int, default=cls.seed, help='Seed of injected faults.')
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any]) -> 'MockConfig':
+        """Return config from parsed command `options`."""
+        return cls(**{field.name: options[field.name] for field in fields(cls)})
+
+
+class MockLinkedInHandler(BaseHTTPRequestHandler):
+    """Serve search pages, `seeMoreJobPostings` fragments and job pages from `haystack.search.synthetic`.
+
+    Job pages never change, so they carry an `ETag` and are revalidated with a 304.
+    """
+
+    server: 'MockLinkedInServer'
+
+    # keep-alive, so pooled connections are reused like they are against LinkedIn
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        """Respond to request after the configured latency, injecting faults."""
+        config = self.server.config
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if delay := self.server.get_latency():
+            time.sleep(delay)
+
+        if url.path == AUTHWALL_PATH:
+            self.send(200, '<html><body>Sign in to view more jobs</body></html>')
+        elif (status := self.server.get_fault()) is not None:
+            self.send_fault(status)
+        elif url.path == SEARCH_PATH:
+            self.send(200, generate_results_page(config.results, self.get_seed(params), config.base_url))
+        elif url.path == SEE_MORE_PATH:
+            start = int(params.get('start', 0))
+            count = max(0, min(10, config.results - start))
+            self.send(200, generate_search_page(count, self.get_seed(params), start, config.base_url))
+        elif url.path.startswith(JOB_PATH) and (job_id := self.get_job_id(url.path)) is not None:
+            etag = f'"{job_id}"'
+            if self.server.is_expired(job_id):
+                self.send(404, '<html><body>This job is no longer available</body></html>')
+            elif self.headers.get('If-None-Match') == etag:
+                self.send(304, '', ETag=etag)
+            else:
+                self.send(200, generate_job_page(job_id, base_url=config.base_url), ETag=etag)
+        else:
+            self.send(404, '<html><body>Not found</body></html>')
+
+    @staticmethod
+    def get_seed(params: dict[str, str]) -> int:
+        """Return result set of search, the same for the same keywords, location and workplace types."""
+        key = '|'.join(params.get(name, '') for name in ('keywords', 'geo_id', 'f_WT', 'f_AL'))
+        return zlib.crc32(key.encode()) % 1000
+
+    @staticmethod
+    def get_job_id(path: str) -> int | None:
+        """Return job id at the end of job page `path`."""
+        _, _, job_id = path.rstrip('/').rpartition('-')
+        return int(job_id) if job_id.isdigit() else None
+
+    def send_fault(self, status: int) -> None:
+        """Send injected rate limit, server error or authwall redirect."""
+        if status == 302:
+            self.send(302, '', Location=f'{self.server.config.base_url}{AUTHWALL_PATH}?trk=public_jobs')
+        elif status == 429:
+            self.send(429, 'Too Many Requests', **{'Retry-After': str(self.server.config.retry_after)})
+        else:
+            self.send(status, 'Server Error')
+
+    def send(self, status: int, body: str, **headers: str) -> None:
+        """Send response with `body` and extra `headers`, and count it."""
+        data = body.encode()
+        self.server.record(urlsplit(self.path).path, status)
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Log requests at debug level instead of writing them to stderr."""
+        logger.debug(format, *args)
+
+
+class MockLinkedInServer(ThreadingHTTPServer):
+    """Threaded mock LinkedIn server with configurable latency and faults.
+
+    Counts of served responses by endpoint and status are kept in `counts`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: MockConfig | None = None) -> None:
+        super().__init__(address, MockLinkedInHandler)
+        self.config = config or MockConfig()
+        self.rng = random.Random(self.config.seed)  # noqa: S311
+        self.lock = threading.Lock()
+        self.counts: Counter[tuple[str, int]] = Counter()
+
+    @property
+    def url(self) -> str:
+        """Return url of server, usable as `SEARCH_PROXY`."""
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f'http://{host}:{port}'
+
+    def get_latency(self) -> float:
+        """Return seconds to wait before responding."""
+        with self.lock:
+            return self.config.latency + self.rng.uniform(0, self.config.jitter)
+
+    def get_fault(self) -> int | None:
+        """Return status of injected fault for the next response, or `None`."""
+        config = self.config
+        with self.lock:
+            value = self.rng.random()
+            if value < config.rate_limit:
+                return 429
+            if value < config.rate_limit + config.error_rate:
+                return self.rng.choice(ERROR_STATUS_CODES)
+            if value < config.rate_limit + config.error_rate + config.authwall:
+                return 302
+        return None
+
+    def is_expired(self, job_id: int) -> bool:
+        """Return if job page of `job_id` always responds 404."""
+        return random.Random(f'expired-{job_id}').random() < self.config.expired  # noqa: S311
+
+    def record(self, path: str, status: int) -> None:
+        """Count response by endpoint and status."""
+        if path.startswith(JOB_PATH):
+            endpoint = 'job'
+        elif path == SEE_MORE_PATH:
+            endpoint = 'page'
+        elif path == SEARCH_PATH:
+            endpoint = 'search'
+        else:
+            endpoint = 'other'
+        with self.lock:
+            self.counts[endpoint, status] += 1
+
+    def get_counts(self, endpoint: str) -> dict[int, int]:
+        """Return number of responses served for `endpoint` by status."""
+        with self.lock:
+            return {status: count for (name, status), count in sorted(self.counts.items()) if name == endpoint}
+
+    def start(self) -> threading.Thread:
+        """Serve requests on a daemon thread and return it."""
+        thread = threading.Thread(target=self.serve_forever, name='mocklinkedin', daemon=True)
+        thread.start()
+        return thread
@@ -1,7 +1,10 @@
+from datetime import datetime, timedelta
 from enum import IntEnum
 from typing import Any, ClassVar
 
+from django.conf import settings
 from django.db import models, transaction
+from django.db.models import F, Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -131,6 +134,48 @@ class Search(UUIDModel):
         return f'{self.keywords} | Easy Apply: {easy_apply} | {flexibility}'
 
 
+class SearchSourceQuerySet(models.QuerySet):
+    """Custom queryset for SearchSource."""
+
+    def active(self) -> 'SearchSourceQuerySet':
+        """Return objects whose `Search` and `SearchSource` are both active."""
+        return self.filter(is_active=True, search__is_active=True)
+
+    def due(self, now: datetime | None = None) -> 'SearchSourceQuerySet':
+        """Return active objects not executed within `SCHEDULER_INTERVAL` and not claimed by a live scheduler.
+
+        A `SCHEDULED` or `RUNNING` object untouched for `SCHEDULER_STALE_AFTER`
+        seconds is assumed to belong to a dead process and is due again.
+        """
+        now = now or timezone.now()
+        interval = timedelta(seconds=settings.SCHEDULER_INTERVAL)
+        stale = timedelta(seconds=settings.SCHEDULER_STALE_AFTER)
+        return self.active().filter(
+            ~Q(status__in=[Status.SCHEDULED, Status.RUNNING]) | Q(updated_at__lt=now - stale),
+            Q(last_executed_at__isnull=True) | Q(last_executed_at__lte=now - interval),
+        )
+
+
+class SearchSourceManager(models.Manager.from_queryset(SearchSourceQuerySet)):  # type: ignore[misc]
+    """Custom model manager for SearchSource."""
+
+    def claim(self, limit: int, ids: list[int] | None = None) -> list['SearchSource']:
+        """Mark up to `limit` due objects, least recently executed first, as `SCHEDULED` and return them.
+
+        Rows are locked with `SKIP LOCKED`, so concurrent schedulers never claim
+        the same object and do not wait on each other. Only `ids` are considered
+        when given.
+        """
+        ordering = (F('last_executed_at').asc(nulls_first=True), 'id')
+        with transaction.atomic():
+            queryset = self.due().select_for_update(skip_locked=True, of=('self',)).order_by(*ordering)
+            if ids is not None:
+                queryset = queryset.filter(id__in=ids)
+            claimed = list(queryset.values_list('id', flat=True)[:limit])
+            self.filter(id__in=claimed).update(status=Status.SCHEDULED, updated_at=timezone.now())
+        return list(self.filter(id__in=claimed).select_related('search__location', 'source').order_by(*ordering))
+
+
 class SearchSource(UUIDModel):
     """ManyToMany through model between `Search` and `Source`."""
 
@@ -141,8 +186,16 @@ class SearchSource(UUIDModel):
     status = models.CharField(max_length=9, choices=Status.choices, default=Status.IDLE)
     is_active = models.BooleanField(default=True)
 
+    # high-water mark of `date_posted` across every job found by this search
+    newest_date_posted = models.DateTimeField(null=True, blank=True)
+
+    objects = SearchSourceManager()
+
     class Meta:
         unique_together: ClassVar[list[tuple[str, ...]]] = [('search', 'source')]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=['source', 'is_active'], name='searchsource_source_active_idx'),
+        ]
 
     def calculate_period(self, tolerance: float = 0.04) -> int:
         """Calculate search period in seconds based on `last_executed_at`.
@@ -162,6 +215,47 @@ class SearchSource(UUIDModel):
 
         return Period.MONTH
 
+    @property
+    def next_run_at(self) -> datetime | None:
+        """Return when the scheduler runs this object next, or `None` if it never ran."""
+        if self.last_executed_at is None:
+            return None
+        return self.last_executed_at + timedelta(seconds=settings.SCHEDULER_INTERVAL)
+
+    def count_known(self, jobs: list[dict], since: datetime | None = None) -> int:
+        """Return number of `jobs` already stored or posted before `since`."""
+        stored = set(Job.objects.filter(url__in=[job['url'] for job in jobs]).values_list('url', flat=True))
+        count = 0
+        for job in jobs:
+            if job['url'] in stored:
+                count += 1
+            elif since is not None:
+                date_posted = Job.objects.parse_datetime(job['date_posted'])
+                count += date_posted is not None and date_posted < since
+        return count
+
+    def is_known_page(self, jobs: list[dict], since: datetime | None = None, ratio: float | None = None) -> bool:
+        """Return if at least `ratio` of `jobs` are known, meaning later pages need not be fetched.
+
+        An empty page is known since it is past the last result.
+        """
+        if ratio is None:
+            ratio = settings.SEARCH_KNOWN_RATIO
+        if not jobs:
+            return True
+        return self.count_known(jobs, since) >= ratio * len(jobs)
+
+    def update_newest_date_posted(self, jobs: list[dict]) -> None:
+        """Raise `newest_date_posted` to the newest `date_posted` of `jobs` and save."""
+        newest = max(
+            (dt for job in jobs if (dt := Job.objects.parse_datetime(job['date_posted'])) is not None),
+            default=None,
+        )
+        if newest is None or (self.newest_date_posted is not None and newest <= self.newest_date_posted):
+            return
+        self.newest_date_posted = newest
+        self.save(update_fields=['newest_date_posted', 'updated_at'])
+
     def set_status(self, status: Status) -> None:
         """Set status and save."""
         self.status = status
@@ -1,9 +1,13 @@
 import logging
+import re
+from pathlib import Path
 from typing import ClassVar, cast
 
 from django.conf import settings
 from seleniumwire.request import Request, Response
 
+from haystack.search.fetchers import BaseFetcher, HTTPFetcher
+from haystack.search.responsecache import ResponseCache
 from haystack.search.webdriver import Firefox
 
 logger = logging.getLogger(__name__)
@@ -19,18 +23,92 @@ firefox_blocklist: list[str] = [
 
 
 class BaseParser:
-    """Base class for managing Firefox based web parsing."""
+    """Base class for managing web parsing.
+
+    Fetchers are created lazily on first use. `fetcher` returns the fetcher
+    named by `fetcher_name`, which subclasses may set to `http` when pages do
+    not require JS rendering.
+    """
 
     blocklist: ClassVar[list[str]] = []
 
+    # url patterns selenium-wire captures. Requests outside every scope are
+    # neither stored nor intercepted. Empty captures every request.
+    scopes: ClassVar[list[str]] = []
+
+    # url patterns of pages that rarely change and are kept in `ResponseCache`
+    cache_scopes: ClassVar[list[str]] = []
+
     name: ClassVar[str] = ''
 
+    fetcher_name: ClassVar[str] = 'firefox'
+
+    fetcher_classes: ClassVar[dict[str, type[BaseFetcher]]] = {
+        'firefox': Firefox,
+        'http': HTTPFetcher,
+    }
+
     def __init__(self, log_intercepts: bool = False) -> None:
         if not self.name:
             msg = f'`{self.__class__.__name__}.name` must be defined.'
             raise ValueError(msg)
         self.log_intercepts = log_intercepts
-        self.firefox = Firefox(settings.SEARCH_PROXY, self.intercept_request, self.process_response)
+        self.fetchers: dict[str, BaseFetcher] = {}
+
+    def get_fetcher(self, name: str) -> BaseFetcher:
+        """Return fetcher by name, creating it if needed."""
+        if name not in self.fetchers:
+            self.fetchers[name] = self.create_fetcher(name)
+        return self.fetchers[name]
+
+    def create_fetcher(self, name: str) -> BaseFetcher:
+        """Return new fetcher by name using the hooks and cache of this parser."""
+        fetcher_cls = self.fetcher_classes.get(name)
+        if fetcher_cls is None:
+            msg = f'Unknown fetcher: {name}'
+            raise ValueError(msg)
+        kwargs = {'scopes': self.get_scopes()} if issubclass(fetcher_cls, Firefox) else {}
+        fetcher = fetcher_cls(
+            settings.SEARCH_PROXY,  # type: ignore[call-arg]
+            self.intercept_request,
+            self.process_response,
+            **kwargs,
+        )
+        fetcher.cache = self.get_cache()
+        return fetcher
+
+    def get_cache(self) -> ResponseCache | None:
+        """Return response cache for pages in `cache_scopes`, `None` if there are none or caching is disabled."""
+        if not self.cache_scopes or not settings.RESPONSE_CACHE_DIR:
+            return None
+        return ResponseCache(
+            Path(settings.RESPONSE_CACHE_DIR),
+            settings.RESPONSE_CACHE_TTL,
+            settings.RESPONSE_CACHE_MAX_MB * 2**20,
+            self.cache_scopes,
+        )
+
+    def get_scopes(self) -> list[str]:
+        """Return capture scopes, including blocklisted hosts so they are still aborted."""
+        scopes = self.get_page_scopes()
+        if not scopes:
+            return []
+        hosts = firefox_blocklist + self.blocklist
+        return [rf'^https?://{re.escape(host)}[:/]' for host in hosts] + scopes
+
+    def get_page_scopes(self) -> list[str]:
+        """Return url patterns of pages to capture, `scopes` unless they depend on settings."""
+        return list(self.scopes)
+
+    @property
+    def fetcher(self) -> BaseFetcher:
+        """Return default fetcher for this parser."""
+        return self.get_fetcher(self.fetcher_name)
+
+    @property
+    def firefox(self) -> Firefox:
+        """Return Firefox fetcher for pages that require a browser."""
+        return cast('Firefox', self.get_fetcher('firefox'))
 
     def intercept_request(self, request: Request) -> None:
         """Abort request if host is in blocklist."""
@@ -53,8 +131,9 @@ class BaseParser:
         self.firefox.create_driver()
 
     def quit(self) -> None:
-        """Quit webdriver session."""
-        self.firefox.quit()
+        """Quit every fetcher session."""
+        for fetcher in self.fetchers.values():
+            fetcher.quit()
 
 
 class IPParser(BaseParser):
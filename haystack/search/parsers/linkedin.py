@@ -1,11 +1,19 @@
 import logging
+import re
+from collections.abc import Iterator
+from functools import cached_property
 from typing import ClassVar
-from urllib.parse import quote, urlencode
+from urllib.parse import quote, urlencode, urlsplit
 
+from bs4 import BeautifulSoup
+from django.conf import settings
 from django.utils import timezone
 from seleniumwire.request import Request, Response
 
+from haystack.core.instrumentation import timed
 from haystack.jobs.models import Job
+from haystack.search.extractors import BaseExtractor, get_extractor
+from haystack.search.fetchers import REDIRECT_STATUS_CODES, FetchError
 from haystack.search.models import Search, SearchSource
 from haystack.search.parsers.base import BaseParser
 from haystack.search.utils import NullableTag, remove_query
@@ -20,21 +28,35 @@ class LinkedInParser(BaseParser):
 
     MAX_JOB_COUNT = 1000
 
+    MAX_PAGES = MAX_JOB_COUNT // JOBS_PER_PAGE
+
     blocklist: ClassVar[list[str]] = []
 
+    # job pages, `populate` fetches them again after failures
+    cache_scopes: ClassVar[list[str]] = [r'/jobs/view/']
+
     name = 'linkedin'
 
+    # guest search endpoints return server rendered html, job pages still use Firefox
+    fetcher_name = 'http'
+
+    def get_page_scopes(self) -> list[str]:
+        """Return jobs pages of `LINKEDIN_BASE_URL` plus the pages aborted by `intercept_request`."""
+        return [rf'^{re.escape(settings.LINKEDIN_BASE_URL)}/(jobs|authwall|favicon\.ico|\?|$)']
+
     def intercept_request(self, request: Request) -> None:
         """Abort authwall requests."""
         super().intercept_request(request)
-        if request.host == 'www.linkedin.com' and request.path.strip('/') in ['', 'authwall', 'favicon.ico']:
+        host = urlsplit(settings.LINKEDIN_BASE_URL).netloc
+        if request.host == host and request.path.strip('/') in ['', 'authwall', 'favicon.ico']:
             request.abort(error_code=404)
 
     def process_response(self, requests: list[Request]) -> Response | None:
-        """Return most recent request to access jobs url."""
+        """Return most recent response of a jobs url, `None` if it only redirected, e.g. to the authwall."""
+        prefix = f'{settings.LINKEDIN_BASE_URL}/jobs'
         for request in reversed(requests):
-            if request.url.startswith('https://www.linkedin.com/jobs') and (response := request.response) is not None:
-                return response
+            if request.url.startswith(prefix) and (response := request.response) is not None:
+                return None if response.status_code in REDIRECT_STATUS_CODES else response
         return None
 
     def get_linkedin_url(self, endpoint: str, search: Search, page: int = 1, period: int | None = None) -> str:
@@ -70,17 +92,19 @@ class LinkedInParser(BaseParser):
         if ',' in getattr(search.location, 'name', ''):
             params['distance'] = 25
 
-        return f'https://linkedin.com{endpoint}search?{urlencode(params)}'
+        return f'{settings.LINKEDIN_BASE_URL}{endpoint}search?{urlencode(params)}'
 
     def get_job_count(self, search: Search) -> int:
-        """Return number of jobs found."""
+        """Return number of jobs found. Raise `FetchError` if the search page cannot be fetched."""
         url = self.get_linkedin_url('/jobs/', search)
-        response = self.firefox.get_with_retry(url)
+        response = self.fetcher.get_with_retry(url)
         if response is None:
-            logger.error('Unable to retrieve job count')
-            return 0
+            msg = f'Unable to retrieve job count from {url}'
+            raise FetchError(msg)
+        return self.parse_job_count(self.fetcher.soupify())
 
-        soup = self.firefox.soupify()
+    def parse_job_count(self, soup: BeautifulSoup) -> int:
+        """Parse number of jobs found from search page."""
         try:
             tag = soup.find('span', {'class': 'results-context-header__job-count'})
             if tag is None:
@@ -148,50 +172,92 @@ class LinkedInParser(BaseParser):
             return None
         return job
 
-    def parse(self, search_source: SearchSource, page: int = 1) -> list[dict]:
-        """Parse jobs."""
-        jobs: list[dict] = []
-        period = search_source.calculate_period()
+    @cached_property
+    def extractor(self) -> BaseExtractor:
+        """Return job card extractor configured by `settings.HTML_EXTRACTOR`."""
+        return get_extractor(settings.HTML_EXTRACTOR, self.parse_job)
 
-        url = self.get_linkedin_url('/jobs-guest/jobs/api/seeMoreJobPostings/', search_source.search, page, period)
-        response = self.firefox.get_with_retry(url)
-        if response is None:
-            logger.warning('Response for %s is None', url)
-            return jobs
-
-        for div in self.firefox.soupify().find_all('div', {'class': 'job-search-card'}):
-            job = self.parse_job(NullableTag(div))
-            if job is not None:
-                jobs.append(job)
-        return jobs
+    @timed('extract')
+    def parse_jobs(self, html: str) -> list[dict]:
+        """Parse every job card on search page."""
+        return self.extractor.extract(html)
 
-    def populate_job(self, job: Job) -> None:
-        """Populate Job with description and easy apply status."""
-        response = self.firefox.get_with_retry(job.url)
+    def get_search_url(self, search_source: SearchSource, page: int = 1, newest_first: bool = False) -> str:
+        """Return `seeMoreJobPostings` url for page of `search_source`."""
+        period = search_source.calculate_period()
+        url = self.get_linkedin_url('/jobs-guest/jobs/api/seeMoreJobPostings/', search_source.search, page, period)
+        if newest_first:
+            url += '&sortBy=DD'
+        return url
+
+    @timed('search_page')
+    def parse(self, search_source: SearchSource, page: int = 1, newest_first: bool = False) -> list[dict]:
+        """Parse jobs. `newest_first` sorts results by date posted instead of relevance.
+
+        Raise `FetchError` if the page cannot be fetched, so a failed page is
+        never mistaken for the short last page of the search.
+        """
+        url = self.get_search_url(search_source, page, newest_first)
+        response = self.fetcher.get_with_retry(url)
         if response is None:
-            logger.warning('Response for %s is None', job.url)
-            if self.firefox.last_status_code == 404:
-                logger.warning('Job not found, marking as expired')
-                job.update_status(Job.EXPIRED)
-
-        soup = self.firefox.soupify()
+            msg = f'Unable to fetch page {page} from {url}'
+            raise FetchError(msg)
+        return self.parse_jobs(self.fetcher.page_source)
+
+    def get_max_pages(self, search_source: SearchSource) -> int:
+        """Return upper bound on pages to request, from the job count if `settings.SEARCH_FETCH_JOB_COUNT`."""
+        if settings.SEARCH_FETCH_JOB_COUNT:
+            return min(self.get_page_count(search_source), self.MAX_PAGES)
+        return self.MAX_PAGES
+
+    def iter_pages(self, search_source: SearchSource, newest_first: bool = False) -> Iterator[tuple[int, list[dict]]]:
+        """Lazily yield page number and jobs of every page of `search_source`.
+
+        Stops after the first page with fewer than `JOBS_PER_PAGE` jobs, so
+        no page is requested until the previous one has been consumed.
+        """
+        for page in range(1, self.get_max_pages(search_source) + 1):
+            jobs = self.parse(search_source, page, newest_first)
+            yield page, jobs
+            if len(jobs) < self.JOBS_PER_PAGE:
+                return
+
+    @timed('parse_job_page')
+    def parse_job_page(self, job: Job, soup: BeautifulSoup) -> None:
+        """Set description and easy apply status of `job` from job page. Does not save."""
         root = NullableTag(soup.html)
-        job.raw_html = str(root)
+        job.html = str(root)
 
         try:
             job.description = root.find('div', {'class': 'show-more-less-html__markup'}).decode_contents().strip()
+            job.update_simhash()
         except Exception:
             logger.exception('Error parsing job description')
 
         try:
             code = root.find('code', {'id': 'applyUrl'})
-            if code is not None:
-                job.easy_apply = False
-            else:
-                job.easy_apply = True
+            job.easy_apply = not code
         except Exception:
             logger.exception('Failed to parse easy application status. Defaulting to parse')
             job.easy_apply = False
 
         job.populated = True
+
+    @timed('populate_job')
+    def populate_job(self, job: Job) -> bool:
+        """Populate Job with description and easy apply status. Return if job was populated.
+
+        Jobs whose page could not be fetched are left unpopulated so they are
+        retried, except jobs that no longer exist, which are marked expired.
+        """
+        response = self.firefox.get_with_retry(job.url)
+        if response is None:
+            logger.warning('Response for %s is None', job.url)
+            if self.firefox.last_status_code == 404:
+                logger.warning('Job not found, marking as expired')
+                job.update_status(Job.EXPIRED)
+            return False
+
+        self.parse_job_page(job, self.firefox.soupify())
         job.save()
+        return True
@@ -0,0 +1,249 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from haystack.jobs.models import Job
+from haystack.search.models import SearchSource, Status
+from haystack.search.parsers import get_parser
+
+if TYPE_CHECKING:
+    from haystack.search.parsers.base import BaseParser
+
+logger = logging.getLogger(__name__)
+
+
+class Event(StrEnum):
+    """Enum representing messages sent from workers to the writer."""
+
+    START = 'start'
+    PAGES = 'pages'
+    PAGE = 'page'
+    DONE = 'done'
+    ERROR = 'error'
+
+
+@dataclass
+class Message:
+    """Message sent from a worker to the writer."""
+
+    event: Event
+    search_source: SearchSource
+    page: int = 0
+    jobs: list[dict] = field(default_factory=list)
+
+
+class SearchPool:
+    """Fetch pages for several `SearchSource` objects concurrently.
+
+    Every worker thread owns its own parsers, and therefore its own Firefox
+    instance and selenium-wire proxy. Workers only fetch and parse pages.
+    Results are put on a queue that is drained by the calling thread, which
+    is the single writer for `SearchSource.set_status` and `Job.objects.add_jobs`.
+
+    `SearchSource` objects should be loaded with
+    `select_related('search__location', 'source')` so workers do not query
+    the database, except to look up known jobs when `incremental` is set.
+
+    With `incremental` set, results are sorted newest first and a worker
+    stops paginating once a page is mostly made of jobs that are already
+    stored or older than the previous run's `newest_date_posted`.
+
+    Workers fetch the next page while the writer stores the previous ones.
+    The queue holds at most `settings.SEARCH_BUFFER_PAGES` messages, so
+    workers wait for a slow writer instead of buffering a whole search, and
+    the writer stores consecutive pages of one search in batches of up to
+    `settings.SEARCH_WRITE_BATCH` jobs once it falls behind.
+
+    While searches run, the writer refreshes `updated_at` of unfinished ones
+    every quarter of `settings.SCHEDULER_STALE_AFTER`, so other schedulers do
+    not reclaim them as stale.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        write: Callable[[str], object] = logger.info,
+        incremental: bool = False,
+    ) -> None:
+        if workers < 1:
+            msg = 'SearchPool requires at least one worker.'
+            raise ValueError(msg)
+        self.workers = workers
+        self.write = write
+        self.incremental = incremental
+        self.queue: queue.Queue[Message] = queue.Queue(maxsize=max(settings.SEARCH_BUFFER_PAGES, 1))
+        self.write_batch = settings.SEARCH_WRITE_BATCH
+        # set when the writer fails, so workers stop instead of waiting for queue space
+        self.stopping = threading.Event()
+        self.local = threading.local()
+        self.parsers: list[BaseParser] = []
+        self.lock = threading.Lock()
+        self.heartbeat_interval = settings.SCHEDULER_STALE_AFTER / 4
+        self.heartbeat_at = time.monotonic()
+
+    def get_parser(self, name: str) -> 'BaseParser':
+        """Return parser owned by the current worker thread."""
+        parser_map: dict[str, BaseParser] = getattr(self.local, 'parser_map', {})
+        self.local.parser_map = parser_map
+        if name not in parser_map:
+            parser_map[name] = get_parser(name)
+            with self.lock:
+                self.parsers.append(parser_map[name])
+        return parser_map[name]
+
+    def put(self, message: Message) -> None:
+        """Queue `message` for the writer, waiting for space unless the pool is stopping."""
+        while not self.stopping.is_set():
+            try:
+                self.queue.put(message, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def crawl(self, search_source: SearchSource) -> None:
+        """Fetch and parse every page of `search_source`."""
+        self.put(Message(Event.START, search_source))
+        # snapshot before the writer raises it with this run's jobs
+        since = search_source.newest_date_posted
+        try:
+            parser = self.get_parser(search_source.source.parser)
+            page = 0
+            pages = parser.iter_pages(search_source, newest_first=self.incremental)  # type: ignore[attr-defined]
+            for page, jobs in pages:
+                # checked before the page is queued so the writer cannot store it first
+                is_known = self.incremental and search_source.is_known_page(jobs, since)
+                self.put(Message(Event.PAGE, search_source, page, jobs))
+                if self.stopping.is_set():
+                    return
+                if is_known:
+                    logger.info('Stopping %s after known page %d', search_source, page)
+                    break
+            self.put(Message(Event.PAGES, search_source, page))
+        except Exception:
+            logger.exception('Error executing %s', search_source)
+            self.put(Message(Event.ERROR, search_source))
+        else:
+            self.put(Message(Event.DONE, search_source))
+        finally:
+            connections.close_all()
+
+    def handle(self, message: Message) -> int:
+        """Write worker message to database and return number of jobs added."""
+        search_source = message.search_source
+        match message.event:
+            case Event.START:
+                self.write(f'Executing {search_source}')
+                search_source.set_status(Status.RUNNING)
+            case Event.PAGES:
+                self.write(f'Searched {message.page} pages for {search_source}')
+            case Event.PAGE:
+                return self.write_pages([message])
+            case Event.DONE:
+                search_source.set_status(Status.SUCCESS)
+            case Event.ERROR:
+                search_source.set_status(Status.ERROR)
+        return 0
+
+    def write_pages(self, pages: list[Message]) -> int:
+        """Add jobs of consecutive `pages` of one search source in one batch and return number added."""
+        search_source = pages[0].search_source
+        jobs = [job for message in pages for job in message.jobs]
+        count = Job.objects.add_jobs(jobs, search_source)
+        search_source.update_newest_date_posted(jobs)
+        first, last = pages[0].page, pages[-1].page
+        label = f'page {first}' if first == last else f'pages {first}-{last}'
+        self.write(f'Added {count} jobs from {label} of {search_source}')
+        return count
+
+    def get_messages(self) -> list[Message]:
+        """Wait for the next message and return it with every other message already queued.
+
+        Return no messages if none arrives before the next heartbeat is due.
+        """
+        timeout = max(self.heartbeat_at + self.heartbeat_interval - time.monotonic(), 0)
+        try:
+            messages = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        for _ in range(self.queue.maxsize):
+            try:
+                messages.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return messages
+
+    def handle_messages(self, messages: list[Message]) -> int:
+        """Handle `messages` in order, batching pages by search source, and return number of jobs added.
+
+        Buffered pages of a search source are written before any other message
+        of it, so its status is only set once its jobs are stored.
+        """
+        count = 0
+        buffered: dict[int, list[Message]] = {}
+        for message in messages:
+            key = message.search_source.pk
+            if message.event == Event.PAGE:
+                pages = buffered.setdefault(key, [])
+                pages.append(message)
+                if sum(len(page.jobs) for page in pages) >= self.write_batch:
+                    count += self.write_pages(buffered.pop(key))
+                continue
+            if flushed := buffered.pop(key, None):
+                count += self.write_pages(flushed)
+            count += self.handle(message)
+        for pages in buffered.values():
+            count += self.write_pages(pages)
+        return count
+
+    def heartbeat(self, ids: set[int]) -> None:
+        """Refresh `updated_at` of search sources `ids` if a heartbeat is due."""
+        if time.monotonic() - self.heartbeat_at < self.heartbeat_interval:
+            return
+        self.heartbeat_at = time.monotonic()
+        if ids:
+            SearchSource.objects.filter(id__in=ids).update(updated_at=timezone.now())
+
+    def run(self, search_sources: Iterable[SearchSource]) -> int:
+        """Crawl `search_sources` concurrently and return total number of jobs added."""
+        total_count = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='search') as executor:
+                remaining = set()
+                for search_source in search_sources:
+                    executor.submit(self.crawl, search_source)
+                    remaining.add(search_source.pk)
+                while remaining:
+                    messages = self.get_messages()
+                    try:
+                        total_count += self.handle_messages(messages)
+                        remaining -= {
+                            message.search_source.pk
+                            for message in messages
+                            if message.event in (Event.DONE, Event.ERROR)
+                        }
+                        self.heartbeat(remaining)
+                    except Exception:
+                        # running workers stop at their next page, queued ones never start
+                        self.stopping.set()
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
+        finally:
+            self.quit()
+        return total_count
+
+    def quit(self) -> None:
+        """Quit every parser created by the pool."""
+        with self.lock:
+            for parser in self.parsers:
+                parser.quit()
+            self.parsers.clear()
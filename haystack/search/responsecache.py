@@ -0,0 +1,196 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from seleniumwire.request import Response
+from seleniumwire.utils import decode
+
+from haystack.core.instrumentation import record_cache
+from haystack.search.utils import remove_query
+
+logger = logging.getLogger(__name__)
+
+# response headers kept with cached bodies
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+@dataclass
+class CacheEntry:
+    """Cached response body with the headers needed to revalidate it."""
+
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+    stored_at: float
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Return conditional request headers that revalidate this entry."""
+        validators = {}
+        if etag := self.headers.get('ETag'):
+            validators['If-None-Match'] = etag
+        if last_modified := self.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = last_modified
+        return validators
+
+    @property
+    def response(self) -> Response:
+        """Return entry as a selenium-wire `Response`."""
+        return Response(status_code=self.status_code, reason='OK', headers=self.headers.items(), body=self.body)
+
+    def dumps(self) -> bytes:
+        """Return entry as a gzip compressed JSON header line followed by the body."""
+        header = {
+            'url': self.url,
+            'status_code': self.status_code,
+            'headers': self.headers,
+            'stored_at': self.stored_at,
+        }
+        return gzip.compress(json.dumps(header).encode() + b'\n' + self.body)
+
+    @classmethod
+    def loads(cls, data: bytes) -> 'CacheEntry':
+        """Return entry from `dumps` output."""
+        header, _, body = gzip.decompress(data).partition(b'\n')
+        return cls(body=body, **json.loads(header))
+
+
+class ResponseCache:
+    """On-disk cache of successful responses for urls matching `scopes`.
+
+    Entries are keyed by url without query string and stored compressed, one
+    file per url, so several processes can share a directory. Entries younger
+    than `ttl` seconds are served without a request. Older entries are kept
+    for revalidation with `If-None-Match` or `If-Modified-Since` by fetchers
+    that can send them. Once the directory grows past `max_size` bytes, least
+    recently used entries are removed.
+    """
+
+    # fraction of `max_size` the cache is evicted down to, so eviction does not run on every write
+    LOW_WATERMARK = 0.9
+
+    def __init__(self, directory: Path, ttl: float, max_size: int, scopes: list[str]) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self.scopes = [re.compile(scope) for scope in scopes]
+        self.lock = threading.Lock()
+        self.size: int | None = None
+
+    def matches(self, url: str) -> bool:
+        """Return if responses of `url` are cached."""
+        return any(scope.search(url) for scope in self.scopes)
+
+    def get_path(self, url: str) -> Path:
+        """Return file of `url`."""
+        key = hashlib.sha256(str(remove_query(url)).encode()).hexdigest()
+        return self.directory / key[:2] / f'{key}.gz'
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Return if `entry` may be served without revalidation."""
+        return time.time() - entry.stored_at < self.ttl
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Return entry of `url`, fresh or stale, and mark it recently used."""
+        if not self.matches(url):
+            return None
+        path = self.get_path(url)
+        try:
+            entry = CacheEntry.loads(path.read_bytes())
+            path.touch()
+        except FileNotFoundError:
+            record_cache('miss')
+            return None
+        except (OSError, EOFError, ValueError, TypeError):
+            logger.warning('Removing unreadable cache entry %s', path)
+            path.unlink(missing_ok=True)
+            record_cache('miss')
+            return None
+        record_cache('hit' if self.is_fresh(entry) else 'stale')
+        return entry
+
+    def set(self, url: str, response: Response) -> CacheEntry | None:
+        """Store successful `response` of `url` and return its entry."""
+        if response.status_code != 200 or not self.matches(url):
+            return None
+        try:
+            body = decode(response.body, response.headers.get('Content-Encoding', 'identity'))
+        except ValueError:
+            logger.warning('Unable to decode response of %s, not caching it', url)
+            return None
+        headers = {name: value for name in STORED_HEADERS if (value := response.headers.get(name))}
+        entry = CacheEntry(str(remove_query(url)), response.status_code, headers, body, time.time())
+        self.write(entry)
+        return entry
+
+    def refresh(self, entry: CacheEntry) -> None:
+        """Restart time to live of `entry` after the server confirmed it is unchanged."""
+        entry.stored_at = time.time()
+        self.write(entry)
+        record_cache('revalidated')
+
+    def write(self, entry: CacheEntry) -> None:
+        """Atomically write `entry` and evict entries if the cache is too large."""
+        path = self.get_path(entry.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = entry.dumps()
+        tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        with self.lock:
+            # replaced entries are counted twice until the next eviction rescans the directory
+            if self.size is None:
+                self.size = self.get_size()
+            else:
+                self.size += len(data)
+            if self.size <= self.max_size:
+                return
+        self.evict()
+
+    def get_entries(self) -> list[tuple[Path, os.stat_result]]:
+        """Return entry files with their stats, skipping files removed by another process meanwhile."""
+        entries = []
+        for path in self.directory.glob('*/*.gz'):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def get_size(self) -> int:
+        """Return total size of entry files in bytes."""
+        return sum(stat.st_size for _, stat in self.get_entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache is below its low watermark. Return number removed."""
+        entries = sorted(self.get_entries(), key=lambda entry: entry[1].st_mtime)
+        size = sum(stat.st_size for _, stat in entries)
+        removed = 0
+        for path, stat in entries:
+            if size <= self.max_size * self.LOW_WATERMARK:
+                break
+            path.unlink(missing_ok=True)
+            size -= stat.st_size
+            removed += 1
+        with self.lock:
+            self.size = size
+        if removed:
+            logger.info('Evicted %d cached responses', removed)
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry and return number removed."""
+        entries = self.get_entries()
+        for path, _ in entries:
+            path.unlink(missing_ok=True)
+        with self.lock:
+            self.size = 0
+        return len(entries)
@@ -0,0 +1,147 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from enum import StrEnum
+from urllib.parse import urlsplit
+
+from django.utils import timezone
+from seleniumwire.request import Response
+
+logger = logging.getLogger(__name__)
+
+
+class Action(StrEnum):
+    """Enum representing what to do after a failed request."""
+
+    RETRY = 'retry'
+    GIVE_UP = 'give_up'
+
+
+class RetryPolicy:
+    """Decide whether and when to retry a failed request.
+
+    Delays use decorrelated jitter, where each delay is drawn uniformly
+    between `base` and three times the previous delay, capped at `cap`. A
+    `Retry-After` header on a 429 or 503 response takes precedence.
+    """
+
+    GIVE_UP_STATUS_CODES: tuple[int, ...] = (404, 410)
+
+    def __init__(self, retries: int = 8, base: float = 1.0, cap: float = 120.0) -> None:
+        self.retries = retries
+        self.base = base
+        self.cap = cap
+
+    def classify(self, status_code: int | None) -> Action:
+        """Return action for a failed request with `status_code`.
+
+        `None` means the request raised before a response was received.
+        """
+        if status_code in self.GIVE_UP_STATUS_CODES:
+            return Action.GIVE_UP
+        return Action.RETRY
+
+    def retry_after(self, response: Response | None) -> float | None:
+        """Return seconds requested by `Retry-After` header of `response`."""
+        if response is None or response.status_code not in (429, 503):
+            return None
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - timezone.now()).total_seconds())
+        except (TypeError, ValueError):
+            logger.warning('Unable to parse Retry-After header %s', value)
+            return None
+
+    def next_delay(self, previous: float) -> float:
+        """Return next delay using decorrelated jitter."""
+        return min(self.cap, random.uniform(self.base, max(self.base, previous * 3)))  # noqa: S311
+
+    def get_delay(self, response: Response | None, previous: float) -> float:
+        """Return seconds to wait before retrying."""
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            return min(self.cap, retry_after)
+        return self.next_delay(previous)
+
+
+class CircuitState(StrEnum):
+    """Enum representing `CircuitBreaker` states."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Stop requesting a host after repeated failures.
+
+    After `threshold` consecutive failures the circuit opens and requests are
+    rejected for `timeout` seconds. The next request is then allowed through
+    as a trial while every other request is still rejected: success closes
+    the circuit, failure opens it again. A trial that ends without a result,
+    because it raised an unexpected exception or was cancelled, is released
+    so the next request becomes the trial.
+    """
+
+    def __init__(self, threshold: int = 10, timeout: float = 300.0) -> None:
+        self.threshold = threshold
+        self.timeout = timeout
+        self.failures = 0
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return if a request may be made."""
+        with self.lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.trial_in_flight or time.monotonic() - self.opened_at < self.timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self.trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful request and close circuit."""
+        with self.lock:
+            self.failures = 0
+            self.state = CircuitState.CLOSED
+            self.trial_in_flight = False
+
+    def release(self) -> None:
+        """Release a request that ended without a result, so a half-open circuit admits a new trial."""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request and open circuit if threshold is reached."""
+        with self.lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != CircuitState.OPEN:
+                    logger.warning('Opening circuit after %d failures', self.failures)
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """Return `CircuitBreaker` for host of `url`, shared by every parser in the process."""
+    host = (urlsplit(url).hostname or '').removeprefix('www.')
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
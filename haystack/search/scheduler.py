@@ -0,0 +1,107 @@
+import heapq
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from haystack.search.models import SearchSource, Status
+from haystack.search.pool import SearchPool
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """Run every active `SearchSource` once per `SCHEDULER_INTERVAL`.
+
+    Next due times are kept in a heap of `(timestamp, id)` that is reloaded
+    from the database every `refresh` seconds to pick up new, edited or
+    externally executed objects. Due objects are claimed with
+    `SearchSource.objects.claim`, so several schedulers can share one
+    database without executing the same object twice, and are executed by a
+    `SearchPool` of `workers` browsers.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        write: Callable[[str], object] = logger.info,
+        incremental: bool = False,
+        refresh: float | None = None,
+        on_tick: Callable[[], object] | None = None,
+    ) -> None:
+        self.workers = workers
+        self.write = write
+        self.incremental = incremental
+        self.refresh = settings.SCHEDULER_REFRESH if refresh is None else refresh
+        self.on_tick = on_tick
+        self.heap: list[tuple[float, int]] = []
+        self.loaded_at = float('-inf')
+        self.stopped = threading.Event()
+
+    def get_due_time(self, search_source: SearchSource) -> float:
+        """Return timestamp at which `search_source` is due."""
+        due_at = search_source.next_run_at or timezone.now()
+        if search_source.status in (Status.SCHEDULED, Status.RUNNING):
+            # claimed by another process, due again only if that process died
+            due_at = max(due_at, search_source.updated_at + timedelta(seconds=settings.SCHEDULER_STALE_AFTER))
+        return due_at.timestamp()
+
+    def load(self) -> None:
+        """Rebuild heap from every active `SearchSource`."""
+        search_sources = SearchSource.objects.active().only('last_executed_at', 'status', 'updated_at')
+        self.heap = [(self.get_due_time(search_source), search_source.pk) for search_source in search_sources]
+        heapq.heapify(self.heap)
+        self.loaded_at = time.monotonic()
+
+    def pop_due(self) -> list[int]:
+        """Pop and return ids of every object due now."""
+        now = timezone.now().timestamp()
+        ids = []
+        while self.heap and self.heap[0][0] <= now:
+            ids.append(heapq.heappop(self.heap)[1])
+        return ids
+
+    def tick(self) -> int:
+        """Execute due objects claimed by this scheduler and return number of jobs added."""
+        if time.monotonic() - self.loaded_at >= self.refresh:
+            self.load()
+        ids = self.pop_due()
+        if not ids:
+            return 0
+        # objects claimed or executed elsewhere since the last load are skipped
+        search_sources = SearchSource.objects.claim(len(ids), ids)
+        if not search_sources:
+            return 0
+
+        self.write(f'Claimed {len(search_sources)} of {len(ids)} due searches')
+        pool = SearchPool(min(self.workers, len(search_sources)), self.write, incremental=self.incremental)
+        count = pool.run(search_sources)
+        for search_source in search_sources:
+            heapq.heappush(self.heap, (self.get_due_time(search_source), search_source.pk))
+        if self.on_tick is not None:
+            self.on_tick()
+        return count
+
+    def get_timeout(self) -> float:
+        """Return seconds until the next object is due or the heap is reloaded."""
+        until_load = self.loaded_at + self.refresh - time.monotonic()
+        until_due = self.heap[0][0] - timezone.now().timestamp() if self.heap else until_load
+        return max(0.0, min(until_due, until_load))
+
+    def run(self, once: bool = False) -> int:
+        """Execute due objects until `stop` is called, or once, and return number of jobs added."""
+        total_count = self.tick()
+        while not once and not self.stopped.wait(self.get_timeout()):
+            # the connection may have timed out while waiting
+            close_old_connections()
+            total_count += self.tick()
+        return total_count
+
+    def stop(self) -> None:
+        """Stop after the current tick."""
+        self.stopped.set()
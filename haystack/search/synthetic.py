@@ -0,0 +1,250 @@
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from html import escape
+
+# Deterministic LinkedIn guest pages for benchmarks and the mock server. The
+# markup follows saved pages closely enough for `LinkedInParser` and both job
+# card extractors, with the same tracking attributes and class lists.
+
+TITLES = [
+    'Software Engineer',
+    'Senior Python Engineer',
+    'Backend Developer (Django)',
+    'Data Engineer',
+    'Staff Engineer, Platform',
+    'Machine Learning Engineer',
+    'Site Reliability Engineer',
+    'Full Stack Developer',
+    'Engineering Manager',
+    'Principal Engineer - Search & Ranking',
+]
+
+COMPANIES = [
+    'Acme',
+    'Globex Corporation',
+    'Initech',
+    'Umbrella',
+    'Hooli',
+    'Stark Industries',
+    'Wayne Enterprises',
+    'Soylent',
+    'Vandelay Industries',
+    'Pied Piper',
+]
+
+LOCATIONS = [
+    'New York, NY',
+    'San Francisco, CA',
+    'Austin, TX',
+    'Seattle, WA',
+    'United States',
+    None,
+]
+
+PARAGRAPHS = [
+    'You will design and operate the services that ingest, clean and serve events to analysts and models.',
+    'Build and maintain Django services backed by PostgreSQL, Redis and Kafka.',
+    'Own data pipelines end to end, from ingestion to monitoring and alerting.',
+    'Profile and optimize hot paths in Python and SQL.',
+    'Review code, mentor engineers and help set technical direction for the team.',
+    'Experience running services on AWS or GCP with Docker and Kubernetes.',
+    'Comfort with asynchronous programming and distributed systems.',
+    'Medical, dental and vision insurance and a 401(k) with company match.',
+]
+
+# date every synthetic job is posted relative to
+EPOCH = date(2025, 10, 17)
+
+# origin of rendered links, the mock server renders its own
+BASE_URL = 'https://www.linkedin.com'
+
+CARD = """<li>
+  <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card \
+base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{id}" \
+data-impression-id="jobs-search-result-{position}" data-reference-id="aBcDeFgHiJkLmNoPqRsTuV==" \
+data-tracking-id="Zm9vYmFyYmF6cXV4MTIzNA==" data-column="1" data-row="{row}">
+    <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" \
+href="{url}?position={row}&amp;pageNum=0&amp;refId=aBcDeFgHiJkLmNoPqRsTuV%3D%3D" \
+data-tracking-control-name="public_jobs_jserp-result_search-card" data-tracking-client-ingraph \
+data-tracking-will-navigate>
+      <span class="sr-only">
+            {title}
+      </span>
+    </a>
+    <div class="search-entity-media">
+      <img class="artdeco-entity-image artdeco-entity-image--square-4" \
+data-delayed-url="https://media.licdn.com/dms/image/{slug}-logo" alt="{company}">
+    </div>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">
+            {title}
+      </h3>
+      <h4 class="base-search-card__subtitle">
+          <a class="hidden-nested-link" data-tracking-client-ingraph \
+data-tracking-control-name="public_jobs_jserp-result_job-search-card-subtitle" data-tracking-will-navigate \
+href="{company_url}?trk=public_jobs_jserp-result_job-search-card-subtitle">
+            {company}
+          </a>
+      </h4>
+      <div class="base-search-card__metadata">{location}
+          <time class="job-search-card__listdate" datetime="{date_posted}">
+            {days} days ago
+          </time>
+      </div>
+    </div>
+  </div>
+</li>
+"""
+
+LOCATION = """
+          <span class="job-search-card__location">
+            {location}
+          </span>"""
+
+JOB_PAGE = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <title>{company} hiring {title} | LinkedIn</title>
+    <link rel="canonical" href="{url}">
+  </head>
+  <body>
+    <main class="main" id="main-content" role="main">
+      <section class="top-card-layout container-lined overflow-hidden">
+        <h1 class="top-card-layout__title topcard__title">{title}</h1>
+        <a class="topcard__org-name-link topcard__flavor--black-link" href="{company_url}">{company}</a>
+        {apply}
+      </section>
+      <section class="core-section-container my-3 description">
+        <section class="show-more-less-html" data-max-lines="5">
+          <div class="show-more-less-html__markup show-more-less-html__markup--clamp-after-5 relative \
+overflow-hidden">
+        {description}
+          </div>
+        </section>
+      </section>
+    </main>
+  </body>
+</html>
+"""
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <title>Jobs | LinkedIn</title>
+  </head>
+  <body>
+    <main class="main" id="main-content" role="main">
+      <div class="results-context-header">
+        <h1 class="results-context-header__context">
+          <span class="results-context-header__job-count">{total}</span>
+          <span class="results-context-header__query-search">Jobs</span>
+        </h1>
+      </div>
+      <section class="two-pane-serp-page__results-list">
+        <ul class="jobs-search__results-list">
+{cards}
+        </ul>
+      </section>
+    </main>
+  </body>
+</html>
+"""
+
+APPLY_URL = '<code id="applyUrl" style="display: none"><!--"https://careers.example.com/jobs/{id}"--></code>'
+
+
+@dataclass
+class SyntheticJob:
+    """Job shown on synthetic pages."""
+
+    id: int
+    title: str
+    company: str
+    location: str | None
+    days: int
+    base_url: str = BASE_URL
+
+    @property
+    def slug(self) -> str:
+        """Return company url slug."""
+        return '-'.join(self.company.lower().split())
+
+    @property
+    def url(self) -> str:
+        """Return job page url without query string."""
+        title = '-'.join(''.join(c if c.isalnum() else ' ' for c in self.title.lower()).split())
+        return f'{self.base_url}/jobs/view/{title}-at-{self.slug}-{self.id}'
+
+    @property
+    def company_url(self) -> str:
+        """Return company page url without query string."""
+        return f'{self.base_url}/company/{self.slug}'
+
+    @property
+    def date_posted(self) -> str:
+        """Return ISO date posted."""
+        return (EPOCH - timedelta(days=self.days)).isoformat()
+
+
+def get_job(job_id: int, base_url: str = BASE_URL) -> SyntheticJob:
+    """Return job with `job_id`, the same on every call."""
+    rng = random.Random(job_id)  # noqa: S311
+    return SyntheticJob(
+        id=job_id,
+        title=rng.choice(TITLES),
+        company=rng.choice(COMPANIES),
+        location=rng.choice(LOCATIONS),
+        days=rng.randrange(30),
+        base_url=base_url,
+    )
+
+
+def get_job_ids(count: int, seed: int = 0, start: int = 0) -> list[int]:
+    """Return ids of `count` jobs of result set `seed`, starting at result `start`."""
+    return [4_000_000_000 + seed * 1_000_000 + i for i in range(start, start + count)]
+
+
+def render_card(job: SyntheticJob, position: int) -> str:
+    """Return search result card of `job`."""
+    return CARD.format(
+        id=job.id,
+        position=position,
+        row=position + 1,
+        url=job.url,
+        title=escape(job.title),
+        slug=job.slug,
+        company=escape(job.company),
+        company_url=job.company_url,
+        location=LOCATION.format(location=escape(job.location)) if job.location else '',
+        date_posted=job.date_posted,
+        days=job.days,
+    )
+
+
+def generate_search_page(count: int, seed: int = 0, start: int = 0, base_url: str = BASE_URL) -> str:
+    """Return `seeMoreJobPostings` fragment with `count` job cards of result set `seed` from result `start`."""
+    job_ids = get_job_ids(count, seed, start)
+    return ''.join(render_card(get_job(job_id, base_url), start + i) for i, job_id in enumerate(job_ids))
+
+
+def generate_results_page(total: int, seed: int = 0, base_url: str = BASE_URL) -> str:
+    """Return `/jobs/search` page of result set `seed` reporting `total` results, with its first page of cards."""
+    return SEARCH_PAGE.format(total=f'{total:,}', cards=generate_search_page(min(total, 10), seed, 0, base_url))
+
+
+def generate_job_page(job_id: int, paragraphs: int = 12, base_url: str = BASE_URL) -> str:
+    """Return guest job page of job `job_id`. Every third job is easy apply."""
+    job = get_job(job_id, base_url)
+    rng = random.Random(job_id)  # noqa: S311
+    description = '<br><br>'.join(
+        f'<strong>{escape(job.title)}</strong><br>{rng.choice(PARAGRAPHS)}' for _ in range(paragraphs)
+    )
+    return JOB_PAGE.format(
+        title=escape(job.title),
+        company=escape(job.company),
+        url=job.url,
+        company_url=job.company_url,
+        apply='' if job_id % 3 == 0 else APPLY_URL.format(id=job_id),
+        description=description,
+    )
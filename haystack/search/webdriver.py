@@ -1,53 +1,65 @@
 import logging
-import time
 from collections.abc import Callable
 from copy import deepcopy
-from typing import cast
+from typing import Any, ClassVar, cast
 
-from bs4 import BeautifulSoup
+from django.conf import settings
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.firefox.service import Service
 from seleniumwire import webdriver
 from seleniumwire.request import Response
 
+from haystack.core.instrumentation import timed
+from haystack.search.driverpool import PooledDriver, get_driver_pool
+from haystack.search.fetchers import BaseFetcher
+
 logging.getLogger('seleniumwire').setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
-class Firefox:
-    """A wrapper around the Selenium Firefox webdriver."""
+class Firefox(BaseFetcher):
+    """A wrapper around the Selenium Firefox webdriver.
+
+    Browsers are borrowed from a warm `DriverPool` shared by every `Firefox`
+    with the same proxy. `quit` returns the browser to the pool.
+    """
+
+    exceptions: ClassVar[tuple[type[Exception], ...]] = (WebDriverException,)
 
     def __init__(
         self,
         proxy: str | None = None,
         request_interceptor: Callable | None = None,
         response_processor: Callable | None = None,
+        scopes: list[str] | None = None,
     ) -> None:
-        self.request_interceptor = request_interceptor
-        self.response_processor = response_processor
+        super().__init__(request_interceptor, response_processor)
+        self.scopes = scopes or []
 
         self.options = webdriver.FirefoxOptions()
         self.options.add_argument('--headless')
         self.options.add_argument('--no-sandbox')
 
-        self.service = Service(executable_path='/usr/local/bin/geckodriver')
-
-        self.seleniumwire_options: dict[str, dict[str, str]] | None = None
+        # keep captured requests in memory and bounded instead of the
+        # default unbounded disk storage that lives as long as the driver
+        self.seleniumwire_options: dict[str, Any] = {
+            'request_storage': 'memory',
+            'request_storage_max_size': settings.WEBDRIVER_MAX_CAPTURED_REQUESTS,
+        }
         if proxy is not None:
-            self.seleniumwire_options = {
-                'proxy': {
-                    'http': proxy,
-                    'https': proxy,
-                    'no_proxy': 'localhost,127.0.0.1',
-                }
+            self.seleniumwire_options['proxy'] = {
+                'http': proxy,
+                'https': proxy,
+                'no_proxy': 'localhost,127.0.0.1',
             }
 
-        self.create_driver()
+        self.pool = get_driver_pool(proxy or '', self.launch)
+        self.pooled: PooledDriver | None = None
+        self.cached_source: str | None = None
 
-        self.last_status_code = None
-
-    def create_driver(self) -> None:
-        """Create Firefox webdriver.
+    @timed('browser_start')
+    def launch(self) -> webdriver.Firefox:
+        """Launch Firefox webdriver.
 
         Deepcopy of `self.seleniumwire_options` is required because
         upstream proxy configuration destroys original dictionary.
@@ -55,12 +67,31 @@ class Firefox:
         See https://github.com/wkeeling/selenium-wire/blob/da1b675fe2cc6dae2e3bb959c1ce95eb1c41830b/seleniumwire/utils.py#L24
         for more details.
         """
-        self.quit()
-        self.driver = webdriver.Firefox(
-            options=self.options, service=self.service, seleniumwire_options=deepcopy(self.seleniumwire_options)
+        return webdriver.Firefox(
+            options=self.options,
+            service=Service(executable_path='/usr/local/bin/geckodriver'),
+            seleniumwire_options=deepcopy(self.seleniumwire_options),
         )
-        if self.request_interceptor is not None:
-            self.driver.request_interceptor = self.request_interceptor
+
+    def acquire(self) -> PooledDriver:
+        """Acquire webdriver from pool if one is not held."""
+        if self.pooled is None:
+            self.pooled = self.pool.acquire()
+            if self.request_interceptor is not None:
+                self.pooled.driver.request_interceptor = self.request_interceptor
+            if self.scopes:
+                self.pooled.driver.scopes = self.scopes
+        return self.pooled
+
+    @property
+    def driver(self) -> webdriver.Firefox:
+        """Return held webdriver, acquiring one from the pool if needed."""
+        return self.acquire().driver
+
+    def create_driver(self) -> None:
+        """Discard held webdriver and acquire a different browser from the pool."""
+        self.quit(discard=True)
+        self.acquire()
 
     def get_last_response(self) -> Response | None:
         """Return `Response` of last driver request."""
@@ -68,48 +99,56 @@ class Firefox:
             return cast('Response', request.response)
         return None
 
+    @timed('fetch')
     def get(self, url: str) -> Response | None:
-        """Navigate to `url` and return page source."""
+        """Navigate to `url` and return page source.
+
+        Fresh cached pages are served without navigating. The browser cannot
+        revalidate stale ones, so they are fetched again.
+        """
         logger.info('GET %s', url)
-        self.driver.get(url)
+        entry = self.cache.get(url) if self.cache is not None else None
+        if self.cache is not None and entry is not None and self.cache.is_fresh(entry):
+            self.cached_source = self.decode(entry.response)
+            return self.check_response(entry.response)
+
+        self.cached_source = None
+        pooled = self.acquire()
+        pooled.navigations += 1
+        # only requests of this navigation are passed to `response_processor`
+        del pooled.driver.requests
+        pooled.driver.get(url)
         if self.response_processor is not None:
             response = self.response_processor(self.driver.requests)
         else:
             response = self.get_last_response()
-        if response is not None:
-            self.last_status_code = response.status_code
-        if response is None or response.status_code in [403, 404, 429, 500, 501, 502, 503, 504]:
-            return None
-        return response
-
-    def get_with_retry(self, url: str, retries: int = 8, backoff_factor: int = 1) -> Response | None:
-        """Retrieve url using exponential backoff."""
-        for attempt in range(retries):
-            try:
-                if (response := self.get(url)) is not None:
-                    return response
-                self.create_driver()
-            except WebDriverException:
-                logger.warning('Attempt %d failed for %s', attempt + 1, url)
-                self.create_driver()
-            backoff = backoff_factor * (2**attempt)
-            logger.info('Sleeping for %d seconds', backoff)
-            time.sleep(backoff)
-        logger.warning('Max retries for %s exceeded', url)
-        return None
+        if self.cache is not None and response is not None:
+            self.cache.set(url, response)
+        return self.check_response(response)
+
+    def clear(self) -> None:
+        """Forget last response and serve an empty page instead of the one the browser last showed."""
+        super().clear()
+        self.cached_source = ''
+
+    def reset(self) -> None:
+        """Recreate webdriver."""
+        self.create_driver()
+
+    def is_healthy(self) -> bool:
+        """Return if webdriver session still responds to commands."""
+        return self.pooled is not None and self.pooled.is_healthy()
 
-    def soupify(self) -> BeautifulSoup:
-        """Parse current page source into BeautifulSoup object."""
-        return BeautifulSoup(self.driver.page_source, 'html.parser')
+    @property
+    def page_source(self) -> str:
+        """Return source of current page, or body of the cached page served instead."""
+        if self.cached_source is not None:
+            return self.cached_source
+        return self.driver.page_source
 
-    def quit(self) -> None:
-        """End webdriver session."""
-        if not hasattr(self, 'driver'):
+    def quit(self, discard: bool = False) -> None:
+        """Return webdriver to pool, or quit it if `discard` is set."""
+        if self.pooled is None:
             return
-        try:
-            if getattr(self.driver, 'session_id', None):
-                self.driver.quit()
-            else:
-                logger.info('Webdriver session already closed')
-        except WebDriverException as e:
-            logger.warning('Issue quiting webdriver session: %s', e)
+        self.pool.release(self.pooled, discard=discard)
+        self.pooled = None
@@ -34,11 +34,13 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_htmx',
     'haystack.core',
     'haystack.jobs',
     'haystack.metrics',
     'haystack.search',
+    'haystack.tasks',
     'haystack.users',
 ]
 
@@ -96,6 +98,86 @@ ROOT_URLCONF = 'haystack.urls'
 
 SEARCH_PROXY = env('SEARCH_PROXY')
 
+# Origin of LinkedIn search and job urls, `loadtest` points it at the mock server
+LINKEDIN_BASE_URL = env.str('LINKEDIN_BASE_URL', default='https://www.linkedin.com')
+
+# Number of concurrent browsers used by the `search` command
+SEARCH_WORKERS = env.int('SEARCH_WORKERS', default=1)
+
+# Pages `search` workers may fetch ahead of the database writer, and jobs the
+# writer stores per batch once pages queue up
+SEARCH_BUFFER_PAGES = env.int('SEARCH_BUFFER_PAGES', default=20)
+SEARCH_WRITE_BATCH = env.int('SEARCH_WRITE_BATCH', default=100)
+
+# Fraction of already stored jobs on a page at which `search --incremental` stops paginating
+SEARCH_KNOWN_RATIO = env.float('SEARCH_KNOWN_RATIO', default=0.8)
+
+# Fetch the full search page to read the job count before paginating. When
+# disabled, pages are requested until one comes back short
+SEARCH_FETCH_JOB_COUNT = env.bool('SEARCH_FETCH_JOB_COUNT', default=False)
+
+# Maximum differing SimHash bits for `clusterjobs` to treat two descriptions as
+# the same posting. Must be below the number of bands, 4, to be found by band
+DEDUP_SIMHASH_DISTANCE = env.int('DEDUP_SIMHASH_DISTANCE', default=3)
+
+# `schedule` command: seconds between executions of one search source, seconds
+# after which a claimed search source whose process died is claimed again, and
+# seconds between reloads of the schedule from the database
+SCHEDULER_INTERVAL = env.int('SCHEDULER_INTERVAL', default=86400)
+SCHEDULER_STALE_AFTER = env.int('SCHEDULER_STALE_AFTER', default=7200)
+SCHEDULER_REFRESH = env.int('SCHEDULER_REFRESH', default=60)
+
+# Task queue: seconds a worker owns a leased task before another worker may
+# take it over, renewed every quarter lease while its batch runs, attempts before a task fails, base retry delay in seconds,
+# doubled after every failed attempt, and seconds idle workers wait between polls
+TASK_LEASE_SECONDS = env.int('TASK_LEASE_SECONDS', default=600)
+TASK_MAX_ATTEMPTS = env.int('TASK_MAX_ATTEMPTS', default=5)
+TASK_RETRY_DELAY = env.int('TASK_RETRY_DELAY', default=60)
+TASK_POLL_SECONDS = env.float('TASK_POLL_SECONDS', default=5.0)
+
+# On-disk cache of job pages: directory, empty to disable, seconds an entry is
+# served without revalidation, and megabytes after which least recently used
+# entries are evicted
+RESPONSE_CACHE_DIR = env.str('RESPONSE_CACHE_DIR', default=str(BASE_DIR.parent / 'cache'))
+RESPONSE_CACHE_TTL = env.int('RESPONSE_CACHE_TTL', default=86400)
+RESPONSE_CACHE_MAX_MB = env.int('RESPONSE_CACHE_MAX_MB', default=512)
+
+# Company url and location name to id lookups kept in process while adding
+# jobs: entries per table, also the number of most recent jobs whose companies
+# and locations are loaded at command start, and an optional `CACHES` alias
+# shared by worker processes, empty to keep lookups in process only
+LOOKUP_CACHE_SIZE = env.int('LOOKUP_CACHE_SIZE', default=10000)
+LOOKUP_CACHE_BACKEND = env.str('LOOKUP_CACHE_BACKEND', default='')
+
+# Directory where commands save scrape timing snapshots served by `/metrics/`
+INSTRUMENTATION_DIR = Path(env.str('INSTRUMENTATION_DIR', default=str(BASE_DIR.parent / 'instrumentation')))
+
+# Warm Firefox pool: idle browsers kept per proxy, and navigations or memory
+# growth after which a browser is recycled
+WEBDRIVER_POOL_SIZE = env.int('WEBDRIVER_POOL_SIZE', default=1)
+WEBDRIVER_MAX_NAVIGATIONS = env.int('WEBDRIVER_MAX_NAVIGATIONS', default=200)
+WEBDRIVER_MAX_MEMORY_MB = env.int('WEBDRIVER_MAX_MEMORY_MB', default=1024)
+
+# Maximum number of requests selenium-wire keeps in memory per browser
+WEBDRIVER_MAX_CAPTURED_REQUESTS = env.int('WEBDRIVER_MAX_CAPTURED_REQUESTS', default=50)
+
+# Number of worker processes used by the `populate` command
+POPULATE_WORKERS = env.int('POPULATE_WORKERS', default=1)
+
+# Limits for the asyncio crawler: requests in flight, and requests per second and burst size per host
+CRAWL_CONCURRENCY = env.int('CRAWL_CONCURRENCY', default=8)
+CRAWL_RATE = env.float('CRAWL_RATE', default=1.0)
+CRAWL_BURST = env.float('CRAWL_BURST', default=5.0)
+
+# BeautifulSoup tree builder, `lxml` is faster but is not a dependency and must
+# be installed separately, and job card extraction backend (`card` single pass
+# or `soup` chained lookups)
+HTML_PARSER = env('HTML_PARSER', default='html.parser')
+HTML_EXTRACTOR = env('HTML_EXTRACTOR', default='card')
+
+# Number of applications per day the dashboard measures progress against
+METRICS_DAILY_GOAL = env.int('METRICS_DAILY_GOAL', default=32)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
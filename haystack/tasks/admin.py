@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+from haystack.core.admin import UUIDModelAdmin
+from haystack.tasks.models import Task
+
+admin.site.register(Task, UUIDModelAdmin)
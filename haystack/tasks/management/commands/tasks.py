@@ -0,0 +1,26 @@
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Count
+from django.utils import timezone
+
+from haystack.tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Show task queue counts and purge finished tasks.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add purge argument."""
+        parser.add_argument('--purge', type=int, metavar='DAYS', help='Delete tasks finished more than DAYS ago.')
+
+    def handle(self, **options: Any) -> None:
+        """Print number of tasks by kind and status."""
+        if options['purge'] is not None:
+            count = Task.objects.purge(timezone.now() - timedelta(days=options['purge']))
+            self.stdout.write(f'Deleted {count} tasks')
+
+        rows = Task.objects.values_list('kind', 'status').annotate(count=Count('id')).order_by('kind', 'status')
+        for kind, status, count in rows:
+            self.stdout.write(f'{kind:12} {status:8} {count}')
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:34
+
+import django.db.models.deletion
+import django.utils.timezone
+import haystack.core.fields
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('jobs', '0014_job_dedup'),
+        ('search', '0005_searchsource_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', haystack.core.fields.AutoCreatedField(auto_now_add=True)),
+                ('updated_at', haystack.core.fields.AutoUpdatedField(auto_now=True)),
+                ('uuid', haystack.core.fields.UUIDField(default=uuid.uuid4, editable=False, verbose_name='UUID')),
+                ('kind', models.CharField(choices=[('search_page', 'Search page'), ('populate', 'Populate')], max_length=11)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=7)),
+                ('page', models.PositiveIntegerField(blank=True, null=True)),
+                ('incremental', models.BooleanField(default=False)),
+                ('since', models.DateTimeField(blank=True, null=True)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('owner', models.CharField(blank=True, max_length=128)),
+                ('leased_until', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='jobs.job')),
+                ('search_source', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='search.searchsource')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['kind', 'run_after', 'id'], name='task_pending_idx'), models.Index(condition=models.Q(('status', 'running')), fields=['leased_until'], name='task_running_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('search_source', 'page'), name='task_open_search_page_uniq'), models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('job',), name='task_open_job_uniq')],
+            },
+        ),
+    ]
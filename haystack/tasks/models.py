@@ -0,0 +1,214 @@
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import ClassVar
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from haystack.core.models import UUIDModel
+from haystack.jobs.models import Job
+from haystack.search.models import SearchSource, Status
+
+logger = logging.getLogger(__name__)
+
+
+class Kind(models.TextChoices):
+    """Enum representing `Task` kinds."""
+
+    SEARCH_PAGE = 'search_page', _('Search page')
+    POPULATE = 'populate', _('Populate')
+
+
+class TaskStatus(models.TextChoices):
+    """Enum representing `Task` statuses."""
+
+    PENDING = 'pending', _('Pending')
+    RUNNING = 'running', _('Running')
+    DONE = 'done', _('Done')
+    FAILED = 'failed', _('Failed')
+
+
+OPEN_STATUSES = [TaskStatus.PENDING, TaskStatus.RUNNING]
+
+
+class TaskManager(models.Manager['Task']):
+    """Custom model manager for Task."""
+
+    def create_tasks(self, tasks: list['Task']) -> int:
+        """Insert `tasks`, skipping any with an identical open task, and return number created."""
+        self.bulk_create(tasks, ignore_conflicts=True)
+        return self.filter(uuid__in=[task.uuid for task in tasks]).count()
+
+    def enqueue_searches(self, search_sources: Iterable[SearchSource], incremental: bool = False) -> int:
+        """Queue first page of every search source and return number of tasks created.
+
+        With `incremental` set, pages are fetched newest first and pagination
+        stops at the first page mostly made of jobs known at enqueue time.
+        """
+        tasks = [
+            Task(
+                kind=Kind.SEARCH_PAGE,
+                search_source=search_source,
+                page=1,
+                incremental=incremental,
+                since=search_source.newest_date_posted if incremental else None,
+            )
+            for search_source in search_sources
+        ]
+        count = self.create_tasks(tasks)
+        SearchSource.objects.filter(
+            id__in=self.filter(uuid__in=[task.uuid for task in tasks]).values('search_source')
+        ).update(status=Status.SCHEDULED)
+        return count
+
+    def enqueue_populate(self, job_ids: Iterable[int], batch_size: int = 1000) -> int:
+        """Queue population of every job and return number of tasks created."""
+        count = 0
+        batch: list[Task] = []
+        for job_id in job_ids:
+            batch.append(Task(kind=Kind.POPULATE, job_id=job_id))
+            if len(batch) >= batch_size:
+                count += self.create_tasks(batch)
+                batch = []
+        if batch:
+            count += self.create_tasks(batch)
+        return count
+
+    def lease(self, kind: Kind, limit: int, owner: str) -> list['Task']:
+        """Lease up to `limit` runnable tasks of `kind` to `owner` and return them, oldest first.
+
+        A task is runnable when it is pending and its `run_after` has passed,
+        or when it is running but its lease expired because its worker died.
+        Rows are locked with `SKIP LOCKED`, so concurrent workers lease
+        disjoint tasks without waiting on each other.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(
+                self.filter(
+                    Q(status=TaskStatus.PENDING, run_after__lte=now)
+                    | Q(status=TaskStatus.RUNNING, leased_until__lt=now),
+                    kind=kind,
+                )
+                .order_by('run_after', 'id')
+                .select_for_update(skip_locked=True)
+                .values_list('id', flat=True)[:limit]
+            )
+            self.filter(id__in=ids).update(
+                status=TaskStatus.RUNNING,
+                owner=owner,
+                leased_until=now + timedelta(seconds=settings.TASK_LEASE_SECONDS),
+                attempts=F('attempts') + 1,
+                updated_at=now,
+            )
+        return list(
+            self.filter(id__in=ids)
+            .select_related('search_source__search__location', 'search_source__source', 'job__search_source__source')
+            .defer('job__raw_html', 'job__description', 'job__search_vector')
+            .order_by('run_after', 'id')
+        )
+
+    def renew(self, ids: Iterable[int], owner: str) -> int:
+        """Extend leases of running tasks `ids` held by `owner` and return number renewed."""
+        return self.filter(id__in=ids, owner=owner, status=TaskStatus.RUNNING).update(
+            leased_until=timezone.now() + timedelta(seconds=settings.TASK_LEASE_SECONDS)
+        )
+
+    def purge(self, before: datetime) -> int:
+        """Delete tasks that finished before `before` and return number deleted."""
+        count, _ = self.filter(status__in=[TaskStatus.DONE, TaskStatus.FAILED], updated_at__lt=before).delete()
+        return count
+
+
+class Task(UUIDModel):
+    """Unit of search or populate work leased by one worker at a time."""
+
+    kind = models.CharField(max_length=11, choices=Kind.choices)
+    status = models.CharField(max_length=7, choices=TaskStatus.choices, default=TaskStatus.PENDING)
+
+    # search page arguments
+    search_source = models.ForeignKey(
+        SearchSource, related_name='tasks', on_delete=models.CASCADE, null=True, blank=True
+    )
+    page = models.PositiveIntegerField(null=True, blank=True)
+    incremental = models.BooleanField(default=False)
+    since = models.DateTimeField(null=True, blank=True)
+
+    # populate arguments
+    job = models.ForeignKey(Job, related_name='tasks', on_delete=models.CASCADE, null=True, blank=True)
+
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    owner = models.CharField(max_length=128, blank=True)
+    leased_until = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    objects = TaskManager()
+
+    class Meta:
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            # producers may enqueue the same work concurrently
+            models.UniqueConstraint(
+                fields=['search_source', 'page'],
+                condition=Q(status__in=OPEN_STATUSES),
+                name='task_open_search_page_uniq',
+            ),
+            models.UniqueConstraint(fields=['job'], condition=Q(status__in=OPEN_STATUSES), name='task_open_job_uniq'),
+        ]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=['kind', 'run_after', 'id'], name='task_pending_idx', condition=Q(status=TaskStatus.PENDING)
+            ),
+            models.Index(fields=['leased_until'], name='task_running_idx', condition=Q(status=TaskStatus.RUNNING)),
+        ]
+
+    @property
+    def exhausted(self) -> bool:
+        """Return if no attempts are left."""
+        return self.attempts >= settings.TASK_MAX_ATTEMPTS
+
+    def save_leased(self, fields: list[str]) -> bool:
+        """Save `fields` if the task is still running under the lease of `owner`. Return if it was saved.
+
+        A worker whose lease expired must not overwrite the task once another
+        worker leased it again.
+        """
+        self.updated_at = timezone.now()
+        count = Task.objects.filter(pk=self.pk, owner=self.owner, status=TaskStatus.RUNNING).update(
+            **{field: getattr(self, field) for field in [*fields, 'updated_at']}
+        )
+        if not count:
+            logger.warning('Lease of %s by %s was lost, not saving %s', self, self.owner, self.status)
+        return bool(count)
+
+    def complete(self) -> bool:
+        """Mark done and save. Return if the task was still leased by `owner`."""
+        self.status = TaskStatus.DONE
+        self.leased_until = None
+        self.error = ''
+        return self.save_leased(['status', 'leased_until', 'error'])
+
+    def fail(self, error: str) -> bool:
+        """Schedule retry with exponential backoff, or mark failed if no attempts are left, and save.
+
+        Return if the task was still leased by `owner`.
+        """
+        self.error = error
+        self.leased_until = None
+        if self.exhausted:
+            self.status = TaskStatus.FAILED
+        else:
+            self.status = TaskStatus.PENDING
+            delay = settings.TASK_RETRY_DELAY * 2 ** max(0, self.attempts - 1)
+            self.run_after = timezone.now() + timedelta(seconds=delay)
+        return self.save_leased(['status', 'run_after', 'leased_until', 'error'])
+
+    def __str__(self) -> str:
+        """Return kind and arguments."""
+        if self.kind == Kind.SEARCH_PAGE:
+            return f'{self.get_kind_display()} {self.page} of {self.search_source}'
+        return f'{self.get_kind_display()} {self.job}'
@@ -0,0 +1,184 @@
+import logging
+import os
+import socket
+import time
+from collections.abc import Callable
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from haystack.jobs.models import Job
+from haystack.search.fetchers import FetchError
+from haystack.search.models import Status
+from haystack.search.parsers import get_parser
+from haystack.search.parsers.base import BaseParser
+from haystack.tasks.models import Kind, Task
+
+logger = logging.getLogger(__name__)
+
+
+def get_owner() -> str:
+    """Return lease owner name of the current process."""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class Worker:
+    """Lease tasks of `kinds` from the queue and execute them until the queue is empty.
+
+    Each search page task queues the next page when it completes, in the
+    same transaction as its jobs, so a crash resumes pagination at the first
+    unfinished page. Populate tasks skip jobs that were populated before the
+    task was retried.
+    """
+
+    def __init__(
+        self,
+        kinds: list[Kind],
+        write: Callable[[str], object] = logger.info,
+        batch_size: int = 10,
+    ) -> None:
+        self.kinds = kinds
+        self.write = write
+        self.batch_size = batch_size
+        self.owner = get_owner()
+        self.parsers: dict[str, BaseParser] = {}
+        self.heartbeat_interval = settings.TASK_LEASE_SECONDS / 4
+        self.heartbeat_at = time.monotonic()
+
+    def get_parser(self, name: str) -> BaseParser:
+        """Return parser owned by this worker."""
+        if name not in self.parsers:
+            self.parsers[name] = get_parser(name)
+        return self.parsers[name]
+
+    def search_page(self, task: Task) -> int:
+        """Fetch page of search source, store its jobs and queue the next page. Return number of jobs added."""
+        search_source = task.search_source
+        if search_source is None or task.page is None:
+            return 0
+        if task.page == 1:
+            search_source.set_status(Status.RUNNING)
+
+        parser = self.get_parser(search_source.source.parser)
+        jobs = parser.parse(search_source, task.page, newest_first=task.incremental)  # type: ignore[attr-defined]
+        is_known = task.incremental and search_source.is_known_page(jobs, task.since)
+        is_last = is_known or len(jobs) < parser.JOBS_PER_PAGE or task.page >= parser.MAX_PAGES  # type: ignore[attr-defined]
+
+        with transaction.atomic():
+            if not task.complete():
+                # the lease expired and another worker stores this page
+                return 0
+            count = Job.objects.add_jobs(jobs, search_source)
+            search_source.update_newest_date_posted(jobs)
+            if is_last:
+                search_source.set_status(Status.SUCCESS)
+            else:
+                Task.objects.create_tasks(
+                    [
+                        Task(
+                            kind=Kind.SEARCH_PAGE,
+                            search_source=search_source,
+                            page=task.page + 1,
+                            incremental=task.incremental,
+                            since=task.since,
+                        )
+                    ]
+                )
+        self.write(f'Added {count} jobs from page {task.page} of {search_source}')
+        return count
+
+    def populate(self, task: Task) -> int:
+        """Populate job and return 1, or 0 if it is already populated or expired.
+
+        Raise `FetchError` if the job page could not be fetched, so the task is retried.
+        """
+        job = task.job
+        if job is None or job.populated or job.search_source is None:
+            task.complete()
+            return 0
+        populated = self.get_parser(job.search_source.source.parser).populate_job(job)  # type: ignore[attr-defined]
+        if not populated and job.status != Job.EXPIRED:
+            msg = f'Unable to fetch {job.url}'
+            raise FetchError(msg)
+        task.complete()
+        return int(populated)
+
+    def on_failed(self, task: Task) -> None:
+        """Record that the search of a task that exhausted its attempts failed."""
+        if task.kind == Kind.SEARCH_PAGE and task.search_source is not None:
+            task.search_source.set_status(Status.ERROR)
+
+    def execute(self, task: Task) -> int:
+        """Execute task and return number of jobs added or populated. Failures are retried later."""
+        if task.attempts > settings.TASK_MAX_ATTEMPTS:
+            # the lease of the last attempt expired, its worker died
+            task.fail(f'Lease expired after {settings.TASK_MAX_ATTEMPTS} attempts')
+            self.on_failed(task)
+            return 0
+        try:
+            if task.kind == Kind.SEARCH_PAGE:
+                return self.search_page(task)
+            return self.populate(task)
+        except Exception as e:
+            logger.exception('Error executing %s', task)
+            task.fail(repr(e))
+            if task.exhausted:
+                self.on_failed(task)
+            return 0
+
+    def heartbeat(self, tasks: list[Task]) -> None:
+        """Renew leases of `tasks` if a heartbeat is due."""
+        if time.monotonic() - self.heartbeat_at < self.heartbeat_interval:
+            return
+        self.heartbeat_at = time.monotonic()
+        Task.objects.renew([task.pk for task in tasks], self.owner)
+
+    def execute_batch(self, tasks: list[Task]) -> int:
+        """Execute leased `tasks` in order and return number of jobs added or populated.
+
+        Leases of the tasks not yet finished are renewed while the batch runs,
+        so a long batch does not lose its last tasks to another worker.
+        """
+        self.heartbeat_at = time.monotonic()
+        count = 0
+        for n, task in enumerate(tasks):
+            self.heartbeat(tasks[n:])
+            count += self.execute(task)
+        return count
+
+    def run_once(self) -> int | None:
+        """Lease and execute one batch of every kind. Return number of jobs, or `None` if nothing was runnable."""
+        total_count: int | None = None
+        for kind in self.kinds:
+            tasks = Task.objects.lease(kind, self.batch_size, self.owner)
+            if tasks:
+                total_count = (total_count or 0) + self.execute_batch(tasks)
+        return total_count
+
+    def run(self, forever: bool = False) -> int:
+        """Execute tasks until the queue is empty, or poll for new tasks `forever`. Return number of jobs.
+
+        A worker killed mid task loses nothing, its leases expire and the tasks
+        are executed again by another worker.
+        """
+        total_count = 0
+        try:
+            while True:
+                count = self.run_once()
+                if count is not None:
+                    total_count += count
+                    continue
+                if not forever:
+                    break
+                time.sleep(settings.TASK_POLL_SECONDS)
+                # the connection may have timed out while waiting
+                close_old_connections()
+        finally:
+            self.quit()
+        return total_count
+
+    def quit(self) -> None:
+        """Quit every parser owned by this worker."""
+        for parser in self.parsers.values():
+            parser.quit()
+        self.parsers.clear()
@@ -0,0 +1,111 @@
+import json
+import os
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.db import connection
+
+# Benchmarks are deselected by default, run them with `pytest -m benchmark`.
+# Set BENCHMARK_UPDATE=1 to record the results as the new baselines. Query
+# counts may never exceed their baseline. Latencies depend on the machine, so
+# they are only checked when BENCHMARK_TOLERANCE is set, to the fraction by
+# which the median latency may exceed a baseline recorded on the same machine.
+
+BASELINES_PATH = Path(__file__).parent / 'baselines.json'
+
+TOLERANCE = float(os.environ['BENCHMARK_TOLERANCE']) if os.environ.get('BENCHMARK_TOLERANCE') else None
+
+UPDATE = os.environ.get('BENCHMARK_UPDATE') == '1'
+
+
+@dataclass
+class Result:
+    """Latencies of the rounds of one benchmark."""
+
+    name: str
+    samples: list[float]
+    items: int
+    queries: int
+
+    @property
+    def p50(self) -> float:
+        """Return median round latency in seconds."""
+        return statistics.median(self.samples)
+
+    @property
+    def p99(self) -> float:
+        """Return 99th percentile round latency in seconds."""
+        if len(self.samples) < 2:
+            return self.samples[0]
+        return statistics.quantiles(self.samples, n=100, method='inclusive')[98]
+
+    @property
+    def throughput(self) -> float:
+        """Return items per second."""
+        return self.items * len(self.samples) / sum(self.samples)
+
+    def as_baseline(self) -> dict[str, float]:
+        """Return values stored in `baselines.json`."""
+        return {
+            'p50': round(self.p50, 6),
+            'p99': round(self.p99, 6),
+            'throughput': round(self.throughput, 1),
+            'queries': self.queries,
+        }
+
+
+RESULTS: list[Result] = []
+
+
+def load_baselines() -> dict[str, dict[str, float]]:
+    """Return stored baselines by benchmark name."""
+    if not BASELINES_PATH.exists():
+        return {}
+    return json.loads(BASELINES_PATH.read_text())
+
+
+class Bench:
+    """Time rounds of a function, count its queries and compare with the stored baseline."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self, func: Callable[[], object], rounds: int = 20, items: int = 1, warmup: int = 1) -> Result:
+        """Run `func` `warmup` times, then time `rounds` calls that each process `items` items."""
+        for _ in range(warmup):
+            func()
+
+        queries = 0
+
+        def count_queries(execute: Callable, *args: Any) -> Any:
+            nonlocal queries
+            queries += 1
+            return execute(*args)
+
+        samples = []
+        with connection.execute_wrapper(count_queries):
+            for _ in range(rounds):
+                start = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - start)
+
+        result = Result(self.name, samples, items, round(queries / rounds))
+        RESULTS.append(result)
+        self.check(result)
+        return result
+
+    def check(self, result: Result) -> None:
+        """Fail if `result` regressed from its baseline."""
+        baseline = load_baselines().get(result.name)
+        if UPDATE or baseline is None:
+            return
+        if result.queries > baseline['queries']:
+            pytest.fail(f'{result.name} makes {result.queries} queries per round, baseline is {baseline["queries"]}')
+        if TOLERANCE is not None and result.p50 > baseline['p50'] * (1 + TOLERANCE):
+            msg = f'{result.name} median {result.p50 * 1000:.2f} ms, baseline is {baseline["p50"] * 1000:.2f} ms'
+            pytest.fail(msg)
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from haystack.tests.benchmarks.bench import BASELINES_PATH, RESULTS, UPDATE, Bench, load_baselines
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Bench:
+    """Return benchmark runner named after the test."""
+    return Bench(request.node.name)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter) -> None:
+    """Print results and store them as baselines when `BENCHMARK_UPDATE` is set."""
+    if not RESULTS:
+        return
+    terminalreporter.section('benchmarks')
+    terminalreporter.write_line(f'{"name":44} {"items/s":>12} {"p50 ms":>10} {"p99 ms":>10} {"queries":>8}')
+    for result in RESULTS:
+        terminalreporter.write_line(
+            f'{result.name:44} {result.throughput:12.1f} {result.p50 * 1000:10.3f} '
+            f'{result.p99 * 1000:10.3f} {result.queries:8}'
+        )
+    if UPDATE:
+        baselines = load_baselines() | {result.name: result.as_baseline() for result in RESULTS}
+        BASELINES_PATH.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + '\n')
+        terminalreporter.write_line(f'Updated {BASELINES_PATH}')
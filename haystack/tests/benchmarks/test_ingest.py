@@ -0,0 +1,57 @@
+from itertools import batched
+
+import pytest
+from django.db import connection
+
+from haystack.jobs.models import Job
+from haystack.search.models import SearchSource
+from haystack.search.synthetic import get_job, get_job_ids
+from haystack.tests.benchmarks.bench import Bench
+
+pytestmark = pytest.mark.benchmark
+
+# jobs per `add_jobs` call, ten search pages
+BATCH_SIZE = 100
+
+
+def make_jobs(count: int, seed: int = 0) -> list[dict]:
+    """Return `count` parsed synthetic jobs."""
+    jobs = []
+    for job_id in get_job_ids(count, seed):
+        job = get_job(job_id)
+        jobs.append(
+            {
+                'company': job.company,
+                'company_url': job.company_url,
+                'title': job.title,
+                'url': job.url,
+                'location': job.location,
+                'date_posted': job.date_posted,
+                'date_found': '2025-10-17 12:00:00+00:00',
+            }
+        )
+    return jobs
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('count', [1000, 10000, 100000])
+def test_add_jobs(bench: Bench, search_source: SearchSource, count: int) -> None:
+    """Benchmark ingesting batches of new jobs into a table of `count` jobs."""
+    for jobs in batched(make_jobs(count, seed=1), 10000, strict=False):
+        Job.objects.add_jobs(list(jobs), search_source)
+    # autovacuum would have analyzed the table by now, keep the planner from seq scanning it
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE jobs_job')
+    batches = iter(list(batched(make_jobs(20 * BATCH_SIZE), BATCH_SIZE, strict=False)))
+    bench(lambda: Job.objects.add_jobs(list(next(batches)), search_source), warmup=0, items=BATCH_SIZE)
+    assert Job.objects.count() == count + 20 * BATCH_SIZE
+
+
+@pytest.mark.django_db
+def test_add_known_jobs(bench: Bench, search_source: SearchSource) -> None:
+    """Benchmark re-ingesting search pages of already stored jobs, as incremental searches do."""
+    jobs = make_jobs(1000)
+    Job.objects.add_jobs(jobs, search_source)
+    pages = [list(page) for page in batched(jobs, 10, strict=False)]
+    pages_iter = iter(pages * 2)
+    bench(lambda: Job.objects.add_jobs(next(pages_iter), search_source), rounds=len(pages), items=10)
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.utils import timezone
+
+from haystack.jobs.models import Job
+from haystack.search.extractors import CardExtractor, SoupExtractor, make_soup
+from haystack.search.models import SearchSource
+from haystack.search.parsers.linkedin import LinkedInParser
+from haystack.search.synthetic import generate_search_page
+from haystack.search.utils import NullableTag, remove_query
+from haystack.tests.benchmarks.bench import Bench
+
+pytestmark = pytest.mark.benchmark
+
+FIXTURES = Path(__file__).parent.parent / 'fixtures' / 'linkedin'
+
+
+@pytest.fixture(scope='module')
+def search_html() -> str:
+    """Return saved LinkedIn search page."""
+    return (FIXTURES / 'search.html').read_text()
+
+
+@pytest.fixture(scope='module')
+def job_html() -> str:
+    """Return saved LinkedIn job page."""
+    return (FIXTURES / 'job.html').read_text()
+
+
+def test_parse_job(bench: Bench, search_html: str) -> None:
+    """Benchmark `parse_job` on every card of the saved search page."""
+    parser = LinkedInParser()
+    cards = [NullableTag(card) for card in make_soup(search_html).find_all('div', class_='job-search-card')]
+
+    def parse() -> None:
+        for card in cards:
+            parser.parse_job(card)
+
+    bench(parse, rounds=200, items=len(cards))
+
+
+@pytest.mark.parametrize('extractor', ['soup', 'card'])
+@pytest.mark.parametrize('cards', [10, 100])
+def test_extract(bench: Bench, extractor: str, cards: int) -> None:
+    """Benchmark extracting jobs from synthetic search pages, parsing included."""
+    html = generate_search_page(cards)
+    backend = SoupExtractor(LinkedInParser().parse_job) if extractor == 'soup' else CardExtractor()
+    assert len(backend.extract(html)) == cards
+    bench(lambda: backend.extract(html), rounds=max(10, 1000 // cards), items=cards)
+
+
+def test_parse_job_page(bench: Bench, job_html: str) -> None:
+    """Benchmark soupifying and parsing the saved job page."""
+    parser = LinkedInParser()
+
+    def parse() -> None:
+        parser.parse_job_page(Job(), make_soup(job_html))
+
+    bench(parse, rounds=100)
+
+
+def test_nullable_tag(bench: Bench, job_html: str) -> None:
+    """Benchmark chained `NullableTag` lookups on the saved job page."""
+    root = NullableTag(make_soup(job_html).html)
+
+    def find() -> None:
+        for _ in range(100):
+            root.find('div', {'class': 'top-card-layout__entity-info'}).find('a').get('href')
+            root.find('section', {'class': 'top-card-layout'}).find('code', {'id': 'applyUrl'})
+
+    bench(find, rounds=20, items=100)
+
+
+def test_remove_query(bench: Bench) -> None:
+    """Benchmark stripping tracking parameters from job urls."""
+    urls = [
+        f'https://www.linkedin.com/jobs/view/python-engineer-at-acme-{i}?position={i}&pageNum=0&refId=abc%3D%3D'
+        for i in range(1000)
+    ]
+    bench(lambda: [remove_query(url) for url in urls], rounds=50, items=len(urls))
+
+
+def test_calculate_period(bench: Bench) -> None:
+    """Benchmark search period calculation."""
+    now = timezone.now()
+    search_sources = [SearchSource(last_executed_at=now - timedelta(hours=i)) for i in range(1000)]
+    bench(lambda: [search_source.calculate_period() for search_source in search_sources], rounds=50, items=1000)
@@ -0,0 +1,11 @@
+import pytest
+
+from haystack.search.models import Search, SearchSource, Source
+
+
+@pytest.fixture
+def search_source() -> SearchSource:
+    """Return `SearchSource` for a remote LinkedIn search."""
+    search = Search.objects.create(keywords='python', is_onsite=False, is_remote=True)
+    source = Source.objects.create(name='LinkedIn', parser='linkedin')
+    return SearchSource.objects.create(search=search, source=source)
@@ -0,0 +1,63 @@
+from collections.abc import Iterator
+
+from haystack.jobs.models import Job
+from haystack.search.models import SearchSource
+
+
+def make_job(n: int, company: int = 0, location: str | None = 'New York, NY') -> dict:
+    """Return parsed job dict."""
+    return {
+        'company': f'Company {company}',
+        'company_url': f'https://www.linkedin.com/company/{company}',
+        'title': f'Engineer {n}',
+        'url': f'https://www.linkedin.com/jobs/view/{n}',
+        'location': location,
+        'date_posted': '2025-10-01',
+        'date_found': '2025-10-02 12:00:00+00:00',
+    }
+
+
+class FakeParser:
+    """Parser returning one job on each of `pages` pages without a browser.
+
+    Searches with keywords `broken` and jobs titled `broken` fail.
+    """
+
+    JOBS_PER_PAGE = 1
+    MAX_PAGES = 10
+
+    def __init__(self, pages: int = 2) -> None:
+        self.pages = pages
+
+    def iter_pages(self, search_source: SearchSource, newest_first: bool = False) -> Iterator[tuple[int, list[dict]]]:
+        """Yield every page."""
+        for page in range(1, self.pages + 1):
+            yield page, self.parse(search_source, page, newest_first)
+
+    def parse(self, search_source: SearchSource, page: int = 1, newest_first: bool = False) -> list[dict]:  # noqa: ARG002
+        """Return one job on each of the first `pages` pages."""
+        if search_source.search.keywords == 'broken':
+            raise RuntimeError('broken')
+        if page > self.pages:
+            return []
+        return [
+            {
+                'company': 'Company',
+                'company_url': 'https://www.linkedin.com/company/company',
+                'title': f'{search_source.search.keywords} {page}',
+                'url': f'https://www.linkedin.com/jobs/view/{search_source.search.keywords}-{page}',
+                'location': None,
+                'date_posted': '2025-10-01',
+                'date_found': '2025-10-02 12:00:00+00:00',
+            }
+        ]
+
+    def populate_job(self, job: Job) -> bool:
+        """Mark job populated."""
+        if job.title == 'broken':
+            raise RuntimeError('broken')
+        Job.objects.filter(pk=job.pk).update(populated=True)
+        return True
+
+    def quit(self) -> None:
+        """Do nothing."""
@@ -0,0 +1,236 @@
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+from django.test import override_settings
+from seleniumwire.request import Response
+
+from haystack.jobs.models import Job
+from haystack.search import retry
+from haystack.search.crawler import Crawler, Page, TokenBucket, crawl_populate, crawl_search
+from haystack.search.fetchers import BaseFetcher, FetchError, HTTPFetcher
+from haystack.search.mockserver import MockConfig, MockLinkedInServer
+from haystack.search.models import Search, SearchSource, Source, Status
+from haystack.search.parsers.linkedin import LinkedInParser
+from haystack.search.retry import RetryPolicy
+
+
+class FakeFetcher:
+    """Fetcher answering requests with `status_codes` in turn after `delay` seconds."""
+
+    exceptions = ()
+
+    decode = staticmethod(BaseFetcher.decode)
+
+    def __init__(self, status_codes: list[int] | None = None, delay: float = 0) -> None:
+        self.status_codes = status_codes or []
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def request(self, _url: str) -> Response:
+        """Return empty page with next status code."""
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            status_code = self.status_codes.pop(0) if self.status_codes else 200
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return Response(status_code=status_code, reason='', headers=[], body=b'')
+
+
+def test_token_bucket() -> None:
+    """Test tokens are granted in a burst up to capacity and then at `rate`."""
+
+    async def acquire(count: int) -> float:
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire(2)) < 0.04
+    assert asyncio.run(acquire(4)) >= 0.09
+
+
+def test_fetch_retry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test error responses are retried until a page is fetched or retries run out and 404 is not retried."""
+    monkeypatch.setattr(retry, '_breakers', {})
+    fetcher = FakeFetcher([429, 503])
+    crawler = Crawler(rate=100, policy=RetryPolicy(retries=3, base=0))
+    monkeypatch.setattr(crawler, 'get_fetcher', lambda _parser: fetcher)
+
+    page = asyncio.run(crawler.fetch(LinkedInParser(), 'https://www.linkedin.com/jobs/view/1'))
+    assert page.ok
+    assert fetcher.requests == 3
+
+    fetcher = FakeFetcher([500, 500, 500])
+    monkeypatch.setattr(crawler, 'get_fetcher', lambda _parser: fetcher)
+    page = asyncio.run(crawler.fetch(LinkedInParser(), 'https://www.linkedin.com/jobs/view/2'))
+    assert not page.ok
+    assert page.status_code == 500
+    assert fetcher.requests == 3
+
+    fetcher = FakeFetcher([404])
+    monkeypatch.setattr(crawler, 'get_fetcher', lambda _parser: fetcher)
+    page = asyncio.run(crawler.fetch(LinkedInParser(), 'https://www.linkedin.com/jobs/view/3'))
+    assert page.status_code == 404
+    assert fetcher.requests == 1
+
+
+def test_fetch_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test at most `concurrency` requests are in flight at once."""
+    fetcher = FakeFetcher(delay=0.05)
+    crawler = Crawler(concurrency=2, rate=100, burst=10)
+    monkeypatch.setattr(crawler, 'get_fetcher', lambda _parser: fetcher)
+
+    async def run() -> list:
+        return await asyncio.gather(
+            *(crawler.fetch(LinkedInParser(), f'https://host{n}.example.com/') for n in range(6))
+        )
+
+    assert all(page.ok for page in asyncio.run(run()))
+    assert fetcher.requests == 6
+    assert fetcher.max_in_flight == 2
+
+
+def test_fetch_throttled_host(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test requests waiting for a host's token do not hold concurrency slots of other hosts."""
+    monkeypatch.setattr(retry, '_breakers', {})
+    crawler = Crawler(concurrency=1, rate=2, burst=1)
+    monkeypatch.setattr(crawler, 'get_fetcher', lambda _parser: FakeFetcher())
+    finished: dict[str, float] = {}
+
+    async def fetch(url: str) -> None:
+        await crawler.fetch(LinkedInParser(), url)
+        finished[url] = time.monotonic() - start
+
+    async def run() -> None:
+        await asyncio.gather(
+            fetch('https://slow.example.com/1'),
+            fetch('https://slow.example.com/2'),
+            fetch('https://fast.example.com/'),
+        )
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert finished['https://fast.example.com/'] < 0.25
+    assert finished['https://slow.example.com/2'] >= 0.4
+
+
+def test_run_populate(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test jobs are read in bounded batches and populated by `concurrency` consumers."""
+    crawler = Crawler(concurrency=2)
+    consumed = 0
+    finished = 0
+    outstanding: list[int] = []
+    in_flight: list[int] = []
+
+    def iter_jobs() -> Iterator[Job]:
+        nonlocal consumed
+        for n in range(50):
+            consumed += 1
+            yield Job(url=f'https://www.linkedin.com/jobs/view/{n}')
+
+    async def populate(_job: Job) -> bool:
+        nonlocal finished
+        outstanding.append(consumed - finished)
+        in_flight.append(len(outstanding) - finished)
+        await asyncio.sleep(0.001)
+        finished += 1
+        return True
+
+    monkeypatch.setattr(crawler, 'populate', populate)
+    assert asyncio.run(crawler.run_populate(iter_jobs())) == 50
+    # one batch being queued, a full queue and one job per consumer
+    assert max(outstanding) <= 8
+    assert max(in_flight) == 2
+
+
+def test_populate_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a job that fails to parse is logged and skipped and parsing runs off the event loop."""
+    crawler = Crawler()
+    threads: list[int] = []
+
+    class BrokenParser:
+        """Parser failing to parse every job page."""
+
+        def parse_job_page(self, _job: Job, _soup: object) -> None:
+            threads.append(threading.get_ident())
+            raise RuntimeError('broken')
+
+        def quit(self) -> None:
+            """Do nothing."""
+
+    async def fetch(_parser: object, url: str, browser: bool = False) -> Page:  # noqa: ARG001
+        return Page(url, 200, Response(status_code=200, reason='OK', headers=[], body=b''))
+
+    monkeypatch.setattr(crawler, 'get_parser', lambda _name: BrokenParser())
+    monkeypatch.setattr(crawler, 'fetch', fetch)
+    search_source = SearchSource(source=Source(parser='linkedin'))
+    jobs = [Job(url=f'https://www.linkedin.com/jobs/view/{n}', search_source=search_source) for n in range(3)]
+
+    assert asyncio.run(crawler.run_populate(jobs)) == 0
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+
+
+def test_search_pages_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a page that cannot be fetched cancels the other fetches of its window."""
+    crawler = Crawler(concurrency=2)
+    cancelled: list[int] = []
+
+    async def fetch_jobs(_parser: object, _search_source: SearchSource, page_number: int, _newest: bool) -> list:
+        if page_number == 1:
+            msg = 'Unable to fetch page 1'
+            raise FetchError(msg)
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(page_number)
+            raise
+        return []
+
+    monkeypatch.setattr(crawler, 'fetch_jobs', fetch_jobs)
+    with pytest.raises(ExceptionGroup) as exc_info:
+        asyncio.run(crawler.search_pages(LinkedInParser(), SearchSource(), max_pages=2))
+    assert exc_info.group_contains(FetchError)
+    assert cancelled == [2]
+
+
+@pytest.mark.django_db
+@override_settings(RESPONSE_CACHE_DIR='')
+def test_crawler_mock_server(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test crawler fails searches whose pages cannot be fetched and populates job pages with the browser fetcher."""
+    server = MockLinkedInServer(('127.0.0.1', 0), MockConfig(results=25, error_rate=1.0))
+    server.start()
+    monkeypatch.setattr(retry, '_breakers', {})
+    # job pages are fetched over HTTP instead of with Firefox
+    monkeypatch.setattr(LinkedInParser, 'fetcher_classes', {'firefox': HTTPFetcher, 'http': HTTPFetcher})
+    policy = RetryPolicy(retries=1, base=0)
+    source = Source.objects.create(name='LinkedIn', parser='linkedin')
+    search = Search.objects.create(keywords='python', is_onsite=False, is_remote=True)
+    search_source = SearchSource.objects.create(search=search, source=source)
+    search_sources = SearchSource.objects.select_related('search__location', 'source')
+    try:
+        with override_settings(LINKEDIN_BASE_URL=server.config.base_url, SEARCH_PROXY=server.url):
+            assert crawl_search(search_sources, policy=policy, rate=100) == 0
+            assert SearchSource.objects.get().status == Status.ERROR
+
+            server.config.error_rate = 0
+            assert crawl_search(search_sources, policy=policy, rate=100) == 25
+            assert SearchSource.objects.get().status == Status.SUCCESS
+
+            jobs = Job.objects.filter(search_source=search_source).select_related('search_source__source')[:3]
+            assert crawl_populate(jobs, policy=policy, rate=100) == 3
+            assert Job.objects.filter(populated=True).count() == 3
+            assert sum(server.get_counts('job').values()) == 3
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+from django.test import override_settings
+
+from haystack.search import extractors
+from haystack.search.extractors import CardExtractor, SoupExtractor, get_html_parser
+from haystack.search.parsers.linkedin import LinkedInParser
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+@pytest.fixture
+def search_html() -> str:
+    """Return saved LinkedIn search page."""
+    return (FIXTURES / 'linkedin' / 'search.html').read_text()
+
+
+def strip_date_found(jobs: list[dict]) -> list[dict]:
+    """Return jobs without `date_found`, which changes on every call."""
+    return [{k: v for k, v in job.items() if k != 'date_found'} for job in jobs]
+
+
+def test_card_extractor(search_html: str) -> None:
+    """Test single pass extractor matches chained lookups."""
+    expected = strip_date_found(SoupExtractor(LinkedInParser().parse_job).extract(search_html))
+    jobs = strip_date_found(CardExtractor().extract(search_html))
+    assert jobs == expected
+    assert jobs == [
+        {
+            'location': 'New York, NY',
+            'company': 'Acme',
+            'company_url': 'https://www.linkedin.com/company/acme',
+            'title': 'Senior Python Engineer',
+            'url': 'https://www.linkedin.com/jobs/view/senior-python-engineer-at-acme-4301234567',
+            'date_posted': '2025-10-14',
+        },
+        {
+            'location': 'United States',
+            'company': 'Globex Corporation',
+            'company_url': 'https://www.linkedin.com/company/globex-corporation',
+            'title': 'Backend Developer (Django)',
+            'url': 'https://www.linkedin.com/jobs/view/backend-developer-django-at-globex-4307654321',
+            'date_posted': '2025-10-17',
+        },
+        {
+            'location': None,
+            'company': 'Initech',
+            'company_url': 'https://www.linkedin.com/company/initech',
+            'title': 'Data Engineer',
+            'url': 'https://www.linkedin.com/jobs/view/data-engineer-at-initech-4309999999',
+            'date_posted': '2025-10-10',
+        },
+    ]
+
+
+def test_get_html_parser(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    """Test lxml falls back to html.parser with a warning when it is not installed."""
+    assert get_html_parser() == 'html.parser'
+
+    monkeypatch.setattr(extractors, 'has_lxml', lambda: False)
+    extractors.warn_missing_lxml.cache_clear()
+    with override_settings(HTML_PARSER='lxml'):
+        assert get_html_parser() == 'html.parser'
+        assert get_html_parser() == 'html.parser'
+    assert [record.levelname for record in caplog.records] == ['WARNING']
+    assert 'lxml is not installed' in caplog.text
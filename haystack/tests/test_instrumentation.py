@@ -0,0 +1,78 @@
+import os
+import socket
+from pathlib import Path
+
+import pytest
+from django.test import Client, override_settings
+
+from haystack.core.instrumentation import (
+    PHASE_SECONDS,
+    REGISTRY,
+    RESPONSES,
+    Histogram,
+    Metric,
+    get_summary,
+    record_response,
+    save_snapshot,
+    timed,
+)
+
+
+def test_histogram() -> None:
+    """Test observations land in cumulative buckets and quantiles interpolate within them."""
+    histogram = Histogram('test_seconds', 'Test.', buckets=(1.0, 2.0, float('inf')))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value, phase='a')
+
+    labels = Metric.get_labels({'phase': 'a'})
+    assert histogram.quantile(labels, 0.5) == 1.5
+    assert histogram.render() == [
+        'test_seconds_bucket{phase="a",le="1.0"} 1',
+        'test_seconds_bucket{phase="a",le="2.0"} 3',
+        'test_seconds_bucket{phase="a",le="+Inf"} 4',
+        'test_seconds_sum{phase="a"} 6.5',
+        'test_seconds_count{phase="a"} 4',
+    ]
+
+
+@pytest.mark.django_db
+def test_prometheus(tmp_path: Path, client: Client) -> None:
+    """Test command snapshots are merged and served with a command label."""
+    REGISTRY.reset()
+
+    @timed('extract')
+    def extract() -> None:
+        """Do nothing."""
+
+    extract()
+    record_response(200, b'html')
+    assert PHASE_SECONDS.snapshot()[0][1]['count'] == 1
+    assert RESPONSES.snapshot() == [[{'status': '200'}, 1]]
+    assert get_summary()[1].startswith('extract')
+
+    with override_settings(INSTRUMENTATION_DIR=tmp_path):
+        save_snapshot('search')
+        save_snapshot('populate')
+        response = client.get('/metrics/')
+    REGISTRY.reset()
+
+    text = response.content.decode()
+    assert '# TYPE haystack_phase_seconds histogram' in text
+    instance = f'{socket.gethostname()}-{os.getpid()}'
+    assert f'haystack_phase_seconds_count{{command="populate",instance="{instance}",phase="extract"}} 1' in text
+    assert f'haystack_responses_total{{command="search",instance="{instance}",status="200"}} 1' in text
+
+
+def test_save_snapshot(tmp_path: Path) -> None:
+    """Test snapshots of exited processes of the same command and host are replaced."""
+    host = socket.gethostname()
+    dead = tmp_path / f'search-{host}-{2**22 + 1}.json'
+    other_host = tmp_path / f'search-{host}-x-{2**22 + 1}.json'
+    other_command = tmp_path / f'populate-{host}-{2**22 + 1}.json'
+    for path in (dead, other_host, other_command):
+        path.write_text('{}')
+
+    with override_settings(INSTRUMENTATION_DIR=tmp_path):
+        path = save_snapshot('search')
+    assert path.name == f'search-{host}-{os.getpid()}.json'
+    assert sorted(tmp_path.iterdir()) == sorted([path, other_host, other_command])
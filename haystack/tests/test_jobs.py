@@ -0,0 +1,197 @@
+from collections.abc import Callable, Iterator
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+
+from haystack.jobs.lookups import COMPANY_IDS, LOCATION_IDS, LookupCache
+from haystack.jobs.models import Company, Job, JobHTML, Location
+from haystack.search.models import SearchSource
+from haystack.tests.factories import make_job
+
+
+@pytest.mark.django_db
+def test_add_jobs(search_source: SearchSource) -> None:
+    """Test bulk ingestion dedupes companies, locations and jobs."""
+    jobs = [make_job(1), make_job(2, company=1), make_job(3, location=None), make_job(1)]
+    assert Job.objects.add_jobs(jobs, search_source) == 3
+    assert Company.objects.count() == 2
+    assert Location.objects.count() == 1
+
+    job = Job.objects.get(url='https://www.linkedin.com/jobs/view/1')
+    assert job.flexibility == Job.REMOTE
+    assert job.search_source == search_source
+    assert job.location is not None
+    assert job.location.name == 'New York, NY'
+
+
+@pytest.mark.django_db
+def test_add_jobs_existing(search_source: SearchSource) -> None:
+    """Test created count excludes jobs already in database."""
+    assert Job.objects.add_jobs([make_job(1), make_job(2)], search_source) == 2
+    assert Job.objects.add_jobs([make_job(2), make_job(3, company=1)], search_source) == 1
+    assert Job.objects.add_job(make_job(3), search_source) is False
+    assert Job.objects.count() == 3
+
+
+@pytest.fixture
+def lookups() -> Iterator[None]:
+    """Forget cached company and location ids before and after the test."""
+    COMPANY_IDS.clear()
+    LOCATION_IDS.clear()
+    yield
+    COMPANY_IDS.clear()
+    LOCATION_IDS.clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('lookups')
+def test_add_jobs_lookups(
+    search_source: SearchSource, django_capture_on_commit_callbacks: Callable, django_assert_num_queries: Callable
+) -> None:
+    """Test committed company and location ids are cached and forgotten on rename and delete."""
+    with django_capture_on_commit_callbacks(execute=True):
+        Job.objects.add_jobs([make_job(1), make_job(2, company=1)], search_source)
+    assert len(COMPANY_IDS) == 2
+    assert len(LOCATION_IDS) == 1
+
+    # existing jobs, savepoint, insert, count, duplicates, release and daily count, no company or location
+    # queries, plus the two statements checking foreign keys since the test runs inside a transaction
+    with django_assert_num_queries(10):
+        assert Job.objects.add_jobs([make_job(3), make_job(4, company=1)], search_source) == 2
+
+    company = Company.objects.get(url='https://www.linkedin.com/company/0')
+    company.url = 'https://www.linkedin.com/company/renamed'
+    company.save()
+    assert COMPANY_IDS.get_many(['https://www.linkedin.com/company/0']) == {}
+    Location.objects.all().delete()
+    assert len(LOCATION_IDS) == 0
+
+    Job.objects.warm_lookups()
+    assert COMPANY_IDS.get_many(['https://www.linkedin.com/company/renamed']) == {
+        'https://www.linkedin.com/company/renamed': company.id
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('lookups')
+def test_add_jobs_stale_lookup(search_source: SearchSource) -> None:
+    """Test a cached company deleted by another process is resolved again inside an outer transaction."""
+    Job.objects.add_jobs([make_job(1)], search_source)
+    company = Company.objects.get()
+    stale_id = company.id
+    company.delete()
+    # as still cached by another process
+    COMPANY_IDS.set_many({company.url: stale_id})
+
+    with transaction.atomic():
+        assert Job.objects.add_jobs([make_job(2)], search_source) == 1
+    job = Job.objects.get()
+    assert job.company_id != stale_id
+    assert job.company.url == company.url
+    assert COMPANY_IDS.get_many([company.url]) == {}
+
+
+def test_lookup_cache() -> None:
+    """Test least recently used ids are evicted and misses are read from the shared backend."""
+    cache = LookupCache('company', 'url', size=2)
+    cache.set_many({'a': 1, 'b': 2})
+    assert cache.get_many(['a']) == {'a': 1}
+    cache.set_many({'c': 3})
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+
+    shared = LookupCache('company', 'url', size=2, backend='default')
+    shared.set_many({'a': 1})
+    other = LookupCache('company', 'url', size=2, backend='default')
+    assert other.get_many(['a', 'b']) == {'a': 1}
+    shared.discard(['a'])
+    assert LookupCache('company', 'url', size=2, backend='default').get_many(['a']) == {}
+
+
+@pytest.mark.django_db
+def test_job_html(search_source: SearchSource) -> None:
+    """Test html is compressed into `JobHTML` and legacy `raw_html` is migrated."""
+    Job.objects.add_jobs([make_job(1), make_job(2)], search_source)
+    job = Job.objects.get(url='https://www.linkedin.com/jobs/view/1')
+    job.html = '<html>job 1</html>'
+    job.save()
+    assert Job.objects.get(pk=job.pk).html == '<html>job 1</html>'
+    assert Job.objects.get(pk=job.pk).raw_html == ''
+
+    Job.objects.filter(url='https://www.linkedin.com/jobs/view/2').update(raw_html='<html>job 2</html>')
+    assert Job.objects.get(url='https://www.linkedin.com/jobs/view/2').html == '<html>job 2</html>'
+    call_command('migraterawhtml', stdout=StringIO())
+    assert not Job.objects.exclude(raw_html='').exists()
+    assert JobHTML.objects.count() == 2
+    assert Job.objects.get(url='https://www.linkedin.com/jobs/view/2').html == '<html>job 2</html>'
+
+
+@pytest.mark.django_db
+def test_search(search_source: SearchSource) -> None:
+    """Test search vector follows title, description and company name."""
+    Job.objects.add_jobs([make_job(1), make_job(2, company=1)], search_source)
+    job = Job.objects.get(url='https://www.linkedin.com/jobs/view/1')
+    job.description = '<p>Build Kafka pipelines</p>'
+    job.save()
+
+    assert list(Job.objects.search('kafka')) == [job]
+    assert list(Job.objects.search('pipeline')) == [job]
+    assert Job.objects.search('engineer').count() == 2
+    assert not Job.objects.search('acme').exists()
+
+    Company.objects.filter(url='https://www.linkedin.com/company/1').update(name='Acme')
+    assert [job.title for job in Job.objects.search('acme')] == ['Engineer 2']
+
+
+@pytest.mark.django_db
+def test_duplicates(search_source: SearchSource) -> None:
+    """Test reposted jobs are linked at ingest and near duplicate descriptions by `clusterjobs`."""
+    repost = make_job(2) | {'title': 'Sr. Engineer 1', 'location': 'new york ny'}
+    Job.objects.add_jobs([make_job(1) | {'title': 'Senior Engineer 1'}, make_job(3, company=1)], search_source)
+    Job.objects.add_jobs([repost], search_source)
+    original = Job.objects.get(url='https://www.linkedin.com/jobs/view/1')
+    assert Job.objects.get(url='https://www.linkedin.com/jobs/view/2').duplicate_of == original
+    assert Job.objects.get(url='https://www.linkedin.com/jobs/view/3').duplicate_of is None
+
+    description = ' '.join(f'word{i}' for i in range(200))
+    Job.objects.add_jobs([make_job(4, company=2)], search_source)
+    for n, text in [(3, description), (4, description + ' apply now')]:
+        job = Job.objects.get(url=f'https://www.linkedin.com/jobs/view/{n}')
+        job.description = f'<p>{text}</p>'
+        job.update_simhash()
+        job.save()
+
+    Job.objects.filter(url__endswith='/2').update(fingerprint='', duplicate_of=None)
+    call_command('clusterjobs', stdout=StringIO())
+    job_3 = Job.objects.get(url='https://www.linkedin.com/jobs/view/3')
+    assert Job.objects.get(url='https://www.linkedin.com/jobs/view/2').duplicate_of == original
+    assert Job.objects.get(url='https://www.linkedin.com/jobs/view/4').duplicate_of == job_3
+    assert set(original.duplicates.all()) == {Job.objects.get(url='https://www.linkedin.com/jobs/view/2')}
+
+
+@pytest.mark.django_db
+def test_checkindexes() -> None:
+    """Test `checkindexes` reports every expected index and fails when one is missing."""
+    options = {'jobs': 10000, 'sources': 10, 'searches': 100}
+    out = StringIO()
+    call_command('checkindexes', stdout=out, **options)
+    for index in (
+        'job_unpopulated_idx',
+        'job_status_date_found_idx',
+        'job_date_found_idx',
+        'searchsource_source_active_idx',
+        'job_uuid_idx',
+        'job_fingerprint_id_idx',
+        'job_search_vector_idx',
+        'job_simhash_bands_idx',
+    ):
+        assert f'uses {index}' in out.getvalue()
+
+    with connection.cursor() as cursor:
+        cursor.execute('DROP INDEX job_uuid_idx')
+    out = StringIO()
+    with pytest.raises(CommandError, match='1 queries do not use their index'):
+        call_command('checkindexes', stdout=out, **options)
+    assert 'add_jobs created count: does not use job_uuid_idx' in out.getvalue()
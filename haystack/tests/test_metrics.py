@@ -0,0 +1,42 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+from haystack.jobs.models import Job
+from haystack.metrics.models import DailyCount
+from haystack.search.models import SearchSource
+from haystack.tests.factories import make_job
+
+
+def get_counts() -> dict[str, int]:
+    """Return count of every metric."""
+    return dict(DailyCount.objects.values_list('metric', 'count'))
+
+
+@pytest.mark.django_db
+def test_daily_counts(search_source: SearchSource) -> None:
+    """Test rollups follow ingestion and status changes and match backfill."""
+    Job.objects.add_jobs([make_job(1), make_job(2), make_job(3)], search_source)
+    for job in Job.objects.all()[:2]:
+        job.update_status(Job.APPLIED)
+    counts = get_counts()
+    assert counts == {DailyCount.FOUND: 3, Job.APPLIED: 2}
+
+    call_command('backfillmetrics', stdout=StringIO())
+    assert get_counts() == counts
+
+    search_source.search.delete()
+    assert get_counts() == counts
+    assert not DailyCount.objects.filter(search_source__isnull=False).exists()
+
+
+@pytest.mark.django_db
+def test_dashboard(admin_client: Client, search_source: SearchSource) -> None:
+    """Test dashboard reads applications from rollups."""
+    Job.objects.add_jobs([make_job(1)], search_source)
+    Job.objects.get().update_status(Job.APPLIED)
+    response = admin_client.get('/')
+    assert response.status_code == 200
+    assert [metric['count'] for metric in response.context['metrics']] == [1, 1, 1, 1]
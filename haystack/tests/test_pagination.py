@@ -0,0 +1,65 @@
+import pytest
+from django.test import Client
+
+from haystack.core.pagination import KeysetPaginator
+from haystack.jobs.models import Job
+from haystack.search.models import Search, SearchSource, Source
+from haystack.tests.factories import make_job
+
+
+@pytest.fixture
+def jobs() -> list[Job]:
+    """Return jobs with repeated and missing `date_found`."""
+    source = Source.objects.create(name='LinkedIn', parser='linkedin')
+    search_source = SearchSource.objects.create(search=Search.objects.create(keywords='python'), source=source)
+    Job.objects.add_jobs([make_job(n, company=n % 2) for n in range(8)], search_source)
+    for n, job in enumerate(Job.objects.order_by('id')):
+        job.date_found = None if n % 4 == 0 else f'2025-10-0{n % 3 + 1}'
+        job.status = Job.SAVED if n % 2 else Job.NEW
+        job.save()
+    return list(Job.objects.all())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('descending', [True, False])
+def test_keyset_paginator(jobs: list[Job], descending: bool) -> None:
+    """Test walking every page returns every row once in order."""
+    paginator = KeysetPaginator(Job.objects.all(), 'date_found', descending=descending, per_page=3)
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = paginator.get_page(cursor)
+        seen.extend(job.pk for job in page.object_list)
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    expected = Job.objects.order_by(*paginator.ordering).values_list('id', flat=True)
+    assert seen == list(expected)
+    assert len(seen) == len(jobs)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('jobs')
+def test_jobs_api(admin_client: Client) -> None:
+    """Test job API filters and paginates."""
+    response = admin_client.get('/api/jobs/', {'status': Job.SAVED})
+    results = response.json()['results']
+    assert len(results) == 4
+    assert {job['status'] for job in results} == {Job.SAVED}
+
+    company = results[0]['company']['uuid']
+    response = admin_client.get('/api/jobs/', {'company': company})
+    assert {job['company']['uuid'] for job in response.json()['results']} == {company}
+
+    assert admin_client.get('/api/jobs/', {'status': 'unknown'}).status_code == 400
+    assert admin_client.get('/api/jobs/', {'cursor': 'invalid'}).status_code == 400
+
+    response = admin_client.get('/jobs/', {'status': Job.SAVED}, headers={'HX-Request': 'true'})
+    assert b'<tbody' not in response.content
+    assert response.content.count(b'<tr>') == 4
+
+    response = admin_client.get('/api/companies/')
+    assert [company['job_count'] for company in response.json()['results']] == [4, 4]
+    assert admin_client.get('/jobs/').status_code == 200
+    assert admin_client.get('/companies/', {'q': 'Company'}).status_code == 200
@@ -0,0 +1,56 @@
+import gzip
+import os
+from pathlib import Path
+
+from seleniumwire.request import Response
+
+from haystack.search.fetchers import HTTPFetcher
+from haystack.search.mockserver import MockLinkedInServer
+from haystack.search.responsecache import ResponseCache
+
+JOB_URL = 'http://www.linkedin.com/jobs/view/software-engineer-at-acme-4000000001'
+
+
+def test_response_cache(tmp_path: Path) -> None:
+    """Test job pages are cached without query string, compressed and revalidated once stale."""
+    server = MockLinkedInServer(('127.0.0.1', 0))
+    server.start()
+    cache = ResponseCache(tmp_path, ttl=60, max_size=2**20, scopes=[r'/jobs/view/'])
+    fetcher = HTTPFetcher(server.url)
+    fetcher.cache = cache
+    try:
+        response = fetcher.request(f'{JOB_URL}?trk=public_jobs')
+        assert response is not None
+        assert response.status_code == 200
+        assert fetcher.request(JOB_URL).body == response.body  # type: ignore[union-attr]
+        assert server.get_counts('job') == {200: 1}
+        path = cache.get_path(JOB_URL)
+        assert path.stat().st_size < len(response.body)
+        assert gzip.decompress(path.read_bytes()).endswith(response.body)
+
+        cache.ttl = 0
+        assert fetcher.request(JOB_URL).body == response.body  # type: ignore[union-attr]
+        assert server.get_counts('job') == {200: 1, 304: 1}
+
+        fetcher.request('http://www.linkedin.com/jobs/search?keywords=python')
+        assert len(cache.get_entries()) == 1
+    finally:
+        fetcher.quit()
+        server.shutdown()
+        server.server_close()
+
+
+def test_response_cache_eviction(tmp_path: Path) -> None:
+    """Test least recently used entries are evicted once the cache is too large."""
+    cache = ResponseCache(tmp_path, ttl=60, max_size=2**20, scopes=[r'/jobs/view/'])
+    body = os.urandom(2**18)
+    for n in range(3):
+        cache.set(f'{JOB_URL}{n}', Response(status_code=200, reason='OK', headers=(), body=body))
+        os.utime(cache.get_path(f'{JOB_URL}{n}'), (n, n))
+    assert cache.get(f'{JOB_URL}0') is not None
+
+    cache.set(f'{JOB_URL}3', Response(status_code=200, reason='OK', headers=(), body=body))
+    assert cache.get(f'{JOB_URL}1') is None
+    assert cache.get(f'{JOB_URL}0') is not None
+    assert cache.get_size() <= cache.max_size * cache.LOW_WATERMARK
+    assert cache.set(JOB_URL, Response(status_code=404, reason='', headers=(), body=b'')) is None
@@ -0,0 +1,85 @@
+import pytest
+from seleniumwire.request import Response
+
+from haystack.search import retry
+from haystack.search.fetchers import BaseFetcher
+from haystack.search.retry import Action, CircuitBreaker, CircuitState, RetryPolicy
+
+
+def make_response(status_code: int, headers: tuple[tuple[str, str], ...] = ()) -> Response:
+    """Return selenium-wire `Response`."""
+    return Response(status_code=status_code, reason='', headers=headers)
+
+
+@pytest.mark.parametrize(
+    ('status_code', 'action'),
+    [(404, Action.GIVE_UP), (410, Action.GIVE_UP), (429, Action.RETRY), (503, Action.RETRY), (None, Action.RETRY)],
+)
+def test_classify(status_code: int | None, action: Action) -> None:
+    """Test status code classification."""
+    assert RetryPolicy().classify(status_code) == action
+
+
+def test_retry_after() -> None:
+    """Test `Retry-After` header is honored and capped."""
+    policy = RetryPolicy(cap=60)
+    assert policy.get_delay(make_response(429, (('Retry-After', '7'),)), 1) == 7
+    assert policy.get_delay(make_response(429, (('Retry-After', '600'),)), 1) == 60
+    assert policy.retry_after(make_response(500, (('Retry-After', '7'),))) is None
+    assert policy.retry_after(make_response(503, (('Retry-After', 'Wed, 21 Oct 2015 07:28:00 GMT'),))) == 0
+
+
+def test_next_delay() -> None:
+    """Test decorrelated jitter stays within bounds."""
+    policy = RetryPolicy(base=1, cap=30)
+    delay = policy.base
+    for _ in range(100):
+        previous, delay = delay, policy.next_delay(delay)
+        assert policy.base <= delay <= min(policy.cap, previous * 3)
+
+
+def test_circuit_breaker() -> None:
+    """Test circuit opens after threshold and closes after successful trial."""
+    breaker = CircuitBreaker(threshold=2, timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker = CircuitBreaker(threshold=1, timeout=60)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+
+class BrokenFetcher(BaseFetcher):
+    """Fetcher raising an exception it does not expect on every request."""
+
+    page_source = ''
+
+    def get(self, _url: str) -> Response | None:
+        """Raise unexpected exception."""
+        msg = 'unexpected'
+        raise ValueError(msg)
+
+
+def test_circuit_breaker_unexpected_exception(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a half-open trial that raises an unexpected exception does not keep rejecting requests."""
+    breaker = CircuitBreaker(threshold=1, timeout=0)
+    monkeypatch.setattr(retry, '_breakers', {'example.com': breaker})
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(ValueError, match='unexpected'):
+        BrokenFetcher().get_with_retry('https://example.com/', RetryPolicy(retries=1, base=0))
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
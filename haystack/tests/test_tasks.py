@@ -0,0 +1,160 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from haystack.jobs.models import Company, Job
+from haystack.search import retry
+from haystack.search.fetchers import HTTPFetcher
+from haystack.search.mockserver import MockConfig, MockLinkedInServer
+from haystack.search.models import Search, SearchSource, Source, Status
+from haystack.search.parsers.linkedin import LinkedInParser
+from haystack.search.retry import RetryPolicy
+from haystack.tasks import worker
+from haystack.tasks.models import Kind, Task, TaskStatus
+from haystack.tasks.worker import Worker
+from haystack.tests.factories import FakeParser
+
+
+@pytest.mark.django_db
+@override_settings(TASK_MAX_ATTEMPTS=2)
+def test_search_queue(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test search pages are queued once, paginated page by page and failures retried until exhausted."""
+    monkeypatch.setattr(worker, 'get_parser', lambda _name: FakeParser())
+    source = Source.objects.create(name='LinkedIn', parser='linkedin')
+    search_sources = [
+        SearchSource.objects.create(search=Search.objects.create(keywords=keywords), source=source)
+        for keywords in ('python', 'django', 'broken')
+    ]
+
+    assert Task.objects.enqueue_searches(search_sources) == 3
+    assert Task.objects.enqueue_searches(search_sources) == 0
+    assert set(SearchSource.objects.values_list('status', flat=True)) == {Status.SCHEDULED}
+
+    assert Worker([Kind.SEARCH_PAGE]).run() == 4
+    assert Job.objects.count() == 4
+    assert Task.objects.filter(status=TaskStatus.DONE).count() == 6
+    broken = Task.objects.get(search_source__search__keywords='broken')
+    assert broken.status == TaskStatus.PENDING
+    assert broken.attempts == 1
+    assert broken.run_after > timezone.now()
+
+    Task.objects.filter(pk=broken.pk).update(run_after=timezone.now())
+    assert Worker([Kind.SEARCH_PAGE]).run() == 0
+    assert Task.objects.get(pk=broken.pk).status == TaskStatus.FAILED
+    statuses = dict(SearchSource.objects.values_list('search__keywords', 'status'))
+    assert statuses == {'python': Status.SUCCESS, 'django': Status.SUCCESS, 'broken': Status.ERROR}
+
+
+@pytest.mark.django_db
+def test_lease() -> None:
+    """Test leased tasks are skipped until their lease expires."""
+    source = Source.objects.create(name='LinkedIn', parser='linkedin')
+    search_source = SearchSource.objects.create(search=Search.objects.create(keywords='python'), source=source)
+    company = Company.objects.create(name='Company', url='https://www.linkedin.com/company/company')
+    job = Job.objects.create(
+        company=company,
+        title='Engineer',
+        url='https://www.linkedin.com/jobs/view/1',
+        search_source=search_source,
+        populated=True,
+    )
+    assert Task.objects.enqueue_populate([job.id, job.id]) == 1
+
+    (task,) = Task.objects.lease(Kind.POPULATE, 10, 'dead')
+    assert task.owner == 'dead'
+    assert not Task.objects.lease(Kind.POPULATE, 10, 'alive')
+    assert not Task.objects.lease(Kind.SEARCH_PAGE, 10, 'alive')
+
+    Task.objects.filter(pk=task.pk).update(leased_until=timezone.now() - timedelta(seconds=1))
+    stale = task
+    (task,) = Task.objects.lease(Kind.POPULATE, 10, 'alive')
+    assert task.attempts == 2
+
+    # the dead worker's lease was taken over, it must not finish the task
+    assert not stale.complete()
+    assert not stale.fail('stale')
+    assert Task.objects.get(pk=task.pk).status == TaskStatus.RUNNING
+    assert Task.objects.renew([task.pk], 'dead') == 0
+    assert Task.objects.renew([task.pk], 'alive') == 1
+
+    assert Worker([Kind.POPULATE]).execute(task) == 0
+    assert Task.objects.get(pk=task.pk).status == TaskStatus.DONE
+
+
+@pytest.mark.django_db
+def test_lease_heartbeat(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test leases of the unfinished tasks of a batch are renewed while the batch runs."""
+    source = Source.objects.create(name='LinkedIn', parser='linkedin')
+    search_source = SearchSource.objects.create(search=Search.objects.create(keywords='python'), source=source)
+    company = Company.objects.create(name='Company', url='https://www.linkedin.com/company/company')
+    job_ids = [
+        Job.objects.create(
+            company=company,
+            title=f'Engineer {n}',
+            url=f'https://www.linkedin.com/jobs/view/{n}',
+            search_source=search_source,
+            populated=True,
+        ).id
+        for n in range(3)
+    ]
+    Task.objects.enqueue_populate(job_ids)
+    worker = Worker([Kind.POPULATE], batch_size=3)
+    tasks = Task.objects.lease(Kind.POPULATE, 3, worker.owner)
+    expired = timezone.now() - timedelta(seconds=1)
+    Task.objects.filter(id__in=[task.pk for task in tasks]).update(leased_until=expired)
+    leases: list[int] = []
+
+    def execute(task: Task) -> int:
+        leases.append(Task.objects.filter(status=TaskStatus.RUNNING, leased_until__gt=timezone.now()).count())
+        return int(task.complete())
+
+    monkeypatch.setattr(worker, 'execute', execute)
+    monkeypatch.setattr(worker, 'heartbeat_interval', 0)
+    assert worker.execute_batch(tasks) == 3
+    # each task renews its own lease and the leases of the tasks after it
+    assert leases == [3, 2, 1]
+
+
+@pytest.mark.django_db
+@override_settings(RESPONSE_CACHE_DIR='')
+def test_queue_mock_server(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test failed fetches of the LinkedIn parser are retried by the queue instead of completing their tasks."""
+    server = MockLinkedInServer(('127.0.0.1', 0), MockConfig(results=15, error_rate=1.0))
+    server.start()
+    monkeypatch.setattr(HTTPFetcher, 'retry_policy', RetryPolicy(retries=1, base=0))
+    monkeypatch.setattr(retry, '_breakers', {})
+    # job pages are fetched over HTTP instead of with Firefox
+    monkeypatch.setattr(LinkedInParser, 'fetcher_classes', {'firefox': HTTPFetcher, 'http': HTTPFetcher})
+    source = Source.objects.create(name='LinkedIn', parser='linkedin')
+    search = Search.objects.create(keywords='python', is_onsite=False, is_remote=True)
+    search_source = SearchSource.objects.create(search=search, source=source)
+    try:
+        with override_settings(LINKEDIN_BASE_URL=server.config.base_url, SEARCH_PROXY=server.url):
+            Task.objects.enqueue_searches([search_source])
+            assert Worker([Kind.SEARCH_PAGE]).run() == 0
+            task = Task.objects.get()
+            assert (task.status, task.attempts) == (TaskStatus.PENDING, 1)
+            assert SearchSource.objects.get().status == Status.RUNNING
+
+            server.config.error_rate = 0
+            Task.objects.update(run_after=timezone.now())
+            assert Worker([Kind.SEARCH_PAGE]).run() == 15
+            assert SearchSource.objects.get().status == Status.SUCCESS
+
+            job = Job.objects.order_by('id').first()
+            assert job is not None
+            Task.objects.enqueue_populate([job.id])
+            server.config.error_rate = 1.0
+            assert Worker([Kind.POPULATE]).run() == 0
+            assert Task.objects.get(kind=Kind.POPULATE).status == TaskStatus.PENDING
+            assert not Job.objects.get(pk=job.pk).populated
+
+            server.config.error_rate = 0
+            Task.objects.filter(kind=Kind.POPULATE).update(run_after=timezone.now())
+            assert Worker([Kind.POPULATE]).run() == 1
+            assert Job.objects.get(pk=job.pk).populated
+    finally:
+        server.shutdown()
+        server.server_close()
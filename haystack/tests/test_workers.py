@@ -0,0 +1,76 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from haystack.core.instrumentation import PHASE_SECONDS, REGISTRY, SECONDS_BUCKETS
+from haystack.jobs import workers
+from haystack.jobs.models import Company, Job
+from haystack.jobs.workers import Throughput, populate_chunk, populate_parallel
+from haystack.search import parsers
+from haystack.search.models import SearchSource
+from haystack.tests.factories import FakeParser
+
+
+class ThreadExecutor(ThreadPoolExecutor):
+    """Executor running worker tasks on threads of the test process instead of spawned processes."""
+
+    def __init__(self, max_workers: int, mp_context: object, initializer: Callable[[], object]) -> None:  # noqa: ARG002
+        super().__init__(max_workers)
+
+
+def test_throughput() -> None:
+    """Test throughput reports count and rate since start."""
+    throughput = Throughput()
+    throughput.add(3)
+    throughput.add(2)
+    throughput.start -= 2
+    assert throughput.rate == pytest.approx(2.5, rel=0.01)
+    assert str(throughput).startswith('5 jobs in 2.0s (2.5')
+
+
+def test_populate_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test ids are populated in chunks and metrics of workers are merged into this process."""
+    chunks: list[list[int]] = []
+    buckets = [1] + [0] * (len(SECONDS_BUCKETS) - 1)
+
+    def populate(job_ids: list[int]) -> tuple[int, dict[str, list[list[Any]]]]:
+        chunks.append(job_ids)
+        observation = {'buckets': buckets, 'sum': 0.5, 'count': 1}
+        return len(job_ids) - 1, {PHASE_SECONDS.name: [[{'phase': 'populate_job'}, observation]]}
+
+    monkeypatch.setattr(workers, 'ProcessPoolExecutor', ThreadExecutor)
+    monkeypatch.setattr(workers, 'populate_chunk', populate)
+    REGISTRY.reset()
+    lines: list[str] = []
+
+    throughput = populate_parallel(iter(range(1, 8)), workers=2, chunk_size=3, write=lines.append)
+    assert sorted(chunks) == [[1, 2, 3], [4, 5, 6], [7]]
+    assert throughput.count == 4
+    assert lines[-1].startswith('Populated 4 jobs')
+    merged = {'buckets': [3, *buckets[1:]], 'sum': 1.5, 'count': 3}
+    assert PHASE_SECONDS.snapshot() == [[{'phase': 'populate_job'}, merged]]
+    REGISTRY.reset()
+
+
+@pytest.mark.django_db
+def test_populate_chunk(monkeypatch: pytest.MonkeyPatch, search_source: SearchSource) -> None:
+    """Test a job that fails to populate does not abort the rest of its chunk."""
+    monkeypatch.setattr(parsers, 'get_parser', lambda _name: FakeParser())
+    monkeypatch.setattr(workers, '_parsers', {})
+    company = Company.objects.create(name='Acme', url='https://www.linkedin.com/company/acme')
+    job_ids = [
+        Job.objects.create(
+            url=f'https://www.linkedin.com/jobs/view/{title}',
+            title=title,
+            company=company,
+            search_source=search_source,
+        ).pk
+        for title in ('first', 'broken', 'last')
+    ]
+
+    count, snapshot = populate_chunk(job_ids)
+    assert count == 2
+    assert set(Job.objects.filter(populated=True).values_list('title', flat=True)) == {'first', 'last'}
+    assert PHASE_SECONDS.name in snapshot
@@ -13,5 +13,9 @@ urlpatterns = [
     path('logout/', user_views.logout),
     path('jobs/', job_views.jobs),
     path('companies/', job_views.companies),
+    path('api/jobs/', job_views.jobs_api),
+    path('api/jobs/search/', job_views.jobs_search_api),
+    path('api/companies/', job_views.companies_api),
     path('searches/', search_views.searches),
+    path('metrics/', metric_views.prometheus),
 ]